@@ -0,0 +1,91 @@
+"""大量のファイルのコピー中に、イベントループがどれだけ止まるかの比較
+
+コピー中に一定間隔（--tick）で動く非同期タスクを動かし、予定の時刻からの遅れ（最大・99パーセンタイル）を表示する。
+
+- copy_many: 同期版をイベントループの中でそのまま呼び出す（コピーが終わるまでループが止まる）
+- aio.copy_many: 非同期版（スレッドでコピーし、ループは止まらない）
+
+    python benchmarks/bench_aio_latency.py [--files 5000] [--size 65536] [--tick 0.01] [--dir DIR]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful import aio  # noqa: E402
+from pyhelpful.pyhelpful import copy_many  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+
+
+async def _measure(copy, tick: float) -> tuple:
+    """copy を実行しながら、tick 秒ごとに動くタスクの遅れを記録する。(所要時間, 遅れのリスト) を返す。"""
+    delays = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            delays.append(time.perf_counter() - expected)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await copy()
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await task
+    return elapsed, delays
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=65536)
+    parser.add_argument("--tick", type=float, default=0.01)
+    parser.add_argument("--dir", help="計測に使うフォルダ（省略時は一時フォルダ）")
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    base = tempfile.mkdtemp(dir=args.dir)
+    try:
+        src = os.path.join(base, "src")
+        os.mkdir(src)
+        data = os.urandom(args.size)
+        file_list = []
+        for i in range(args.files):
+            file_path = os.path.join(src, "f{}.bin".format(i))
+            with open(file_path, "wb") as f:
+                f.write(data)
+            file_list.append(file_path)
+
+        async def run_sync():
+            copy_many(file_list, target)
+
+        async def run_async():
+            await aio.copy_many(file_list, target)
+
+        print("{:>16} {:>10} {:>12} {:>12} {:>8}".format("mode", "elapsed", "max delay", "p99 delay", "ticks"))
+        for name, copy in (("copy_many", run_sync), ("aio.copy_many", run_async)):
+            target = os.path.join(base, "dst")
+            os.mkdir(target)
+            elapsed, delays = asyncio.run(_measure(copy, args.tick))
+            shutil.rmtree(target)
+            delays.sort()
+            p99 = delays[int(len(delays) * 0.99) - 1] if len(delays) > 1 else delays[-1]
+            print(
+                "{:>16} {:>9.3f}s {:>10.1f}ms {:>10.1f}ms {:>8}".format(
+                    name, elapsed, delays[-1] * 1000, p99 * 1000, len(delays)
+                )
+            )
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""copy_many（スレッドプールでの一括コピー）と、file_copy を1件ずつ呼び出すループの比較
+
+小さなファイルを大量に作成し、スレッド数ごとの所要時間と files/sec を表示する。
+
+    python benchmarks/bench_copy_many.py [--files 5000] [--size 4096] [--max-workers 32] [--dir DIR]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import copy_many  # noqa: E402
+from pyhelpful.pyhelpful import file_copy  # noqa: E402
+from pyhelpful.pyhelpful import get_file_list  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+
+
+def _timed(func, target_dir: str) -> float:
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.mkdir(target_dir)
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=4096, help="1ファイルあたりのバイト数")
+    parser.add_argument("--max-workers", type=int, default=32)
+    parser.add_argument("--dir", help="計測に使うフォルダ（ネットワークドライブなどで計測する場合に指定）")
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    workers_list = [w for w in (1, 2, 4, 8, 16, 32) if w <= args.max_workers]
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as td:
+        ref_dir = os.path.join(td, "ref")
+        target_dir = os.path.join(td, "target")
+        os.mkdir(ref_dir)
+        payload = os.urandom(args.size)
+        for i in range(args.files):
+            with open(os.path.join(ref_dir, "f{}.bin".format(i)), "wb") as f:
+                f.write(payload)
+        file_list = get_file_list(ref_dir)
+
+        def loop():
+            for file_path in file_list:
+                file_copy(file_path, target_dir)
+
+        print("{:<16} {:>10} {:>14} {:>8}".format("mode", "time", "files/sec", "ratio"))
+        baseline = _timed(loop, target_dir)
+        print("{:<16} {:>9.3f}s {:>14,.0f} {:>7.2f}x".format(
+            "file_copy loop", baseline, args.files / baseline, 1.0))
+        for workers in workers_list:
+            elapsed = _timed(lambda: copy_many(file_list, target_dir, workers=workers), target_dir)
+            print("{:<16} {:>9.3f}s {:>14,.0f} {:>7.2f}x".format(
+                "workers={}".format(workers), elapsed, args.files / elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""dir_delete の並列モード（workers）・バックグラウンドモードと、従来の shutil.rmtree による削除の比較
+
+小さなファイルが大量にあるフォルダを作成し、削除にかかる時間（background は呼び出しから戻るまでの時間）を表示する。
+
+    python benchmarks/bench_dir_delete.py [--dirs 200] [--files 100] [--max-workers 16] [--dir DIR]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import dir_delete  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+
+
+def _make_tree(root: str, dirs: int, files: int):
+    for i in range(dirs):
+        path = os.path.join(root, "d{}".format(i // 20), "d{}".format(i))
+        os.makedirs(path)
+        for j in range(files):
+            with open(os.path.join(path, "f{}.txt".format(j)), "wb"):
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--files", type=int, default=100, help="1フォルダあたりのファイル数")
+    parser.add_argument("--max-workers", type=int, default=16)
+    parser.add_argument("--dir", help="計測に使うフォルダ（ネットワークドライブなどで計測する場合に指定）")
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    modes = {"rmtree": {}}
+    for workers in (2, 4, 8, 16, 32):
+        if workers <= args.max_workers:
+            modes["workers={}".format(workers)] = {"workers": workers}
+    modes["background"] = {"background": True}
+
+    print("{:<12} {:>10} {:>14} {:>8}".format("mode", "time", "files/sec", "ratio"))
+    with tempfile.TemporaryDirectory(dir=args.dir) as td:
+        baseline = None
+        for name, options in modes.items():
+            root = os.path.join(td, name)
+            _make_tree(root, args.dirs, args.files)
+            t0 = time.perf_counter()
+            dir_delete(root, **options)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            print("{:<12} {:>9.3f}s {:>14,.0f} {:>7.2f}x".format(
+                name, elapsed, args.dirs * args.files / elapsed, baseline / elapsed))
+
+        # * バックグラウンドでの削除が終わるまで待つ
+        for thread in threading.enumerate():
+            if thread is not threading.main_thread():
+                thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""FileWriter（ファイルを開いたまま、まとめて書き込む）と、file_create_overwrite(mode="a") を1行ずつ呼び出すループの比較
+
+    python benchmarks/bench_file_writer.py [--lines 100000] [--threads 4] [--dir DIR]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import FileWriter  # noqa: E402
+from pyhelpful.pyhelpful import file_create_overwrite  # noqa: E402
+
+LINE = "2026-10-18 12:00:00,sensor-01,23.5,OK"
+
+
+def _run_threads(func, threads: int, lines: int) -> float:
+    workers = [
+        threading.Thread(target=func, args=(lines // threads,)) for _ in range(threads)
+    ]
+    t0 = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--dir", help="計測に使うフォルダ（ネットワークドライブなどで計測する場合に指定）")
+    args = parser.parse_args()
+
+    # * 既定のログレベル（INFO を出力する）のままで比較する。ログの出力先は捨てる
+    print("{:<28} {:>10} {:>14} {:>8}".format("mode", "time", "lines/sec", "ratio"))
+    with tempfile.TemporaryDirectory(dir=args.dir) as td:
+        devnull = open(os.devnull, "w")
+        stderr = sys.stderr
+        sys.stderr = devnull
+
+        def loop(n):
+            for _ in range(n):
+                file_create_overwrite(td, "loop.txt", "a", LINE)
+
+        baseline = _run_threads(loop, 1, args.lines)
+        results = [("file_create_overwrite", baseline)]
+
+        for threads in (1, args.threads):
+            with FileWriter(td, "writer{}.txt".format(threads), "a") as writer:
+
+                def produce(n):
+                    for _ in range(n):
+                        writer.write(LINE)
+
+                elapsed = _run_threads(produce, threads, args.lines)
+            results.append(("FileWriter threads={}".format(threads), elapsed))
+
+        sys.stderr = stderr
+        devnull.close()
+        for name, elapsed in results:
+            print("{:<28} {:>9.3f}s {:>14,.0f} {:>7.2f}x".format(
+                name, elapsed, args.lines / elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
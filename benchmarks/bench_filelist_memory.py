@@ -0,0 +1,78 @@
+"""get_file_list の戻り値（フルパスのタプル）と FileList のメモリ使用量の比較
+
+数個の深いフォルダの下に大量のファイルがある一覧を合成し（ディスクには作らない）、
+tracemalloc で計測したメモリと、一覧の作成・走査・インデックスアクセスの時間を表示する。
+
+    python benchmarks/bench_filelist_memory.py [--files 1000000] [--dirs 8]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.filelist import FileList  # noqa: E402
+
+PREFIX = os.path.join(
+    os.sep, "mnt", "fileserver", "department", "project", "archive", "2026", "raw_data"
+)
+
+
+def _walk(files: int, dirs: int):
+    """os.walk と同じ形の (フォルダのパス, ファイル名のリスト) を返す。"""
+    per_dir = files // dirs
+    for d in range(dirs):
+        dir_path = os.path.join(PREFIX, "batch_{:04d}".format(d), "images")
+        yield dir_path, ["IMG_{:08d}.jpg".format(d * per_dir + i) for i in range(per_dir)]
+
+
+def _measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--dirs", type=int, default=8)
+    args = parser.parse_args()
+
+    def build_tuple():
+        return tuple(
+            os.path.join(dir_path, name)
+            for dir_path, names in _walk(args.files, args.dirs)
+            for name in names
+        )
+
+    def build_file_list():
+        return FileList.from_dirs(_walk(args.files, args.dirs))
+
+    print("{:<10} {:>12} {:>10} {:>10} {:>12}".format("type", "memory", "build", "iterate", "10k index"))
+    for name, build in (("tuple", build_tuple), ("FileList", build_file_list)):
+        result, size, build_time = _measure(build)
+        t0 = time.perf_counter()
+        for _ in result:
+            pass
+        iterate_time = time.perf_counter() - t0
+        step = max(1, len(result) // 10_000)
+        t0 = time.perf_counter()
+        for i in range(0, len(result), step):
+            result[i]
+        index_time = time.perf_counter() - t0
+        print(
+            "{:<10} {:>9.1f} MB {:>9.2f}s {:>9.2f}s {:>11.3f}s".format(
+                name, size / 1024 / 1024, build_time, iterate_time, index_time
+            )
+        )
+        del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""find_duplicates と、全てのファイルの内容全体のハッシュ値を1つずつ計算するループの比較
+
+サイズがばらばらのファイルと、その一部の複製（先頭と末尾だけが同じファイルを含む）を作成し、
+所要時間と、ハッシュ値を計算したファイル数を表示する。キャッシュを使った2回目の所要時間も表示する。
+
+    python benchmarks/bench_find_duplicates.py [--files 2000] [--size 262144] [--max-workers 4] [--dir DIR]
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import find_duplicates  # noqa: E402
+from pyhelpful.pyhelpful import get_file_list  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+
+
+def _hash_all(dir_path: str) -> tuple:
+    groups = {}
+    for file_path in get_file_list(dir_path):
+        with open(file_path, "rb") as f:
+            digest = hashlib.blake2b(f.read()).digest()
+        groups.setdefault(digest, []).append(file_path)
+    return tuple(sorted(tuple(sorted(g)) for g in groups.values() if len(g) > 1))
+
+
+def _timed(func) -> tuple:
+    t0 = time.perf_counter()
+    result = func()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=256 * 1024, help="1ファイルあたりの最大バイト数")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--dir", help="計測に使うフォルダ（ネットワークドライブなどで計測する場合に指定）")
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(dir=args.dir) as td:
+        data_dir = os.path.join(td, "data")
+        os.mkdir(data_dir)
+        originals = []
+        for i in range(args.files):
+            if originals and i % 10 == 0:
+                # * 1割は既存のファイルの複製
+                data = rng.choice(originals)
+            elif originals and i % 10 == 1:
+                # * 1割はサイズも先頭・末尾も同じで、途中だけが違うファイル
+                data = bytearray(rng.choice(originals))
+                data[len(data) // 2] ^= 0xFF
+                data = bytes(data)
+            else:
+                data = os.urandom(rng.randrange(args.size // 2, args.size) // 4096 * 4096)
+                originals.append(data)
+            with open(os.path.join(data_dir, "f{}.bin".format(i)), "wb") as f:
+                f.write(data)
+
+        print("{:<20} {:>10} {:>8}".format("mode", "time", "ratio"))
+        baseline, expected = _timed(lambda: _hash_all(data_dir))
+        print("{:<20} {:>9.3f}s {:>7.2f}x".format("hash all", baseline, 1.0))
+        for workers in [w for w in (1, 2, 4, 8) if w <= args.max_workers]:
+            elapsed, result = _timed(lambda: find_duplicates(data_dir, workers=workers))
+            assert result == expected
+            print("{:<20} {:>9.3f}s {:>7.2f}x".format(
+                "workers={}".format(workers), elapsed, baseline / elapsed))
+
+        cache_path = os.path.join(td, "hashes.db")
+        find_duplicates(data_dir, cache_path=cache_path)
+        elapsed, result = _timed(lambda: find_duplicates(data_dir, cache_path=cache_path))
+        assert result == expected
+        print("{:<20} {:>9.3f}s {:>7.2f}x".format("cached", elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""get_file_list の並列モード（workers）と、従来の os.walk による一覧取得の比較
+
+合成したフォルダ構成（浅く広い・深く狭い・小さなフォルダが大量）ごとに、
+スレッド数 1〜N での所要時間を表示する。
+
+    python benchmarks/bench_get_file_list.py [--root DIR] [--max-workers 16] [--repeat 3]
+
+--root にネットワークドライブ上のフォルダを指定すると、フォルダごとの待ち時間が長い環境での効果を確認できる。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import get_file_list  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+
+TREES = {
+    # * 名前: (深さ, 1階層あたりのフォルダ数, 1フォルダあたりのファイル数)
+    "wide-shallow": (1, 500, 40),
+    "deep-narrow": (200, 1, 20),
+    "many-tiny-dirs": (2, 80, 1),
+}
+
+
+def _make_tree(root: str, depth: int, fanout: int, files: int) -> int:
+    count = 0
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(fanout):
+                path = os.path.join(parent, "d{}".format(i))
+                os.mkdir(path)
+                for j in range(files):
+                    with open(os.path.join(path, "f{}.txt".format(j)), "wb"):
+                        pass
+                count += files
+                next_level.append(path)
+        level = next_level
+    return count
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", help="作成済みのフォルダを計測する場合に指定")
+    parser.add_argument("--max-workers", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    workers_list = [w for w in (2, 4, 8, 16, 32) if w <= args.max_workers]
+
+    with tempfile.TemporaryDirectory() as td:
+        if args.root:
+            trees = {args.root: args.root}
+        else:
+            trees = {}
+            for name, (depth, fanout, files) in TREES.items():
+                root = os.path.join(td, name)
+                os.mkdir(root)
+                _make_tree(root, depth, fanout, files)
+                trees[name] = root
+
+        header = ["tree", "files", "os.walk"] + ["w={}".format(w) for w in workers_list]
+        print(" ".join("{:>14}".format(h) for h in header))
+        for name, root in trees.items():
+            files = len(get_file_list(root))
+            row = [name, str(files)]
+            baseline = _best_of(lambda: get_file_list(root), args.repeat)
+            row.append("{:.3f}s".format(baseline))
+            for workers in workers_list:
+                elapsed = _best_of(lambda: get_file_list(root, workers=workers), args.repeat)
+                row.append("{:.3f}s x{:.2f}".format(elapsed, baseline / elapsed))
+            print(" ".join("{:>14}".format(c) for c in row))
+
+
+if __name__ == "__main__":
+    main()
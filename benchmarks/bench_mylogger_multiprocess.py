@@ -0,0 +1,92 @@
+"""複数プロセスから1つのログファイルへ書き込む MyFileLogger のストレステスト
+
+書き込み後に全行が壊れていないかを確認し、プロセス数ごとの records/sec を表示する。
+
+    python benchmarks/bench_mylogger_multiprocess.py [--records 2000] [--max-procs 16]
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.mylogger import MyFileLogger  # noqa: E402
+
+LINE_PATTERN = re.compile(r".*\[INFO: Message >> worker=(\d+) seq=(\d+) payload=(x+)\]$")
+PAYLOAD_SIZE = 200
+
+
+def _worker(log_file_path: str, worker: int, records: int, options: dict, start):
+    log = MyFileLogger(log_file_path, "DEBUG", **options)
+    payload = "x" * PAYLOAD_SIZE
+    start.wait()
+    for seq in range(records):
+        log.info("worker=%s seq=%s payload=%s", worker, seq, payload)
+    log.close()
+
+
+def _check(log_file_path: str) -> tuple:
+    """(正常な行数, 壊れた行数) を返す。"""
+    seen = set()
+    broken = 0
+    with open(log_file_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            m = LINE_PATTERN.match(line.rstrip("\n"))
+            if m is None or len(m.group(3)) != PAYLOAD_SIZE:
+                broken += 1
+            else:
+                seen.add((int(m.group(1)), int(m.group(2))))
+    return len(seen), broken
+
+
+def run(procs: int, records: int, options: dict) -> tuple:
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "bench.log")
+        start = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(
+                target=_worker, args=(log_file_path, w, records, options, start)
+            )
+            for w in range(procs)
+        ]
+        for w in workers:
+            w.start()
+        t0 = time.perf_counter()
+        start.set()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - t0
+        ok, broken = _check(log_file_path)
+    return procs * records / elapsed, ok, broken
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000, help="1プロセスあたりのレコード数")
+    parser.add_argument("--max-procs", type=int, default=16)
+    args = parser.parse_args()
+
+    modes = {
+        "FileHandler": {},
+        "multiprocess": {"multiprocess": True},
+        "multiprocess+async": {"multiprocess": True, "async_mode": True},
+    }
+    procs_list = [p for p in (1, 2, 4, 8, 16) if p <= args.max_procs]
+
+    print("{:<20} {:>6} {:>14} {:>10} {:>8}".format("mode", "procs", "records/sec", "intact", "broken"))
+    for name, options in modes.items():
+        for procs in procs_list:
+            rate, ok, broken = run(procs, args.records, options)
+            print(
+                "{:<20} {:>6} {:>14,.0f} {:>10} {:>8}".format(
+                    name, procs, rate, "{}/{}".format(ok, procs * args.records), broken
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""sanitize_file_names（まとめて変換）と、1件ずつの is_invalid_char / replace_invalid_char の比較
+
+    python benchmarks/bench_sanitize_file_names.py [--names 1000000]
+
+"re.sub (previous)" は、以前の replace_invalid_char と同じく、1件ずつ is_invalid_char（禁止文字ごとの検索）と re.sub を行う場合
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pyhelpful.pyhelpful import is_invalid_char  # noqa: E402
+from pyhelpful.pyhelpful import log  # noqa: E402
+from pyhelpful.pyhelpful import replace_invalid_char  # noqa: E402
+from pyhelpful.pyhelpful import sanitize_file_names  # noqa: E402
+
+INVALID_CHARACTER = ["\\", "/", ":", "*", "?", '"', "<", ">", "|"]
+
+
+def _make_names(count: int) -> list:
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz0123456789_-あいうえお"
+    names = []
+    for i in range(count):
+        stem = "".join(rng.choice(letters) for _ in range(rng.randint(5, 30)))
+        if i % 10 == 0:
+            stem += rng.choice(INVALID_CHARACTER)
+        names.append(stem + rng.choice([".txt", ".csv", ".jpg", ""]))
+    return names
+
+
+def _previous(names: list) -> list:
+    results = []
+    for name in names:
+        for character in INVALID_CHARACTER:
+            if character in "-":
+                break
+        results.append(re.sub(r'[|\\|/|:|*|?|"|<|>|]', "-", name))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=1000000)
+    args = parser.parse_args()
+
+    log.set_level = "WARNING"
+    names = _make_names(args.names)
+    modes = {
+        "re.sub (previous)": lambda: _previous(names),
+        "replace_invalid_char": lambda: [replace_invalid_char(name) for name in names],
+        "is_invalid_char": lambda: [is_invalid_char(name) for name in names],
+        "sanitize_file_names": lambda: sanitize_file_names(names, max_length=None, unique=False),
+        "  + max_length": lambda: sanitize_file_names(names, unique=False),
+        "  + unique": lambda: sanitize_file_names(names),
+    }
+
+    print("{:<24} {:>10} {:>14}".format("mode", "time", "names/sec"))
+    for name, func in modes.items():
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+        print("{:<24} {:>9.3f}s {:>14,.0f}".format(name, elapsed, args.names / elapsed))
+
+
+if __name__ == "__main__":
+    main()
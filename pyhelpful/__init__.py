@@ -1,12 +1,48 @@
-from .pyhelpful import dialog_file_picker
-from .pyhelpful import dialog_folder_picker
-from .pyhelpful import is_invalid_char
-from .pyhelpful import replace_invalid_char
-from .pyhelpful import dir_create
-from .pyhelpful import dir_delete
-from .pyhelpful import file_create_overwrite
-from .pyhelpful import file_delete
-from .pyhelpful import file_copy
-from .pyhelpful import dir_copy
-from .pyhelpful import get_info_dir_file_ext
-from .pyhelpful import get_file_list
+import importlib
+
+# * 属性名と、その属性を定義しているサブモジュール
+# * サブモジュールは、属性が最初に参照されたときに読み込む
+_LAZY_ATTRS = {
+    "dialog_file_picker": ".pyhelpful",
+    "dialog_files_picker": ".pyhelpful",
+    "dialog_folder_picker": ".pyhelpful",
+    "dialog_session": ".pyhelpful",
+    "is_invalid_char": ".pyhelpful",
+    "replace_invalid_char": ".pyhelpful",
+    "sanitize_file_names": ".pyhelpful",
+    "dir_create": ".pyhelpful",
+    "dir_delete": ".pyhelpful",
+    "file_create_overwrite": ".pyhelpful",
+    "FileWriter": ".pyhelpful",
+    "file_read_mmap": ".pyhelpful",
+    "file_read_chunks": ".pyhelpful",
+    "file_read_lines": ".pyhelpful",
+    "file_delete": ".pyhelpful",
+    "file_copy": ".pyhelpful",
+    "file_copy_resumable": ".pyhelpful",
+    "copy_many": ".pyhelpful",
+    "dir_copy": ".pyhelpful",
+    "get_info_dir_file_ext": ".pyhelpful",
+    "get_path_parts": ".pyhelpful",
+    "get_file_list": ".pyhelpful",
+    "find_duplicates": ".pyhelpful",
+    "iter_files": ".pyhelpful",
+    "iter_files_parallel": ".pyhelpful",
+    "enable_stat_cache": ".statcache",
+    "disable_stat_cache": ".statcache",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
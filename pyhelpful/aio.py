@@ -0,0 +1,301 @@
+"""pyhelpful のファイル・フォルダ操作の asyncio 版
+
+各関数は同じ名前の pyhelpful の関数をスレッドで実行し、イベントループを止めずに待てるようにする。
+引数・戻り値・失敗したときの動作（ログを出して False / None を返す）は pyhelpful の関数と同じ。
+
+同時に実行する数は、操作の種類（"copy", "delete", "write", "list"）ごとに set_concurrency で制限できる。
+
+キャンセルした場合、まだ始まっていない処理は実行しない。
+実行中の処理は、ファイルが中途半端な状態で残らないように最後まで行い（スレッドは途中で止められない）、
+終わるまでは同時実行数の枠も空けない。
+
+Examples:
+    >>> from pyhelpful import aio
+    >>> aio.set_concurrency("copy", 16)
+    >>> results = await aio.copy_many(await aio.get_file_list("C:/data"), "D:/backup")
+    >>> async for file_path in aio.iter_files("C:/data", exts=".csv"):
+    ...     ...
+"""
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import time
+import weakref
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterable
+
+from . import pyhelpful as _sync
+from .pyhelpful import CopyResult
+from .pyhelpful import log
+
+# * 操作の種類ごとの同時実行数
+_limits = {
+    "copy": 8,
+    "delete": 4,
+    "write": 16,
+    "list": 4,
+}
+
+# * イベントループごとのセマフォ（asyncio.Semaphore は作ったループでしか使えないため）
+_semaphores = weakref.WeakKeyDictionary()
+
+# * 操作の種類ごとのスレッドプール（スレッド数は _limits と同じ）。{operation: (スレッド数, スレッドプール)}
+# ? 1つのスレッドプールを共有すると、ある操作がスレッドを使い切ったときに別の操作が待たされる
+_executors = {}
+_executors_lock = threading.Lock()
+
+# * iter_files で、1回にスレッドから受け取るファイル数
+_ITER_BATCH_SIZE = 256
+
+
+def set_concurrency(operation: str, limit: int):
+    """操作の種類ごとの同時実行数を変更する。
+
+    Args:
+        operation (str): "copy", "delete", "write", "list" のいずれか
+        limit (int): 同時に実行する数（1 以上）
+    """
+    if operation not in _limits:
+        raise ValueError("operation は {} のいずれかを指定してください。".format(", ".join(_limits)))
+    if limit < 1:
+        raise ValueError("limit は 1 以上を指定してください。")
+    _limits[operation] = limit
+
+
+def get_concurrency(operation: str) -> int:
+    """操作の種類ごとの同時実行数を返す。"""
+    return _limits[operation]
+
+
+def _semaphore(operation: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    # ? set_concurrency で変更された場合は、新しい数のセマフォを使う
+    key = (operation, _limits[operation])
+    semaphore = semaphores.get(key)
+    if semaphore is None:
+        semaphore = semaphores[key] = asyncio.Semaphore(key[1])
+    return semaphore
+
+
+def _get_executor(operation: str) -> concurrent.futures.ThreadPoolExecutor:
+    limit = _limits[operation]
+    with _executors_lock:
+        max_workers, executor = _executors.get(operation, (None, None))
+        if max_workers != limit:
+            # * set_concurrency で変更された場合は作り直す（実行中・待機中の処理は古いスレッドプールで最後まで行う）
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=limit, thread_name_prefix="pyhelpful-aio-{}".format(operation)
+            )
+            _executors[operation] = (limit, executor)
+        return executor
+
+
+async def _run(operation: str, func: Callable, *args, **kwargs) -> Any:
+    """func をスレッドで実行して結果を待つ。同時実行数は operation ごとに制限する。"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphore(operation)
+    await semaphore.acquire()
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # ? イベントループが既に閉じられている
+            pass
+
+    try:
+        future = _get_executor(operation).submit(functools.partial(func, *args, **kwargs))
+    except BaseException:
+        semaphore.release()
+        raise
+    # * キャンセルされても、スレッドの処理が終わるまではセマフォを返さない
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
+
+
+async def dir_create(parent_dir_path: str, dir_name: str) -> str | None:
+    """dir_create の非同期版"""
+    return await _run("write", _sync.dir_create, parent_dir_path, dir_name)
+
+
+async def file_create_overwrite(
+    dir_path: str,
+    file_name: str,
+    mode: str,
+    data: Any,
+    eof_new_line: bool = True,
+    atomic: bool = False,
+    durability: str = "none",
+) -> bool:
+    """file_create_overwrite の非同期版"""
+    return await _run(
+        "write",
+        _sync.file_create_overwrite,
+        dir_path,
+        file_name,
+        mode,
+        data,
+        eof_new_line,
+        atomic,
+        durability,
+    )
+
+
+async def file_copy(ref_file_path: str, target_dir_path: str, copy_as: bool = False) -> bool:
+    """file_copy の非同期版"""
+    return await _run("copy", _sync.file_copy, ref_file_path, target_dir_path, copy_as)
+
+
+async def file_copy_resumable(
+    ref_file_path: str,
+    target_dir_path: str,
+    chunk_size: int = _sync._RESUMABLE_CHUNK_SIZE,
+    verify: bool = True,
+) -> str | bool:
+    """file_copy_resumable の非同期版"""
+    return await _run(
+        "copy", _sync.file_copy_resumable, ref_file_path, target_dir_path, chunk_size, verify
+    )
+
+
+async def copy_many(
+    items: Iterable,
+    target_dir_path: str | None = None,
+    copy_as: bool = False,
+    progress: Callable[[int, int, int], Any] | None = None,
+    progress_interval: float = 0.5,
+) -> tuple:
+    """copy_many の非同期版
+
+    同時にコピーする数は、workers の代わりに set_concurrency("copy", n) で指定する。
+    キャンセルした場合は、まだコピーしていないファイルはコピーしない。
+
+    Args:
+        items (Iterable): コピー元のファイルパス、または (コピー元のファイルパス, コピー先のフォルダパス) のペア
+        target_dir_path (str | None, optional): items がファイルパスだけの場合のコピー先のフォルダパス
+        copy_as (bool, optional): copy_many と同じ
+        progress (Callable[[int, int, int], Any] | None, optional):
+
+            進捗を受け取る関数。(完了した件数, 全体の件数, コピーしたバイト数) を渡す。
+            イベントループのスレッドから progress_interval 秒ごとに呼び出し、最後に必ず1回呼び出す。
+
+        progress_interval (float, optional): progress を呼び出す間隔（秒）
+
+    Returns:
+        tuple: items と同じ順の CopyResult（source, target, ok, bytes, method, error）のタプル
+    """
+    jobs = _sync._copy_jobs(items, target_dir_path)
+    total = len(jobs)
+    results = [None] * total
+    pending = iter(enumerate(jobs))
+    # * [完了した件数, コピーしたバイト数, 最後に progress を呼び出した時刻]
+    counts = [0, 0, time.perf_counter()]
+
+    async def worker():
+        # * イベントループのスレッドだけで next を呼ぶので、ロックは不要
+        for i, pair in pending:
+            try:
+                ref_file_path, dir_path = pair
+                result = await _run("copy", _sync._copy_file_to_dir, ref_file_path, dir_path, copy_as)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = CopyResult(pair[0], None, False, 0, None, str(e))
+            results[i] = result
+            counts[0] += 1
+            counts[1] += result.bytes
+            if progress is not None and time.perf_counter() - counts[2] >= progress_interval:
+                counts[2] = time.perf_counter()
+                progress(counts[0], total, counts[1])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(min(_limits["copy"], total), 1))))
+    if progress is not None:
+        progress(counts[0], total, counts[1])
+    copied = counts[1]
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if result.ok is False)
+    if failed:
+        log.warning("コピーできなかったファイルがあります。（%s 件）", failed)
+    log.info(
+        "ファイルのコピーが完了しました。（%s 件, %s バイト, %.1f MB/s）",
+        total - failed,
+        copied,
+        copied / 1024 / 1024 / elapsed if elapsed > 0 else 0.0,
+    )
+    return tuple(results)
+
+
+async def dir_copy(
+    ref_dir_path: str,
+    target_dir_path: str,
+    sync: bool = False,
+    checksum: bool = False,
+    delete: bool = False,
+    workers: int = 8,
+) -> bool | _sync.DirSyncResult:
+    """dir_copy の非同期版"""
+    return await _run(
+        "copy", _sync.dir_copy, ref_dir_path, target_dir_path, sync, checksum, delete, workers
+    )
+
+
+async def file_delete(file_path: str) -> bool:
+    """file_delete の非同期版"""
+    return await _run("delete", _sync.file_delete, file_path)
+
+
+async def dir_delete(dir_path: str, workers: int = 1, background: bool = False) -> bool:
+    """dir_delete の非同期版"""
+    return await _run("delete", _sync.dir_delete, dir_path, workers, background)
+
+
+async def get_file_list(
+    dir_path: str, workers: int = 1, index_path: str | None = None, compact: bool = False
+) -> tuple | _sync.FileList | bool:
+    """get_file_list の非同期版"""
+    return await _run("list", _sync.get_file_list, dir_path, workers, index_path, compact)
+
+
+async def iter_files(dir_path: str, **kwargs) -> AsyncIterator:
+    """iter_files の非同期版（async for で使う）
+
+    ファイルはスレッドでまとめて探し、見つけた順に1つずつ返す。
+    途中で async for を抜けた場合やキャンセルした場合は、それ以上フォルダをたどらない。
+
+    Args:
+        dir_path (str): 任意のフォルダパス
+        **kwargs: iter_files と同じ（exts, pattern, max_depth など）
+
+    Yields:
+        str | os.DirEntry: ファイルのパス
+    """
+    files = _sync.iter_files(dir_path, **kwargs)
+    # * キャンセルされた後も実行中の next_batch が終わるまで、ジェネレータを閉じないようにするロック
+    lock = threading.Lock()
+
+    def next_batch() -> list:
+        with lock:
+            return [file for _, file in zip(range(_ITER_BATCH_SIZE), files)]
+
+    def close():
+        with lock:
+            files.close()
+
+    try:
+        while True:
+            batch = await _run("list", next_batch)
+            for file in batch:
+                yield file
+            if len(batch) < _ITER_BATCH_SIZE:
+                return
+    finally:
+        # ? "list" のスレッドプールが埋まっていても待たされないように、専用のスレッドで閉じる
+        threading.Thread(target=close, daemon=True).start()
@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import time
+from typing import Iterator
+from typing import NamedTuple
+
+from .mylogger import MyStreamLogger
+
+log = MyStreamLogger("DEBUG")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+"""
+
+# * 更新日時がこの秒数以内のフォルダは、同じ更新日時のまま中身が変わる可能性があるので、次回も読み直す
+_RACY_SECONDS = 2.0
+
+
+class DirChanges(NamedTuple):
+    """前回の refresh() からの変更"""
+
+    added: tuple
+    removed: tuple
+    modified: tuple
+
+
+class DirIndex:
+    """任意のフォルダにあるファイルの一覧を、ファイル（SQLite）に保存して使い回す索引
+
+    フォルダごとの更新日時と、その中のファイル（サイズ・更新日時）を記録しておき、
+    refresh() では更新日時が変わったフォルダだけを読み直す。
+
+    フォルダの更新日時はファイルの追加・削除・名前の変更で変わるが、既存のファイルの内容の変更では変わらない。
+    内容が変わったファイルも確実に検出したい場合は、refresh(check_files=True) で全てのフォルダを読み直す。
+
+    Examples:
+        >>> with DirIndex("//server/share/data", "data.idx") as index:
+        ...     changes = index.refresh()
+        ...     for file_path in changes.added:
+        ...         ...
+    """
+
+    def __init__(self, dir_path: str, index_path: str):
+        """
+        Args:
+            dir_path (str): 任意のフォルダパス
+            index_path (str): 索引ファイルのパス（dir_path の外に置くこと）
+        """
+        self.dir_path = dir_path
+        self.index_path = index_path
+        self._db = sqlite3.connect(index_path)
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if row is not None and row[0] != dir_path:
+            # ? 別のフォルダの索引だった場合は作り直す
+            self._db.execute("DELETE FROM dirs")
+            self._db.execute("DELETE FROM files")
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('root', ?)", (dir_path,))
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def _rescan(self, current_dir: str, changes: DirChanges) -> list:
+        """フォルダを読み直して索引を更新し、サブフォルダのパスのリストを返す。"""
+        files = {}
+        sub_dirs = []
+        with os.scandir(current_dir) as it:
+            for entry in it:
+                try:
+                    # * os.walk と同じく、シンボリックリンクのフォルダはたどらない
+                    if entry.is_dir():
+                        if entry.is_symlink() is False:
+                            sub_dirs.append(entry.path)
+                        continue
+                    st = entry.stat()
+                    files[entry.path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self._db.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE dir = ?", (current_dir,)
+            )
+        }
+        for path, stat in files.items():
+            old = known.pop(path, None)
+            if old is None:
+                changes.added.append(path)
+            elif old != stat:
+                changes.modified.append(path)
+            else:
+                continue
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (path, dir, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (path, current_dir, stat[0], stat[1]),
+            )
+        for path in known:
+            changes.removed.append(path)
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+        return sub_dirs
+
+    def refresh(self, check_files: bool = False) -> DirChanges | bool:
+        """索引を更新する。更新日時が変わったフォルダだけを読み直す。
+
+        Args:
+            check_files (bool, optional):
+
+                True の場合は、全てのフォルダを読み直して、内容が変わったファイルも検出する。
+
+                Defaults to False.
+
+        Returns:
+            DirChanges | bool: 成功したら 前回からの変更（added, removed, modified）を返す。失敗した場合は False
+        """
+        if os.path.isdir(self.dir_path) is False:
+            log.error("指定のフォルダは存在しません。")
+            return False
+
+        known_dirs = {}
+        children = {}
+        for path, parent, mtime_ns in self._db.execute("SELECT path, parent, mtime_ns FROM dirs"):
+            known_dirs[path] = mtime_ns
+            children.setdefault(parent, []).append(path)
+
+        changes = DirChanges([], [], [])
+        racy_ns = time.time_ns() - int(_RACY_SECONDS * 1e9)
+        seen_dirs = set()
+        rescanned = 0
+        stack = [(self.dir_path, None)]
+        try:
+            while stack:
+                current_dir, parent = stack.pop()
+                try:
+                    mtime_ns = os.stat(current_dir).st_mtime_ns
+                except OSError:
+                    continue
+                seen_dirs.add(current_dir)
+                if check_files is False and known_dirs.get(current_dir) == mtime_ns:
+                    stack.extend((child, current_dir) for child in children.get(current_dir, ()))
+                    continue
+
+                try:
+                    sub_dirs = self._rescan(current_dir, changes)
+                except OSError:
+                    log.warning("%s を読み込めませんでした。", current_dir)
+                    continue
+                rescanned += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                    (current_dir, parent, mtime_ns if mtime_ns < racy_ns else -1),
+                )
+                stack.extend((sub_dir, current_dir) for sub_dir in sub_dirs)
+
+            # * 見つからなかったフォルダは、中のファイルごと索引から削除する
+            for path in known_dirs.keys() - seen_dirs:
+                changes.removed.extend(
+                    row[0] for row in self._db.execute("SELECT path FROM files WHERE dir = ?", (path,))
+                )
+                self._db.execute("DELETE FROM files WHERE dir = ?", (path,))
+                self._db.execute("DELETE FROM dirs WHERE path = ?", (path,))
+            self._db.commit()
+        except:
+            self._db.rollback()
+            log.error("処理に失敗しました。")
+            return False
+
+        log.info(
+            "読み直したフォルダ数: %s, 追加: %s, 削除: %s, 変更: %s",
+            rescanned,
+            len(changes.added),
+            len(changes.removed),
+            len(changes.modified),
+        )
+        return DirChanges(
+            tuple(changes.added), tuple(changes.removed), tuple(changes.modified)
+        )
+
+    def iter_files(self) -> Iterator[str]:
+        """索引に記録されているファイルのパスを、パスの順に1つずつ返す。"""
+        for row in self._db.execute("SELECT path FROM files ORDER BY path"):
+            yield row[0]
+
+    def files(self) -> tuple:
+        """索引に記録されているファイルの一覧を、get_file_list と同じくタプルで返す。"""
+        return tuple(self.iter_files())
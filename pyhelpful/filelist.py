@@ -0,0 +1,153 @@
+import bisect
+import os
+from array import array
+from collections.abc import Sequence
+from typing import Iterable
+from typing import Iterator
+
+
+class FileList(Sequence):
+    """ファイルパスの一覧を、フォルダ部分を共有して少ないメモリで保持するシーケンス
+
+    フォルダのパスは1回だけ保持し、ファイル名は1つの文字列に連結して位置（オフセット）で管理する。
+    フルパスの文字列は、要素を取り出すときに作る。
+    同じフォルダのファイルが続けて並んでいるほど（os.walk の順など）メモリが少なくて済む。
+
+    Examples:
+        >>> file_list = get_file_list("C:/data", compact=True)
+        >>> len(file_list), file_list[0], "C:/data/a.txt" in file_list
+        >>> for file_path in file_list.with_ext(".csv").sorted():
+        ...     ...
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        """
+        Args:
+            paths (Iterable[str], optional): ファイルパス
+
+                Defaults to ().
+        """
+        self._dirs: list = []
+        # * _dir_starts[i] は、_dirs[i] のフォルダの最初のファイルの番号
+        self._dir_starts = array("Q")
+        self._offsets = array("Q", [0])
+        self._names = ""
+        self._lookup = None
+
+        chunks = []
+        total = 0
+        interned = {}
+        last_dir = None
+        for path in paths:
+            dir_name, name = os.path.split(path)
+            if dir_name != last_dir:
+                self._dirs.append(interned.setdefault(dir_name, dir_name))
+                self._dir_starts.append(len(self._offsets) - 1)
+                last_dir = dir_name
+            chunks.append(name)
+            total += len(name)
+            self._offsets.append(total)
+        self._names = "".join(chunks)
+
+    @classmethod
+    def from_dirs(cls, dirs: Iterable[tuple]) -> "FileList":
+        """(フォルダのパス, ファイル名のリスト) から作る。フルパスの文字列を作らずに済む。
+
+        Args:
+            dirs (Iterable[tuple]): os.walk と同じく (フォルダのパス, ファイル名のリスト) を返すもの
+
+        Returns:
+            FileList: ファイルの一覧
+        """
+        file_list = cls()
+        chunks = []
+        total = 0
+        for dir_path, names in dirs:
+            if not names:
+                continue
+            file_list._dirs.append(dir_path)
+            file_list._dir_starts.append(len(file_list._offsets) - 1)
+            for name in names:
+                chunks.append(name)
+                total += len(name)
+                file_list._offsets.append(total)
+        file_list._names = "".join(chunks)
+        return file_list
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _name(self, i: int) -> str:
+        return self._names[self._offsets[i]: self._offsets[i + 1]]
+
+    def _dir_range(self, d: int) -> range:
+        """d 番目のフォルダのファイルの番号の範囲"""
+        end = self._dir_starts[d + 1] if d + 1 < len(self._dirs) else len(self)
+        return range(self._dir_starts[d], end)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return FileList(self[j] for j in range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("FileList index out of range")
+        d = bisect.bisect_right(self._dir_starts, i) - 1
+        return os.path.join(self._dirs[d], self._name(i))
+
+    def __iter__(self) -> Iterator[str]:
+        join = os.path.join
+        names = self._names
+        offsets = self._offsets
+        for d, dir_path in enumerate(self._dirs):
+            for i in self._dir_range(d):
+                yield join(dir_path, names[offsets[i]: offsets[i + 1]])
+
+    def __contains__(self, path) -> bool:
+        if not isinstance(path, str):
+            return False
+        if self._lookup is None:
+            # * フォルダのパスから、そのフォルダのファイルの範囲を引けるようにする（初回のみ）
+            self._lookup = {}
+            for d, dir_path in enumerate(self._dirs):
+                self._lookup.setdefault(dir_path, []).append(self._dir_range(d))
+        dir_name, name = os.path.split(path)
+        for indexes in self._lookup.get(dir_name, ()):
+            for i in indexes:
+                if self._name(i) == name:
+                    return True
+        return False
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (FileList, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "FileList({} files in {} dirs)".format(len(self), len(set(self._dirs)))
+
+    def sorted(self) -> "FileList":
+        """パスの順に並べ替えた一覧を返す。"""
+        return FileList(sorted(self))
+
+    def with_ext(self, *exts: str) -> "FileList":
+        """指定の拡張子（大文字・小文字は区別しない）のファイルだけの一覧を返す。
+
+        Args:
+            *exts (str): 拡張子（例: ".txt", "csv"）
+
+        Returns:
+            FileList: 絞り込んだ一覧
+        """
+        exts = tuple(ext.lower() if ext.startswith(".") else "." + ext.lower() for ext in exts)
+
+        def dirs():
+            for d, dir_path in enumerate(self._dirs):
+                names = [
+                    self._name(i)
+                    for i in self._dir_range(d)
+                    if os.path.splitext(self._name(i))[1].lower() in exts
+                ]
+                yield dir_path, names
+
+        return FileList.from_dirs(dirs())
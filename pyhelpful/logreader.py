@@ -0,0 +1,252 @@
+import datetime
+import json
+import mmap
+import os
+import re
+import sqlite3
+from typing import Iterator
+
+from .mylogger import MyStreamLogger
+
+log = MyStreamLogger("DEBUG")
+
+# * MyFileLogger の標準の書式（LOGGER_FOMAT）の1行目
+TEXT_RECORD_PATTERN = re.compile(
+    rb'^\[(?P<time>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)[^\]]*\] '
+    rb'\[Location >> (?P<file>.*?):(?P<line>\d+), function/method name: "(?P<function>[^"]*)"\] '
+    rb'\[(?P<level>[A-Z]+): '
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS records (
+    offset INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL,
+    time TEXT,
+    level TEXT,
+    file TEXT,
+    file_name TEXT,
+    line INTEGER,
+    function TEXT
+);
+CREATE INDEX IF NOT EXISTS records_time ON records (time);
+CREATE INDEX IF NOT EXISTS records_level_time ON records (level, time);
+CREATE INDEX IF NOT EXISTS records_function_time ON records (function, time);
+CREATE INDEX IF NOT EXISTS records_file_name_time ON records (file_name, time);
+"""
+
+# * ファイルが差し替えられていないかの確認に使う、先頭部分のバイト数
+_HEAD_SIZE = 256
+
+
+def _parse_record(line: bytes) -> tuple | None:
+    """ログの1行目から (time, level, file, line, function) を取り出す。レコードの先頭でない場合は None"""
+    if line.startswith(b"{"):
+        try:
+            data = json.loads(line)
+            return (
+                data["time"][:19].replace("T", " "),
+                data["level"],
+                data["file"],
+                data["line"],
+                data["function"],
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+    m = TEXT_RECORD_PATTERN.match(line)
+    if m is None:
+        return None
+    return (
+        m.group("time").decode(),
+        m.group("level").decode(),
+        m.group("file").decode("utf-8", "replace"),
+        int(m.group("line")),
+        m.group("function").decode("utf-8", "replace"),
+    )
+
+
+def _to_time_text(value: str | datetime.datetime | None) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value.replace("T", " ")
+
+
+class LogIndex:
+    """MyFileLogger が出力したログファイルの索引
+
+    ログファイルを memory-map して読み、レコードごとのバイト位置を
+    日時・レベル・呼び出し箇所（ファイル、関数名）で引けるように、
+    サイドカーファイル（SQLite）に記録する。
+    update() はファイルの末尾に追記された分だけを読み込む。
+
+    Examples:
+        >>> with LogIndex("app.log") as index:
+        ...     index.update()
+        ...     for record in index.query(
+        ...         level="ERROR", file="pyhelpful.py", function="file_copy",
+        ...         since="2026-10-18 02:00:00", until="2026-10-18 03:00:00",
+        ...     ):
+        ...         print(record)
+    """
+
+    def __init__(self, log_file_path: str, index_path: str | None = None):
+        """
+        Args:
+            log_file_path (str): ログファイルのフルパス
+
+            index_path (str | None, optional):
+
+                索引ファイルのパス。None の場合は "<ログファイル>.idx"
+
+                Defaults to None.
+        """
+        self.log_file_path = log_file_path
+        self.index_path = index_path or log_file_path + ".idx"
+        self._db = sqlite3.connect(self.index_path)
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def _meta(self, key: str):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _reset(self):
+        self._db.execute("DELETE FROM records")
+        self._db.execute("DELETE FROM meta")
+
+    def update(self) -> int:
+        """ログファイルの索引を更新する。前回の更新以降に追記されたレコードだけを読み込む。
+
+        ファイルが縮んだ、または先頭が変わった（ローテーションされた）場合は作り直す。
+
+        Returns:
+            int: 新たに索引に追加したレコード数
+        """
+        if os.path.isfile(self.log_file_path) is False:
+            log.error("指定のファイルは存在しません。: %s", self.log_file_path)
+            return 0
+
+        size = os.path.getsize(self.log_file_path)
+        if size == 0:
+            self._reset()
+            self._db.commit()
+            return 0
+
+        with open(self.log_file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            head = mm[:_HEAD_SIZE]
+            indexed_size = self._meta("indexed_size") or 0
+            indexed_head = self._meta("head") or b""
+            if indexed_size > size or head[: len(indexed_head)] != indexed_head:
+                self._reset()
+                indexed_size = 0
+
+            # * 最後のレコードには続きの行（例外のトレースバックなど）が追記されている可能性があるので読み直す
+            last = self._db.execute(
+                "SELECT offset FROM records ORDER BY offset DESC LIMIT 1"
+            ).fetchone()
+            pos = last[0] if last is not None else indexed_size
+            if last is not None:
+                self._db.execute("DELETE FROM records WHERE offset = ?", last)
+
+            rows = []
+            current = None
+            end = pos
+            while True:
+                nl = mm.find(b"\n", pos)
+                if nl == -1:
+                    # ? 書き込み途中の行は次回の更新で読む
+                    break
+                parsed = _parse_record(mm[pos:nl])
+                if parsed is not None:
+                    if current is not None:
+                        rows.append((current[0], pos - current[0]) + current[1])
+                    current = (pos, parsed)
+                pos = nl + 1
+                end = pos
+            if current is not None:
+                rows.append((current[0], end - current[0]) + current[1])
+
+        self._db.executemany(
+            "INSERT OR REPLACE INTO records "
+            "(offset, length, time, level, file, file_name, line, function) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (offset, length, time_text, level, file, os.path.basename(file), line, function)
+                for offset, length, time_text, level, file, line, function in rows
+            ),
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('indexed_size', ?)", (end,)
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('head', ?)",
+            (head[: min(_HEAD_SIZE, end)],),
+        )
+        self._db.commit()
+        return len(rows) - (1 if last is not None else 0)
+
+    def query(
+        self,
+        level: str | None = None,
+        file: str | None = None,
+        function: str | None = None,
+        since: str | datetime.datetime | None = None,
+        until: str | datetime.datetime | None = None,
+    ) -> Iterator[str]:
+        """条件に合うレコードを、ファイルの先頭から順に返す。
+
+        Args:
+            level (str | None, optional): "CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG" のいずれか
+            file (str | None, optional): 呼び出し元のファイル（ファイル名だけ、またはフルパス）
+            function (str | None, optional): 呼び出し元の関数・メソッド名
+            since (str | datetime | None, optional): この日時以降（"YYYY-mm-dd HH:MM:SS"）
+            until (str | datetime | None, optional): この日時より前（"YYYY-mm-dd HH:MM:SS"）
+
+        Yields:
+            str: レコードの文字列（複数行のレコードは改行を含む）
+        """
+        conditions = []
+        params = []
+        if level is not None:
+            conditions.append("level = ?")
+            params.append(level)
+        if file is not None:
+            if os.path.basename(file) == file:
+                conditions.append("file_name = ?")
+            else:
+                conditions.append("file = ?")
+            params.append(file)
+        if function is not None:
+            conditions.append("function = ?")
+            params.append(function)
+        if since is not None:
+            conditions.append("time >= ?")
+            params.append(_to_time_text(since))
+        if until is not None:
+            conditions.append("time < ?")
+            params.append(_to_time_text(until))
+        sql = "SELECT offset, length FROM records"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY offset"
+
+        rows = self._db.execute(sql, params).fetchall()
+        if not rows:
+            return
+        with open(self.log_file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for offset, length in rows:
+                yield mm[offset: offset + length].decode("utf-8", "replace").rstrip("\r\n")
@@ -1,12 +1,444 @@
+import datetime
+import gzip
+import json
 import logging
-import inspect
 import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class _LoggerRegistry:
+    """呼び出し箇所ごとのロガーを保持する、上限付きのキャッシュ
+
+    一度作成したロガーは再利用し、上限を超えた場合は最も古く使われたロガーから破棄する。
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._loggers: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, factory) -> logging.Logger:
+        """ロガーを取得する。未登録の場合は factory で作成して登録する。
+
+        Args:
+            key (Hashable): 呼び出し箇所を表すキー
+            factory (function): key を受け取り、ロガーを返す関数
+
+        Returns:
+            logging.Logger: 呼び出し箇所のロガー
+        """
+        with self._lock:
+            logger = self._loggers.get(key)
+            if logger is not None:
+                self._loggers.move_to_end(key)
+                return logger
+            logger = factory(key)
+            self._loggers[key] = logger
+            if len(self._loggers) > self.max_size:
+                self._loggers.popitem(last=False)
+            return logger
+
+    def clear(self):
+        with self._lock:
+            self._loggers.clear()
+
+    def __len__(self) -> int:
+        return len(self._loggers)
+
+
+class _AppendStream:
+    """O_APPEND で開いたファイルに、write() 1回を1回のシステムコールで書き込むストリーム
+
+    同じファイルを複数のプロセスから開いていても、1回の write() の内容は途中で他のプロセスの書き込みと混ざらない。
+    （Windows の O_APPEND はこの保証がないため、POSIX のローカルファイルシステムでの利用を想定）
+    """
+
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        self.name = filename
+        self.encoding = encoding
+        self._fd = os.open(
+            filename,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+
+    def write(self, data: str):
+        view = memoryview(data.encode(self.encoding))
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class _RotatingStream:
+    """サイズ・経過時間でログファイルをローテーションしながら書き込むストリーム
+
+    ローテーションしたファイルは "<ファイル名>.<日時>" にリネームし、
+    backup_count を超えた古いものから削除する。gzip での圧縮はバックグラウンドのスレッドで行う。
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        encoding: str = "utf-8",
+        max_bytes: int = 0,
+        rotate_interval: float = 0,
+        backup_count: int = 0,
+        compress: bool = False,
+    ):
+        self.name = filename
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self._open()
+
+    def _open(self):
+        self._file = open(self.name, mode="ab")
+        self._size = self._file.tell()
+        self._rollover_at = time.time() + self.rotate_interval
+
+    def _should_rollover(self, size: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes > 0 and self._size + size > self.max_bytes:
+            return True
+        if self.rotate_interval > 0 and time.time() >= self._rollover_at:
+            return True
+        return False
+
+    def _rotated_name(self) -> str:
+        rotated = "{}.{}".format(self.name, time.strftime("%Y%m%d-%H%M%S"))
+        candidate = rotated
+        i = 1
+        while os.path.exists(candidate) or os.path.exists(candidate + ".gz"):
+            candidate = "{}-{:03d}".format(rotated, i)
+            i += 1
+        return candidate
+
+    def _purge(self):
+        """backup_count を超えたローテーション済みのファイルを古いものから削除する。"""
+        if self.backup_count <= 0:
+            return
+        dir_name, base_name = os.path.split(self.name)
+        # * _rotated_name が付けた名前（"<ファイル名>.<日時>[-連番][.gz]"）だけを対象にする
+        # * （LogIndex の "<ファイル名>.idx" や SQLite の "-journal" などは削除しない）
+        pattern = re.compile(re.escape(base_name) + r"\.\d{8}-\d{6}(?:-\d{3,})?(?:\.gz)?")
+        rotated = sorted(
+            {
+                entry.name[: -len(".gz")] if entry.name.endswith(".gz") else entry.name
+                for entry in os.scandir(dir_name or ".")
+                if pattern.fullmatch(entry.name)
+            }
+        )
+        for name in rotated[: max(0, len(rotated) - self.backup_count)]:
+            for path in (os.path.join(dir_name, name), os.path.join(dir_name, name + ".gz")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def rollover(self):
+        self._file.close()
+        rotated = self._rotated_name()
+        os.replace(self.name, rotated)
+        if self.compress is True:
+            _compressor.submit(rotated)
+        self._purge()
+        self._open()
+
+    def write(self, data: str):
+        encoded = data.encode(self.encoding)
+        if self._should_rollover(len(encoded)):
+            self.rollover()
+        self._file.write(encoded)
+        self._size += len(encoded)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _Compressor:
+    """ローテーションしたログファイルを、書き込み側を止めずに gzip で圧縮する。"""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str):
+        with self._lock:
+            if self._thread is None or self._thread.is_alive() is False:
+                self._thread = threading.Thread(
+                    target=self._run, name="pyhelpful-log-compressor", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(path)
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                with open(path, "rb") as f_in, gzip.open(path + ".gz", "wb") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                os.remove(path)
+            except OSError:
+                # ? 圧縮前に保持数を超えて削除された場合など
+                pass
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """投入済みのファイルの圧縮が全て終わるまで待つ。"""
+        self._queue.join()
+
+
+_compressor = _Compressor()
+
+
+class _LazyStreamHandler(logging.StreamHandler):
+    """最初の書き込みの時点で opener を呼び出してストリームを開くハンドラ"""
+
+    def __init__(self, filename: str, opener):
+        self.baseFilename = os.path.abspath(filename)
+        self._opener = opener
+        logging.Handler.__init__(self)
+        self.stream = None
+
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            # * 同時に最初の書き込みをしたスレッドが、それぞれストリームを開かないようにする
+            with self.lock:
+                if self.stream is None:
+                    try:
+                        self.stream = self._opener()
+                    except Exception:
+                        self.handleError(record)
+                        return
+        super().emit(record)
+
+    def close(self):
+        with self.lock:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        super().close()
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """ログレコードを1行1オブジェクトの JSON に整形する。"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "file": record.pathname,
+            "line": record.lineno,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _QueuedFileHandler(logging.Handler):
+    """ログレコードをキューに積み、バックグラウンドのスレッドでまとめてファイルに書き込むハンドラ
+
+    呼び出し側のスレッドはキューに積むだけで戻り、ファイルの書き込みは
+    書き込み用のスレッドが開いたままのファイルに対してまとめて行う。
+    """
+
+    terminator = "\n"
+
+    # * 書き込み用スレッドに終了を知らせる目印
+    _STOP = object()
+
+    def __init__(
+        self,
+        filename: str,
+        encoding: str = "utf-8",
+        flush_interval: float = 1.0,
+        batch_size: int = 100,
+        queue_size: int = 10000,
+        when_full: str = "block",
+        opener=None,
+    ):
+        """
+        Args:
+            filename (str): ログファイルのフルパス
+            encoding (str, optional): 文字コード。Defaults to "utf-8".
+            flush_interval (float, optional): ファイルへ flush する間隔（秒）。Defaults to 1.0.
+            batch_size (int, optional): 1回にまとめて書き込むレコードの最大数。Defaults to 100.
+            queue_size (int, optional): キューに積めるレコードの最大数。Defaults to 10000.
+            when_full (str, optional):
+                キューが一杯の場合の処理。
+
+                "block": 空きができるまで待つ
+                "drop": そのレコードを捨てる（捨てた数は dropped に記録する）
+
+                Defaults to "block".
+
+            opener (function, optional):
+                書き込み先のストリームを開く関数。None の場合は追記モードでファイルを開く。
+
+                Defaults to None.
+        """
+        super().__init__()
+        if when_full not in ("block", "drop"):
+            raise ValueError('when_full は "block" または "drop" を指定してください。')
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.when_full = when_full
+        self._opener = opener
+        self.dropped = 0
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        # * 書き込み用スレッドが止まってしまった場合に、呼び出し側のスレッドで直接書き込むストリーム
+        self._direct_stream = None
+        self._thread = threading.Thread(
+            target=self._run, name="pyhelpful-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        if self._closed:
+            return
+        if self._thread.is_alive() is False:
+            self._emit_directly(record)
+        elif self.when_full == "block":
+            # ? 待っている間に書き込み用スレッドが止まっても待ち続けないよう、一定時間ごとに確認する
+            while True:
+                try:
+                    self.queue.put(record, timeout=0.5)
+                    return
+                except queue.Full:
+                    if self._thread.is_alive() is False:
+                        self._emit_directly(record)
+                        return
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _emit_directly(self, record: logging.LogRecord):
+        """書き込み用スレッドを使わずに、呼び出し側のスレッドでファイルに書き込む。"""
+        with self.lock:
+            try:
+                if self._direct_stream is None:
+                    self._direct_stream = self._open()
+                self._direct_stream.write(self.format(record) + self.terminator)
+                self._direct_stream.flush()
+            except Exception:
+                self.handleError(record)
+
+    def _open(self):
+        if self._opener is not None:
+            return self._opener()
+        return open(self.baseFilename, mode="a", encoding=self.encoding)
+
+    def _run(self):
+        stream = None
+        pending = 0
+        last_flush = time.monotonic()
+        stop = False
+        # * 書き込み・flush に失敗した場合に handleError に渡す、最後に書き込んだレコード
+        last_record = None
+        while stop is False:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+
+            # * キューに溜まっているレコードを batch_size 件までまとめて書き込む
+            lines = []
+            while record is not None:
+                if record is self._STOP:
+                    stop = True
+                    break
+                try:
+                    lines.append(self.format(record) + self.terminator)
+                    last_record = record
+                except Exception:
+                    self.handleError(record)
+                if len(lines) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    record = None
+
+            try:
+                if lines:
+                    if stream is None:
+                        stream = self._open()
+                    stream.write("".join(lines))
+                    pending += len(lines)
+                now = time.monotonic()
+                if pending == 0:
+                    last_flush = now
+                elif stop or pending >= self.batch_size or now - last_flush >= self.flush_interval:
+                    stream.flush()
+                    pending = 0
+                    last_flush = now
+            except Exception:
+                self.handleError(last_record)
+
+        if stream is not None:
+            stream.close()
+
+    def close(self):
+        """キューに残っているレコードを全て書き込んでから、ファイルを閉じる。"""
+        with self.lock:
+            if self._closed is False:
+                self._closed = True
+                self.queue.put(self._STOP)
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        with self.lock:
+            if self._direct_stream is not None:
+                self._direct_stream.close()
+                self._direct_stream = None
+        super().close()
 
 
 class MyStreamLogger:
 
     LOGGER_FOMAT: str = "[%(asctime)s] [%(name)s] [%(levelname)s: %(message)s]"
 
+    # * 1インスタンスが保持する呼び出し箇所ごとのロガーの上限数
+    REGISTRY_MAX_SIZE: int = 1024
+
+    LEVELS: dict = {
+        "CRITICAL": logging.CRITICAL,
+        "ERROR": logging.ERROR,
+        "WARNING": logging.WARNING,
+        "INFO": logging.INFO,
+        "DEBUG": logging.DEBUG,
+    }
+
     def __init__(self, set_level: str = "DEBUG"):
         """ターミナルにログメッセージを出力する。
 
@@ -18,76 +450,139 @@ class MyStreamLogger:
             Defaults to "DEBUG".
         """
 
+        self._handler = None
+        self._handler_lock = threading.Lock()
+        self._registry = _LoggerRegistry(self.REGISTRY_MAX_SIZE)
         self.set_level = set_level
 
+    @property
+    def set_level(self) -> str:
+        return self._set_level
+
+    @set_level.setter
+    def set_level(self, set_level: str):
+        self._set_level = set_level
+        self._level = self.LEVELS.get(set_level, logging.DEBUG)
+        # * キャッシュ済みのロガーは古いレベルのままなので作り直す
+        self._registry.clear()
+
+    def _create_handler(self) -> logging.Handler:
+        return logging.StreamHandler()
+
+    def _create_formatter(self) -> logging.Formatter:
+        return logging.Formatter(self.LOGGER_FOMAT)
+
+    def _get_handler(self) -> logging.Handler:
+        """全ての呼び出し箇所で共有するハンドラを取得する（初回のみ作成）"""
+        if self._handler is None:
+            with self._handler_lock:
+                if self._handler is None:
+                    handler = self._create_handler()
+                    handler.setFormatter(self._create_formatter())
+                    self._handler = handler
+        return self._handler
+
+    def _create_logger(self, call_site: tuple) -> logging.Logger:
+        # ? logging.getLogger() を使うと logging の管理用の辞書に登録され続けるため、
+        # ? ロガーは直接生成し、破棄はレジストリに任せる
+        logger = logging.Logger(self._location(*call_site))
+        logger.parent = logging.getLogger()
+        logger.setLevel(self._level)
+        logger.addHandler(self._get_handler())
+        return logger
+
+    @staticmethod
+    def _location(code, lineno: int) -> str:
+        return 'Location >> {}:{}, function/method name: "{}"'.format(
+            os.path.basename(code.co_filename),
+            lineno,
+            code.co_name,
+        )
+
+    def close(self):
+        """ハンドラを閉じて、キャッシュしたロガーを破棄する。"""
+        with self._handler_lock:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+        self._registry.clear()
+
     def trace(log_func):
         """ログ出力指示の記載場所（コードのファイル名と行番号、その関数・メソッド名）を取得するデコレータ
 
+        出力対象外のレベルの場合は、呼び出し元の取得もメッセージの整形もせずにすぐに戻る。
+
         Args:
             log_func (function): 各レベルのログを出力するメソッド
         """
+        level = logging.getLevelName(log_func.__name__.upper())
 
-        def get_location(self, msg: str | tuple | list):
-            frame = inspect.currentframe().f_back
-            self.location = 'Location >> {}:{}, function/method name: "{}"'.format(
-                os.path.basename(frame.f_code.co_filename),
-                frame.f_lineno,
-                frame.f_code.co_name,
-            )
-            self.logger = logging.getLogger(self.location)
-
-            if self.set_level == "CRITICAL":
-                self.logger.setLevel(logging.CRITICAL)
-            elif self.set_level == "ERROR":
-                self.logger.setLevel(logging.ERROR)
-            elif self.set_level == "WARNING":
-                self.logger.setLevel(logging.WARNING)
-            elif self.set_level == "INFO":
-                self.logger.setLevel(logging.INFO)
-            else:
-                self.logger.setLevel(logging.DEBUG)
+        def get_location(self, msg: str | tuple | list, *args):
+            if level < self._level or logging.root.manager.disable >= level:
+                return
+            frame = sys._getframe(1)
+            logger = self._registry.get((frame.f_code, frame.f_lineno), self._create_logger)
+            # ? 複数のスレッドから同時に呼び出されても他の呼び出し箇所のロガーで出力しないよう、
+            # ? 出力にはローカル変数のロガーを使う（self.logger / self.location は互換性のために残す）
+            self.logger = logger
+            self.location = logger.name
 
-            stream_handler = logging.StreamHandler()
-            stream_handler.setFormatter(logging.Formatter(self.LOGGER_FOMAT))
-            self.logger.addHandler(stream_handler)
-
-            log_func(self, msg)
+            log_func(self, logger, msg, *args)
 
         return get_location
 
     @staticmethod
-    def _msg_options(msg: str | tuple | list):
+    def _msg_options(msg: str | tuple | list, args: tuple = ()) -> tuple:
+        # * 文字列の組み立ては logging に任せ、実際に出力されるときだけ行われるようにする
+        # * （呼び出し元の情報は、各レベルのメソッドで stacklevel を指定して LogRecord に記録する）
         if type(msg) == tuple or type(msg) == list:
-            return "Iterator >> {}".format(msg)
+            return ("Iterator >> %s", msg)
+        elif args and type(msg) == str:
+            return ("Message >> " + msg,) + args
         else:
-            return "Message >> {}".format(msg)
+            return ("Message >> %s", msg)
 
     @trace
-    def debug(self, msg: str | tuple | list):
-        self.logger.debug(self._msg_options(msg))
+    def debug(self, logger: logging.Logger, msg: str | tuple | list, *args):
+        logger.debug(*self._msg_options(msg, args), stacklevel=3)
 
     @trace
-    def info(self, msg: str | tuple | list):
-        self.logger.info(self._msg_options(msg))
+    def info(self, logger: logging.Logger, msg: str | tuple | list, *args):
+        logger.info(*self._msg_options(msg, args), stacklevel=3)
 
     @trace
-    def warning(self, msg: str | tuple | list):
-        self.logger.warning(self._msg_options(msg))
+    def warning(self, logger: logging.Logger, msg: str | tuple | list, *args):
+        logger.warning(*self._msg_options(msg, args), stacklevel=3)
 
     @trace
-    def error(self, msg: str | tuple | list):
-        self.logger.error(self._msg_options(msg))
+    def error(self, logger: logging.Logger, msg: str | tuple | list, *args):
+        logger.error(*self._msg_options(msg, args), stacklevel=3)
 
     @trace
-    def critical(self, msg: str | tuple | list):
-        self.logger.critical(self._msg_options(msg))
+    def critical(self, logger: logging.Logger, msg: str | tuple | list, *args):
+        logger.critical(*self._msg_options(msg, args), stacklevel=3)
 
 
 class MyFileLogger(MyStreamLogger):
 
     LOGGER_FOMAT: str = "[%(asctime)s] [%(name)s] [%(levelname)s: %(message)s]"
 
-    def __init__(self, log_file_path: str, set_level: str = "DEBUG"):
+    def __init__(
+        self,
+        log_file_path: str,
+        set_level: str = "DEBUG",
+        async_mode: bool = False,
+        flush_interval: float = 1.0,
+        batch_size: int = 100,
+        queue_size: int = 10000,
+        when_full: str = "block",
+        multiprocess: bool = False,
+        max_bytes: int = 0,
+        rotate_interval: float = 0,
+        backup_count: int = 0,
+        compress: bool = False,
+        json_lines: bool = False,
+    ):
         """ターミナルにログメッセージを出力する。さらに、指定のログファイルにも出力する。
 
         Args:
@@ -98,69 +593,143 @@ class MyFileLogger(MyStreamLogger):
                 "CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG" から選択。
 
                 Defaults to "DEBUG".
-        """
 
-        self.set_level = set_level
-        self.log_file_path = log_file_path
+            async_mode (bool, optional):
 
-    def trace(log_func):
-        """ログ出力指示の記載場所（コードのファイル名と行番号、その関数・メソッド名）を取得するデコレータ
+                True の場合は、ログをキューに積むだけで戻り、バックグラウンドのスレッドがまとめてファイルに書き込む。
+                キューに残ったログは close() で全て書き込まれる。
 
-        Args:
-            log_func (function): 各レベルのログを出力するメソッド
-        """
+                Defaults to False.
 
-        def get_location(self, msg: str | tuple | list):
-            frame = inspect.currentframe().f_back
-            _dir = os.path.dirname(frame.f_code.co_filename)
-            _file = os.path.basename(frame.f_code.co_filename)
-            _file_path = os.path.join(_dir, _file)
-            self.location = 'Location >> {}:{}, function/method name: "{}"'.format(
-                _file_path,
-                frame.f_lineno,
-                frame.f_code.co_name,
-            )
-            self.logger = logging.getLogger(self.location)
-
-            if self.set_level == "CRITICAL":
-                self.logger.setLevel(logging.CRITICAL)
-            elif self.set_level == "ERROR":
-                self.logger.setLevel(logging.ERROR)
-            elif self.set_level == "WARNING":
-                self.logger.setLevel(logging.WARNING)
-            elif self.set_level == "INFO":
-                self.logger.setLevel(logging.INFO)
-            else:
-                self.logger.setLevel(logging.DEBUG)
-
-            file_handler = logging.FileHandler(
-                filename=self.log_file_path,
-                encoding="utf-8",
-            )
-            file_handler.setFormatter(logging.Formatter(self.LOGGER_FOMAT))
-            self.logger.addHandler(file_handler)
+            flush_interval (float, optional):
 
-            log_func(self, msg)
-            file_handler.close()
+                async_mode の場合に、ファイルへ flush する間隔（秒）。
 
-        return get_location
+                Defaults to 1.0.
 
-    @trace
-    def debug(self, msg: str | tuple | list):
-        self.logger.debug(self._msg_options(msg))
+            batch_size (int, optional):
 
-    @trace
-    def info(self, msg: str | tuple | list):
-        self.logger.info(self._msg_options(msg))
+                async_mode の場合に、1回にまとめて書き込むログの最大数。
 
-    @trace
-    def warning(self, msg: str | tuple | list):
-        self.logger.warning(self._msg_options(msg))
+                Defaults to 100.
 
-    @trace
-    def error(self, msg: str | tuple | list):
-        self.logger.error(self._msg_options(msg))
+            queue_size (int, optional):
 
-    @trace
-    def critical(self, msg: str | tuple | list):
-        self.logger.critical(self._msg_options(msg))
+                async_mode の場合に、キューに積めるログの最大数。
+
+                Defaults to 10000.
+
+            when_full (str, optional):
+
+                async_mode でキューが一杯の場合の処理。"block"（空くまで待つ）または "drop"（捨てる）。
+
+                Defaults to "block".
+
+            multiprocess (bool, optional):
+
+                True の場合は、1件のログ（async_mode ではまとめた分）を O_APPEND で開いたファイルへ1回の write() で書き込む。
+                multiprocessing などで複数のプロセスが同じログファイルに書き込んでも、行が混ざらない。
+
+                Defaults to False.
+
+            max_bytes (int, optional):
+
+                ログファイルがこのサイズ（バイト）を超える場合にローテーションする。0 の場合はサイズではローテーションしない。
+
+                Defaults to 0.
+
+            rotate_interval (float, optional):
+
+                この秒数が経過するごとにローテーションする。0 の場合は時間ではローテーションしない。
+
+                Defaults to 0.
+
+            backup_count (int, optional):
+
+                ローテーションしたファイルを残す数。0 の場合は全て残す。
+
+                Defaults to 0.
+
+            compress (bool, optional):
+
+                True の場合は、ローテーションしたファイルをバックグラウンドで gzip 圧縮する。
+
+                Defaults to False.
+
+            json_lines (bool, optional):
+
+                True の場合は、レベル・日時・ファイル・行番号・関数名・メッセージを項目に分けた JSON を1行ずつ出力する。
+
+                Defaults to False.
+        """
+
+        if when_full not in ("block", "drop"):
+            raise ValueError('when_full は "block" または "drop" を指定してください。')
+        if multiprocess is True and (max_bytes > 0 or rotate_interval > 0):
+            raise ValueError("multiprocess とローテーションは同時に指定できません。")
+
+        super().__init__(set_level)
+        self.log_file_path = log_file_path
+        self.async_mode = async_mode
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.when_full = when_full
+        self.multiprocess = multiprocess
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.json_lines = json_lines
+
+    def _stream_opener(self):
+        """ログファイルを開く関数を返す。通常のファイルで良い場合は None"""
+        if self.multiprocess is True:
+            return lambda: _AppendStream(self.log_file_path, "utf-8")
+        if self.max_bytes > 0 or self.rotate_interval > 0:
+            return lambda: _RotatingStream(
+                self.log_file_path,
+                "utf-8",
+                max_bytes=self.max_bytes,
+                rotate_interval=self.rotate_interval,
+                backup_count=self.backup_count,
+                compress=self.compress,
+            )
+        return None
+
+    def _create_formatter(self) -> logging.Formatter:
+        if self.json_lines is True:
+            return _JsonLinesFormatter()
+        return super()._create_formatter()
+
+    def _create_handler(self) -> logging.Handler:
+        opener = self._stream_opener()
+        if self.async_mode is True:
+            return _QueuedFileHandler(
+                filename=self.log_file_path,
+                encoding="utf-8",
+                flush_interval=self.flush_interval,
+                batch_size=self.batch_size,
+                queue_size=self.queue_size,
+                when_full=self.when_full,
+                opener=opener,
+            )
+        if opener is not None:
+            return _LazyStreamHandler(self.log_file_path, opener)
+        # * 最初の書き込みまでファイルは開かない。以降は close() まで開いたまま使い回す
+        return logging.FileHandler(
+            filename=self.log_file_path,
+            encoding="utf-8",
+            delay=True,
+        )
+
+    @staticmethod
+    def _location(code, lineno: int) -> str:
+        _dir = os.path.dirname(code.co_filename)
+        _file = os.path.basename(code.co_filename)
+        _file_path = os.path.join(_dir, _file)
+        return 'Location >> {}:{}, function/method name: "{}"'.format(
+            _file_path,
+            lineno,
+            code.co_name,
+        )
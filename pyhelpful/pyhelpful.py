@@ -1,16 +1,85 @@
+import codecs
+import concurrent.futures
+import contextlib
+import errno
+import fnmatch
+import hashlib
+import itertools
+import json
+import mmap
 import os
 import re
 import pathlib
+import queue
 import shutil
+import stat
+import sys
+import threading
 import time
-from tkinter import Tk
-from tkinter import filedialog
+import weakref
 from typing import Any
-
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+
+try:
+    import fcntl
+except ImportError:
+    # ? Windows など
+    fcntl = None
+
+from . import statcache
+from .filelist import FileList
 from .mylogger import MyStreamLogger
 
 log = MyStreamLogger("DEBUG")
 
+# * dialog_session() の中で使い回す、非表示の Tk ルート
+_dialog_root = None
+
+
+@contextlib.contextmanager
+def dialog_session():
+    """ダイアログ用の非表示の Tk ルートを1つだけ作り、with ブロックの中で使い回す。
+
+    ファイルを続けて何度も選択する場合に、ダイアログを開くたびに Tk を起動し直す時間を省ける。
+    Tk の制約により、with ブロックを開始したスレッドの中で使うこと。
+
+    Examples:
+        >>> with dialog_session():
+        ...     file_path = dialog_file_picker()
+        ...     dir_path = dialog_folder_picker()
+    """
+    global _dialog_root
+    if _dialog_root is not None:
+        # ? 入れ子で使われた場合は、外側のセッションのルートをそのまま使う
+        yield
+        return
+
+    # * tkinter はダイアログを使うときにだけ読み込む（GUI のない環境でも他の関数は使えるように）
+    from tkinter import Tk
+
+    root = Tk()
+    root.attributes('-topmost', True)
+    root.withdraw()
+    _dialog_root = root
+    try:
+        yield
+    finally:
+        _dialog_root = None
+        root.destroy()
+
+
+def _dialog_initialdir(init_dir: str) -> str:
+    if init_dir == "":
+        return os.getcwd()
+    elif os.path.isdir(init_dir) is True:
+        return init_dir
+    else:
+        log.warning("%s は存在しません。", init_dir)
+        return os.getcwd()
+
 
 def dialog_file_picker(init_dir: str = "", heading: str = "", types: str = "*") -> str | None:
     """ダイアログを使ったファイルパスの取得
@@ -37,22 +106,15 @@ def dialog_file_picker(init_dir: str = "", heading: str = "", types: str = "*")
     Returns:
         str | None: 成功したら 取得したファイルパス(str)を返す。取得できなかった場合は None
     """
-    root = Tk()
-    root.attributes('-topmost', True)
-    root.withdraw()
-    if init_dir == "":
-        initialdir = os.getcwd()
-    else:
-        if os.path.isdir(init_dir) is True:
-            initialdir = init_dir
-        else:
-            initialdir = os.getcwd()
-            log.warning("{} は存在しません。".format(initialdir))
-    filetypes = [(heading, types)]
-    path = filedialog.askopenfilename(
-        filetypes=filetypes, initialdir=initialdir)
-    log.debug("取得したファイルパス: {}, Type: {}".format(path, type(path)))
-    root.destroy()
+    from tkinter import filedialog
+
+    with dialog_session():
+        path = filedialog.askopenfilename(
+            parent=_dialog_root,
+            filetypes=[(heading, types)],
+            initialdir=_dialog_initialdir(init_dir),
+        )
+    log.debug("取得したファイルパス: %s, Type: %s", path, type(path))
     if path:
         return path
     else:
@@ -60,6 +122,47 @@ def dialog_file_picker(init_dir: str = "", heading: str = "", types: str = "*")
         return None
 
 
+def dialog_files_picker(init_dir: str = "", heading: str = "", types: str = "*") -> tuple | None:
+    """ダイアログを使った複数のファイルパスの取得
+
+    Args:
+        init_dir (str, optional):
+
+            ダイアログの初期フォルダのパス。
+
+            Defaults to "".
+
+        heading (str, optional):
+
+            ダイアログのファイルの見出し。
+
+            Defaults to "".
+
+        types (str, optional):
+
+            拡張子のフィルタ文字
+
+            Defaults to "*".
+
+    Returns:
+        tuple | None: 成功したら 取得したファイルパスのタプルを返す。取得できなかった場合は None
+    """
+    from tkinter import filedialog
+
+    with dialog_session():
+        paths = filedialog.askopenfilenames(
+            parent=_dialog_root,
+            filetypes=[(heading, types)],
+            initialdir=_dialog_initialdir(init_dir),
+        )
+    log.debug("取得したファイルパス: %s, Type: %s", paths, type(paths))
+    if paths:
+        return tuple(paths)
+    else:
+        log.warning("ファイルは選択されていません。")
+        return None
+
+
 def dialog_folder_picker(init_dir: str = "") -> str | None:
     """ダイアログを使ったフォルダパスの取得
 
@@ -73,20 +176,14 @@ def dialog_folder_picker(init_dir: str = "") -> str | None:
     Returns:
         str | None: 成功したら 取得したフォルダパス(str)を返す。取得できなかった場合は None
     """
-    root = Tk()
-    root.attributes('-topmost', True)
-    root.withdraw()
-    if init_dir == "":
-        initialdir = os.getcwd()
-    else:
-        if os.path.isdir(init_dir) is True:
-            initialdir = init_dir
-        else:
-            initialdir = os.getcwd()
-            log.warning("{} は存在しません。".format(initialdir))
-    path = filedialog.askdirectory(initialdir=initialdir)
-    log.debug("取得したフォルダパス: {}, Type: {}".format(path, type(path)))
-    root.destroy()
+    from tkinter import filedialog
+
+    with dialog_session():
+        path = filedialog.askdirectory(
+            parent=_dialog_root,
+            initialdir=_dialog_initialdir(init_dir),
+        )
+    log.debug("取得したフォルダパス: %s, Type: %s", path, type(path))
     if path:
         return path
     else:
@@ -94,6 +191,18 @@ def dialog_folder_picker(init_dir: str = "") -> str | None:
         return None
 
 
+# * ファイル名・フォルダ名に使えない文字（禁止文字）。1回の検索・置き換えで済むように、文字クラスにしておく
+_INVALID_CHAR_PATTERN = re.compile(r'[\\/:*?"<>|]')
+
+# * 禁止文字と制御文字（sanitize_file_names で使う）
+_INVALID_NAME_CHAR_PATTERN = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+# * Windows で予約されているファイル名（拡張子がついていても使えない）
+_RESERVED_NAME_PATTERN = re.compile(
+    r"(?:CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9]) *(?:\.|$)", re.IGNORECASE
+)
+
+
 def is_invalid_char(string: str) -> bool:
     """指定の文字列内に禁止文字が使用されているかを判定する。
 
@@ -103,24 +212,7 @@ def is_invalid_char(string: str) -> bool:
     Returns:
         bool: 無効文字が含まれている場合は True
     """
-    invalid_character = [
-        "\\",
-        "/",
-        ":",
-        "*",
-        "?",
-        '"',
-        "<",
-        ">",
-        "|",
-    ]
-
-    for character in invalid_character:
-        if character in string:
-            return True
-        else:
-            pass
-    return False
+    return _INVALID_CHAR_PATTERN.search(string) is not None
 
 
 def replace_invalid_char(string: str, replace_char="-") -> str:
@@ -140,11 +232,121 @@ def replace_invalid_char(string: str, replace_char="-") -> str:
     """
     if is_invalid_char(replace_char) is True:
         # ? 無効文字を別の無効文字に置き換えようとした場合の処理
-        log.warning('{} は無効文字です。 "-" で代用します。'.format(replace_char))
+        log.warning('%s は無効文字です。 "-" で代用します。', replace_char)
         replace_char = "-"
     else:
         pass
-    return re.sub(r'[|\\|/|:|*|?|"|<|>|]', replace_char, string)
+    return _INVALID_CHAR_PATTERN.sub(replace_char, string)
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """UTF-8 で max_bytes バイト以内になるように、文字の途中で切らずに末尾を除く。"""
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    return data[:max_bytes].decode("utf-8", "ignore")
+
+
+def sanitize_file_names(
+    names: Iterable[str],
+    replace_char: str = "-",
+    max_length: int | None = 255,
+    target_dir_path: str | None = None,
+    unique: bool = True,
+) -> list | None:
+    """複数のファイル名を、まとめてファイル名として使える文字列に変換する。
+
+    1つのファイル名につき、次の処理を行う。
+
+    - 禁止文字と制御文字を replace_char に置き換える
+    - 末尾の空白とピリオドを除く（Windows では使えない）
+    - Windows の予約名（CON, NUL, COM1 など）の場合は、先頭に "_" をつける
+    - UTF-8 で max_length バイトを超える場合は、拡張子を残して短くする（短くした後の末尾の空白とピリオドも除く）
+    - unique = True の場合は、同じ名前（大文字・小文字は区別しない）が重なったら、末尾に "_1", "_2", ... をつける
+
+    Examples:
+        >>> sanitize_file_names(["a:b.txt", "CON.txt", "a-b.txt"])
+        ['a-b.txt', '_CON.txt', 'a-b_1.txt']
+
+    Args:
+        names (Iterable[str]): ファイル名
+
+        replace_char (str, optional): 禁止文字を置き換える文字
+
+            Defaults to "-".
+
+        max_length (int | None, optional):
+
+            ファイル名の最大のバイト数（UTF-8）。多くのファイルシステムの上限は 255 バイト。None の場合は制限しない
+
+            Defaults to 255.
+
+        target_dir_path (str | None, optional):
+
+            指定した場合は、このフォルダに既にあるファイル・フォルダとも重ならないようにする
+
+            Defaults to None.
+
+        unique (bool, optional): True の場合は、変換後のファイル名が重ならないようにする
+
+            Defaults to True.
+
+    Returns:
+        list | None: 成功したら names と同じ順の変換後のファイル名のリスト。失敗した場合は None
+    """
+    if is_invalid_char(replace_char) is True:
+        log.warning('%s は無効文字です。 "-" で代用します。', replace_char)
+        replace_char = "-"
+
+    used = set()
+    if target_dir_path is not None:
+        try:
+            used = {name.casefold() for name in os.listdir(target_dir_path)}
+        except OSError:
+            log.error("指定のフォルダは存在しません。")
+            return None
+
+    # * 重なった名前ごとの、次に試す連番
+    counters = {}
+    results = []
+    # * 1件ごとの属性の参照を減らすため、ローカル変数にしておく
+    sub = _INVALID_NAME_CHAR_PATTERN.sub
+    match_reserved = _RESERVED_NAME_PATTERN.match
+    for name in names:
+        name = sub(replace_char, name).rstrip(" .")
+        if not name:
+            name = replace_char
+        if match_reserved(name) is not None:
+            name = "_" + name
+        if max_length is not None and len(name.encode("utf-8")) > max_length:
+            stem, ext = os.path.splitext(name)
+            ext_bytes = len(ext.encode("utf-8"))
+            if ext_bytes < max_length:
+                name = _truncate_utf8(stem, max_length - ext_bytes) + ext
+            else:
+                name = _truncate_utf8(name, max_length)
+            name = name.rstrip(" .") or replace_char
+
+        if unique is True:
+            key = name.casefold()
+            if key in used:
+                stem, ext = os.path.splitext(name)
+                i = counters.get(key, 1)
+                while True:
+                    suffix = "_{}{}".format(i, ext)
+                    if max_length is not None:
+                        candidate = _truncate_utf8(stem, max(max_length - len(suffix.encode("utf-8")), 0)) + suffix
+                    else:
+                        candidate = stem + suffix
+                    i += 1
+                    if candidate.casefold() not in used:
+                        break
+                counters[key] = i
+                name = candidate
+                key = name.casefold()
+            used.add(key)
+        results.append(name)
+    return results
 
 
 def dir_create(parent_dir_path: str, dir_name: str) -> str | None:
@@ -157,14 +359,21 @@ def dir_create(parent_dir_path: str, dir_name: str) -> str | None:
     Returns:
         str | None: 成功した場合は作成したフォルダのパス、失敗した場合は None を返す。
     """
-    sub_dir = re.sub(r'[\\|/|:|*|?|"|<|>|]', "-", dir_name)
+    sub_dir = _INVALID_CHAR_PATTERN.sub("-", dir_name)
     try:
         create_dir = os.path.join(parent_dir_path, sub_dir)
-        if os.path.isdir(create_dir) is True:
-            log.warning("{} は既に存在します。".format(create_dir))
+        if statcache.isdir(create_dir) is True:
+            log.warning("%s は既に存在します。", create_dir)
         else:
+            # * 一緒に作成される親フォルダも含めて忘れるため、存在しない一番上のフォルダを探す
+            top_dir = os.path.abspath(create_dir)
+            parent = os.path.dirname(top_dir)
+            while parent != top_dir and os.path.isdir(parent) is False:
+                top_dir, parent = parent, os.path.dirname(parent)
             pathlib.Path(create_dir).mkdir(parents=True, exist_ok=True)
-            log.info("{} フォルダを新規作成しました。".format(create_dir))
+            statcache.invalidate(parent)
+            statcache.invalidate_tree(top_dir)
+            log.info("%s フォルダを新規作成しました。", create_dir)
         return str(create_dir)
     except:
         log.error("フォルダの新規作成に失敗しました。")
@@ -184,8 +393,112 @@ def dir_create_desktop(dir_name: str) -> str | None:
     return dir_create(parent_dir_path, dir_name)
 
 
+# * file_create_overwrite の durability に指定できる値
+_DURABILITY_LEVELS = ("none", "file", "dir")
+
+
+class _GroupCommit:
+    """同じファイルに追記するスレッドの fsync を1回にまとめる（グループコミット）。
+
+    fsync はファイル（inode）単位で、それまでに書き込まれた内容を全て保存するので、
+    他のスレッドが fsync している間に書き込みを終えたスレッドは、次の1回の fsync をまとめて待つ。
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._requested = 0
+        self._synced = 0
+        self._syncing = False
+
+    def sync(self, fd: int):
+        with self._cond:
+            self._requested += 1
+            ticket = self._requested
+            while True:
+                if self._synced >= ticket:
+                    return
+                if self._syncing is False:
+                    break
+                self._cond.wait()
+            self._syncing = True
+            # * ここまでに書き込みを終えたスレッドの分は、この fsync で保存される
+            target = self._requested
+        synced = False
+        try:
+            os.fsync(fd)
+            synced = True
+        finally:
+            with self._cond:
+                self._syncing = False
+                if synced is True:
+                    self._synced = max(self._synced, target)
+                self._cond.notify_all()
+
+
+_group_commits = weakref.WeakValueDictionary()
+_group_commits_lock = threading.Lock()
+
+
+def _group_commit(file_path: str) -> _GroupCommit:
+    with _group_commits_lock:
+        key = os.path.abspath(file_path)
+        group_commit = _group_commits.get(key)
+        if group_commit is None:
+            group_commit = _group_commits[key] = _GroupCommit()
+        return group_commit
+
+
+def _fsync_dir(dir_path: str):
+    """フォルダを fsync して、ファイルの作成・名前の変更を保存する（Windows では何もしない）。"""
+    if os.name == "nt":
+        return
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _temp_file_path(file_path: str) -> str:
+    """file_path を置き換えるための、同じフォルダの一時ファイルのパス"""
+    dir_path, file_name = os.path.split(file_path)
+    return os.path.join(dir_path, ".{}.{}.tmp".format(file_name, os.urandom(6).hex()))
+
+
+def _write_atomic(file_path: str, data: str, durability: str):
+    """同じフォルダの一時ファイルに書き込んでから、os.replace で置き換える。"""
+    dir_path = os.path.dirname(file_path)
+    temp_file_path = _temp_file_path(file_path)
+    try:
+        with open(temp_file_path, mode="x", encoding="utf-8", newline="\n") as f:
+            f.write(data)
+            f.flush()
+            if durability != "none":
+                os.fsync(f.fileno())
+        try:
+            # * 上書きする場合は、元のファイルのパーミッションを引き継ぐ
+            os.chmod(temp_file_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_file_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+        raise
+    if durability == "dir":
+        _fsync_dir(dir_path)
+
+
 def file_create_overwrite(
-    dir_path: str, file_name: str, mode: str, data: Any, eof_new_line: bool = True
+    dir_path: str,
+    file_name: str,
+    mode: str,
+    data: Any,
+    eof_new_line: bool = True,
+    atomic: bool = False,
+    durability: str = "none",
 ) -> bool:
     """新規ファイルを作成する。既にファイルが存在する場合は上書き、または、追記をする。
 
@@ -203,11 +516,24 @@ def file_create_overwrite(
 
             Defaults to True.
 
+        atomic (bool, optional):
+            mode = "w" の場合に、同じフォルダの一時ファイルに書き込んでから置き換える。
+            他のプロセスから、書き込み途中のファイルが見えない。
+
+            Defaults to False.
+
+        durability (str, optional): 書き込んだ内容をディスクに保存するか
+            "none": OS に任せる
+            "file": ファイルを fsync する（同時に追記するスレッドの fsync は1回にまとめる）
+            "dir": ファイルとフォルダを fsync する（ファイルの作成・置き換えも保存される）
+
+            Defaults to "none".
+
     Returns:
         bool: 成功したら True
     """
-    if os.path.isdir(dir_path) is False:
-        log.error("指定したフォルダ {} は存在しません。".format(dir_path))
+    if statcache.isdir(dir_path) is False:
+        log.error("指定したフォルダ %s は存在しません。", dir_path)
         return False
     else:
         file_path = os.path.join(dir_path, file_name)
@@ -218,12 +544,27 @@ def file_create_overwrite(
         mode = "a"
         log.warning("『mode』の指定が不正です。追記モード('a')で続行します。")
 
+    if durability not in _DURABILITY_LEVELS:
+        durability = "dir"
+        log.warning("『durability』の指定が不正です。'dir' で続行します。")
+
     try:
-        with open(file_path, mode=mode, encoding="utf-8", newline="\n") as f:
-            if eof_new_line is True:
-                f.write(data + "\n")
-            else:
+        if eof_new_line is True:
+            data = data + "\n"
+        if mode == "w" and atomic is True:
+            _write_atomic(file_path, data, durability)
+        else:
+            created = durability == "dir" and os.path.exists(file_path) is False
+            with open(file_path, mode=mode, encoding="utf-8", newline="\n") as f:
                 f.write(data)
+                if durability != "none":
+                    f.flush()
+                    if mode == "a":
+                        _group_commit(file_path).sync(f.fileno())
+                    else:
+                        os.fsync(f.fileno())
+            if created is True:
+                _fsync_dir(dir_path)
 
         if mode == "w":
             log.info("ファイルの作成 / 上書きが完了しました。")
@@ -233,212 +574,2014 @@ def file_create_overwrite(
     except:
         log.error("処理に失敗しました。")
         return False
+    finally:
+        statcache.invalidate(file_path)
 
 
-def file_copy(ref_file_path: str, target_dir_path: str, copy_as: bool = False) -> bool:
-    """ファイルのコピー。コピー先のフォルダは先に作っておくこと。
-
-    Args:
-        ref_file_path (str): コピー元のファイルパス
-        target_dir_path (str): コピー先のフォルダパス
-        copy_as (bool): 指定のコピー先に既に同名のファイルがあった場合の処理分岐
-            True: ファイル名の末尾に "_unixtime"をつけてコピーを作成する
-            False: コピーしない
+class FileWriter:
+    """ファイルを開いたままにして、書き込む内容をまとめて書き込むライター
 
-            Defaults to False.
+    file_create_overwrite を1行ずつ呼び出すと、毎回ファイルを開いて閉じるので遅い。
+    FileWriter は、書き込む内容を buffer_size 文字まで溜めてから、まとめて書き込む。
+    溜めた内容は flush_interval 秒ごとにも書き込む。複数のスレッドから同時に使ってもよい。
 
-    Returns:
-        bool: 成功したら True
+    Examples:
+        >>> with FileWriter("C:/data", "out.txt", "a") as writer:
+        ...     for record in records:
+        ...         writer.write(record)
     """
-    if os.path.isfile(ref_file_path) is False:
-        log.error("指定のファイルは存在しません。")
-        log.error("コピー元: {}".format(ref_file_path))
-        return False
-    else:
-        pass
 
-    if os.path.isdir(target_dir_path) is False:
-        log.error("指定のコピー先フォルダは存在しません。")
-        log.error("コピー先: {}".format(target_dir_path))
-        return False
-    else:
-        pass
+    def __init__(
+        self,
+        dir_path: str,
+        file_name: str,
+        mode: str = "a",
+        eof_new_line: bool = True,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float | None = 1.0,
+    ):
+        """
+        Args:
+            dir_path (str): ファイルを作成するフォルダのパス
+            file_name (str): 作成するファイル名
+            mode (str, optional): file_create_overwrite と同じ
+                "w": 新規作成（ファイルが存在する場合は上書き）
+                "a": 新規作成（ファイルの末尾から内容を追記）
+
+                Defaults to "a".
+
+            eof_new_line (bool, optional):
+                True の場合は、write() で書き込むたびに末尾で改行する（file_create_overwrite と同じ）
+
+                Defaults to True.
+
+            buffer_size (int, optional): 溜めておく最大の文字数
+
+                Defaults to 64 * 1024.
+
+            flush_interval (float | None, optional): 溜めた内容を書き込む間隔（秒）。None の場合は時間では書き込まない
+
+                Defaults to 1.0.
+        """
+        self.file_path = os.path.join(dir_path, file_name)
+        self.eof_new_line = eof_new_line
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._stop = threading.Event()
+        self._flusher = None
+
+        if statcache.isdir(dir_path) is False:
+            log.error("指定したフォルダ %s は存在しません。", dir_path)
+            return
+        if mode == "w" or mode == "a":
+            pass
+        else:
+            mode = "a"
+            log.warning("『mode』の指定が不正です。追記モード('a')で続行します。")
+
+        try:
+            self._file = open(self.file_path, mode=mode, encoding="utf-8", newline="\n")
+        except:
+            log.error("処理に失敗しました。")
+            return
+        statcache.invalidate(self.file_path)
+        if flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, args=(flush_interval,), daemon=True
+            )
+            self._flusher.start()
 
-    ref_file_name = os.path.basename(ref_file_path)
-    ext_name_tuple = os.path.splitext(ref_file_path)
-    if os.path.isfile(os.path.join(target_dir_path, ref_file_name)) is True:
+    def __enter__(self):
+        return self
 
-        if copy_as is False:
-            log.error("指定のコピー先フォルダには、既に同名のファイルが存在します。")
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush_periodically(self, interval: float):
+        while self._stop.wait(interval) is False:
+            self.flush()
+
+    def _write_buffer(self) -> bool:
+        """溜めた内容をファイルに書き込む。self._lock を取得してから呼び出すこと。"""
+        if not self._buffer:
+            return True
+        try:
+            self._file.write("".join(self._buffer))
+            self._file.flush()
+        except:
+            log.error("処理に失敗しました。")
             return False
+        finally:
+            self._buffer.clear()
+            self._buffered = 0
+        return True
 
-        elif copy_as is True:
-            target_dir_path = os.path.join(
-                target_dir_path,
-                ref_file_name[:-4] + "_" +
-                str(int(time.time())) + ext_name_tuple[-1],
-            )
-            log.warning("指定のコピー先フォルダには、既に同名のファイルが存在します。")
-            log.warning(
-                "引数: copy_as = True のため、ファイル末尾にUNIX時間を追加してコピーします。"
-            )
-            log.warning(target_dir_path)
-    else:
-        pass
+    def write(self, data: Any) -> bool:
+        """書き込む内容を追加する。溜めた内容が buffer_size を超えたらファイルに書き込む。
 
-    try:
-        shutil.copy(ref_file_path, target_dir_path)
-        log.info("ファイルのコピーが完了しました。")
+        Args:
+            data (Any): 書き込む内容
+
+        Returns:
+            bool: 成功したら True
+        """
+        with self._lock:
+            if self._file is None:
+                log.error("ファイルが開かれていません。")
+                return False
+            if self.eof_new_line is True:
+                data = data + "\n"
+            self._buffer.append(data)
+            self._buffered += len(data)
+            self._count += 1
+            if self._buffered >= self.buffer_size:
+                return self._write_buffer()
         return True
-    except:
-        log.error("処理に失敗しました。")
-        return False
 
+    def flush(self) -> bool:
+        """溜めた内容をファイルに書き込む。
 
-def dir_copy(ref_dir_path: str, target_dir_path: str) -> bool:
-    """
-    フォルダのコピー。
+        Returns:
+            bool: 成功したら True
+        """
+        with self._lock:
+            if self._file is None:
+                return False
+            return self._write_buffer()
+
+    def close(self) -> bool:
+        """溜めた内容を書き込んで、ファイルを閉じる。
+
+        Returns:
+            bool: 成功したら True
+        """
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._file is None:
+                return False
+            ok = self._write_buffer()
+            self._file.close()
+            self._file = None
+        if ok is True:
+            log.info("ファイルへの書き込みが完了しました。（%s 件）", self._count)
+        return ok
 
-    コピー先に既に同名のフォルダがある場合は処理しない。（上書き保存はしない）
+
+def file_read_mmap(file_path: str) -> memoryview | None:
+    """ファイルを memory-map して、内容をコピーせずに参照する memoryview を返す。
+
+    ファイル全体をメモリに読み込まないので、大きなファイルの一部だけを参照する場合に速い。
+    返した memoryview を参照しなくなると（または release() すると）、memory-map は閉じる。
+
+    Examples:
+        >>> with file_read_mmap("C:/data/large.bin") as view:
+        ...     header = bytes(view[:16])
 
     Args:
-        ref_dir_path (str): コピー元のフォルダパス
-        target_dir_path (str): コピー先のフォルダパス
+        file_path (str): 読み込むファイルのパス
 
     Returns:
-        bool: 成功したら True
+        memoryview | None: 成功したら ファイルの内容の memoryview。失敗した場合は None
     """
-    if os.path.isdir(ref_dir_path) is False:
-        log.error("指定のコピー元フォルダは存在しません。")
-        log.error("コピー元: {}".format(ref_dir_path))
-        return False
-    else:
-        pass
-    if os.path.isdir(target_dir_path) is True:
-        log.error("指定のコピー先には、既に同じ名前のフォルダが存在します。")
-        log.error("コピー先: {}".format(target_dir_path))
-        return False
-    else:
-        pass
+    if statcache.isfile(file_path) is False:
+        log.error("指定のファイルは存在しません。")
+        log.error("ファイル: %s", file_path)
+        return None
 
     try:
-        shutil.copytree(ref_dir_path, target_dir_path)
-        log.info("フォルダのコピーが完了しました。")
-        return True
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # ? 空のファイルは memory-map できない
+                return memoryview(b"")
+            # * memoryview が mmap を参照しているので、ファイルを閉じても読める
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
     except:
         log.error("処理に失敗しました。")
-        return False
+        return None
 
 
-def file_delete(file_path: str) -> bool:
-    """ファイルの削除
+def file_read_chunks(file_path: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """ファイルの内容を、chunk_size バイトずつ返すジェネレータ。ファイルの大きさに関わらず、使うメモリは一定
 
     Args:
-        file_path (str): 削除するファイルのパス
+        file_path (str): 読み込むファイルのパス
+        chunk_size (int, optional): 1回に返すバイト数（最後は短くなる）
 
-    Returns:
-        bool: 成功したら True
+            Defaults to 1024 * 1024.
+
+    Yields:
+        bytes: ファイルの内容
     """
-    if os.path.isfile(file_path) is False:
+    if statcache.isfile(file_path) is False:
         log.error("指定のファイルは存在しません。")
-        return False
-    else:
-        try:
-            os.remove(file_path)
-            log.info("ファイルの削除が完了しました。")
-            return True
-        except:
-            log.error("処理に失敗しました。")
-            return False
+        log.error("ファイル: %s", file_path)
+        return
+
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _iter_line_blocks(file_path: str, keepends: bool, chunk_size: int, errors: str) -> Iterator[list]:
+    """file_read_lines の本体。chunk_size バイトずつ読み込んでデコードし、行のリストを返す。"""
+    # * 改行が見つかるまでのチャンク（長い行でも、連結は改行が見つかったときの1回で済ませる）
+    rest = []
+    first = True
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if first is True:
+                first = False
+                if chunk.startswith(codecs.BOM_UTF8):
+                    chunk = chunk[len(codecs.BOM_UTF8):]
+            # * UTF-8 では、改行（0x0A）が複数バイトの文字の一部になることはないので、バイト列のまま区切ってよい
+            end = chunk.rfind(b"\n")
+            if end == -1:
+                rest.append(chunk)
+                continue
+            rest.append(chunk[:end])
+            text = b"".join(rest).decode("utf-8", errors)
+            rest = [chunk[end + 1:]]
+            lines = text.split("\n")
+            if keepends is True:
+                yield [line + "\n" for line in lines]
+            elif "\r" in text:
+                yield [line[:-1] if line.endswith("\r") else line for line in lines]
+            else:
+                yield lines
+    last = b"".join(rest)
+    if last:
+        # * 最後の行（末尾に改行がない場合）
+        line = last.decode("utf-8", errors)
+        if keepends is False and line.endswith("\r"):
+            line = line[:-1]
+        yield [line]
 
 
-def dir_delete(dir_path: str) -> bool:
-    """フォルダの削除
+def file_read_lines(
+    file_path: str, keepends: bool = False, chunk_size: int = 64 * 1024, errors: str = "strict"
+) -> Iterator[str]:
+    """UTF-8 のテキストファイルを1行ずつ返すイテレータ。ファイルの大きさに関わらず、使うメモリは一定
+
+    chunk_size バイトずつ読み込んで、まとめてデコードしてから行に分ける。
+    行を1つずつ取り出す処理は itertools.chain で行うので、open() したファイルを1行ずつ読むより速い。
+    改行は "\\n" と "\\r\\n" に対応し、先頭の BOM は除く。
 
     Args:
-        dir_path (str): 削除するフォルダのパス
+        file_path (str): 読み込むファイルのパス
+        keepends (bool, optional): True の場合は、行末の改行を残す
 
-    Returns:
-        bool: 成功したら True
-    """
-    if os.path.isdir(dir_path) is False:
-        log.error("指定のフォルダは存在しません。")
-        return False
-    else:
-        try:
-            shutil.rmtree(dir_path)
-            log.info("フォルダ {} の削除が完了しました。".format(dir_path))
-            return True
-        except:
-            log.error("処理に失敗しました。")
-            return False
+            Defaults to False.
 
+        chunk_size (int, optional): 1回に読み込むバイト数
 
-def get_info_dir_file_ext(file_path: str, info: str) -> str | bool:
-    """パス文字列から、フォルダ名、ファイル名、拡張子を取得する
+            Defaults to 64 * 1024.
 
-    Args:
-        file_path (str): 任意のファイルパス
+        errors (str, optional): デコードできないバイトの扱い（open と同じ "strict", "replace", "ignore" など）
 
-        info (str): 取得する情報
-            "dir_name": フォルダ名
-            "file_name": ファイル名
-            "ext_name": 拡張子名
-            "file_name_non_ext": 拡張子なしのファイル名
+            Defaults to "strict".
 
     Returns:
-        str | bool: 成功したら 指定の情報の文字列を返す。失敗した場合は False
+        Iterator[str]: 1行ずつの文字列を返すイテレータ
     """
-    if os.path.isfile(file_path) is False:
+    if statcache.isfile(file_path) is False:
         log.error("指定のファイルは存在しません。")
-        return False
-    else:
-        try:
-            dir_name = os.path.dirname(file_path)
-            file_name = os.path.basename(file_path)
-            ext_name_tuple = os.path.splitext(file_path)
-            ext_name = ext_name_tuple[-1]
-            file_name_non_ext = file_name[: (-1 * len(ext_name))]
-            if info == "dir_name":
-                log.info("dir name: {}".format(dir_name))
-                return dir_name
-            elif info == "file_name":
-                log.info("file name: {}".format(file_name))
-                return file_name
-            elif info == "ext_name":
-                log.info("ext name: {}".format(ext_name))
-                return ext_name
-            elif info == "file_name_non_ext":
-                log.info("file name non ext: {}".format(file_name_non_ext))
-                return file_name_non_ext
-            else:
-                log.error("info の引数が不正です。")
-                return False
-        except:
-            log.error("処理に失敗しました。")
-            return False
+        log.error("ファイル: %s", file_path)
+        return iter(())
 
+    return itertools.chain.from_iterable(_iter_line_blocks(file_path, keepends, chunk_size, errors))
 
-def get_file_list(dir_path: str) -> tuple | bool:
-    """任意のフォルダにあるファイルの一覧を取得
+
+# * Linux の ioctl(FICLONE)。reflink に対応したファイルシステム（Btrfs, XFS など）では、データを複製せずに共有する
+_FICLONE = 0x40049409
+
+# * カーネル内でのコピーができない場合に、別の方法に切り替える errno
+_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+
+def _copy_buffer_size(size: int) -> int:
+    """ユーザー空間でコピーする場合のバッファサイズ。ファイルサイズに合わせて 64KiB〜8MiB の範囲で決める。"""
+    return min(max(size, 64 * 1024), 8 * 1024 * 1024)
+
+
+def _copy_file_data(src, dst, size: int) -> str:
+    """開いたファイル src の内容を dst に書き込み、使った方法を返す。
+
+    reflink → copy_file_range → sendfile → バッファを使ったコピー の順に、使える方法を使う。
+    """
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            return "reflink"
+        except OSError:
+            pass
+
+    for method in ("copy_file_range", "sendfile"):
+        if hasattr(os, method) is False or sys.platform.startswith("linux") is False:
+            continue
+        if size == 0:
+            # ? 中身があってもサイズが 0 になるファイル（/proc など）は、EOF まで読むバッファを使ったコピーにする
+            break
+        copied = 0
+        try:
+            # * 1回で全てコピーされるとは限らないので、残りのバイト数を指定して繰り返す
+            while copied < size:
+                if method == "copy_file_range":
+                    n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                else:
+                    n = os.sendfile(dst_fd, src_fd, None, size - copied)
+                if n == 0:
+                    # ? コピーの途中でファイルが短くなった場合
+                    break
+                copied += n
+            return method
+        except OSError as e:
+            if copied > 0 or e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+
+    buffer = bytearray(_copy_buffer_size(size))
+    view = memoryview(buffer)
+    while True:
+        n = src.readinto(buffer)
+        if not n:
+            return "buffer"
+        # * バッファなしの書き込みは、一部しか書き込まれないことがある
+        written = 0
+        while written < n:
+            written += dst.write(view[written:n])
+
+
+def _open_source_file(file_path: str) -> tuple | None:
+    """コピー元のファイルを開き、(ファイル, os.stat_result) を返す。通常のファイルでない場合は None
+
+    FIFO などを開いたときに書き込み側を待ち続けないよう、O_NONBLOCK で開いてから種類を確認する。
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        src_stat = os.fstat(fd)
+    except OSError:
+        os.close(fd)
+        return None
+    if stat.S_ISREG(src_stat.st_mode) is False:
+        os.close(fd)
+        return None
+    if hasattr(os, "set_blocking"):
+        os.set_blocking(fd, True)
+    return open(fd, "rb", buffering=0), src_stat
+
+
+def _copy_opened_file(src, src_stat: os.stat_result, target_file_path: str, exclusive: bool) -> tuple:
+    """開いたファイル src を target_file_path にコピーし、(バイト数, 使った方法) を返す。
+
+    exclusive=True の場合は、target_file_path が既に存在すると FileExistsError になる（上書きしない）。
+    """
+    dst = open(target_file_path, "xb" if exclusive is True else "wb", buffering=0)
+    try:
+        with dst:
+            method = _copy_file_data(src, dst, src_stat.st_size)
+            # * shutil.copy と同じく、パーミッションもコピーする
+            if hasattr(os, "fchmod"):
+                os.fchmod(dst.fileno(), stat.S_IMODE(src_stat.st_mode))
+            copied = dst.seek(0, os.SEEK_END)
+        if os.name == "nt":
+            os.chmod(target_file_path, stat.S_IMODE(src_stat.st_mode))
+    except BaseException:
+        # ? コピーの途中で失敗した場合は、書きかけのファイルを残さない
+        try:
+            os.remove(target_file_path)
+        except OSError:
+            pass
+        raise
+    return copied, method
+
+
+def _copy_as_file_path(target_dir_path: str, ref_file_name: str) -> str:
+    """copy_as = True の場合のコピー先のファイルパス（ファイル名の末尾に "_unixtime" をつける）"""
+    return os.path.join(
+        target_dir_path,
+        ref_file_name[:-4] + "_" + str(int(time.time())) + os.path.splitext(ref_file_name)[-1],
+    )
+
+
+class CopyResult(NamedTuple):
+    """copy_many の1件ごとの結果"""
+
+    source: str
+    target: str | None
+    ok: bool
+    bytes: int
+    method: str | None
+    error: str | None
+
+
+_COPY_SOURCE_NOT_FOUND = "指定のファイルは存在しません。"
+_COPY_TARGET_DIR_NOT_FOUND = "指定のコピー先フォルダは存在しません。"
+_COPY_TARGET_EXISTS = "指定のコピー先フォルダには、既に同名のファイルが存在します。"
+
+
+def _copy_file_to_dir(ref_file_path: str, target_dir_path: str, copy_as: bool) -> CopyResult:
+    """file_copy と copy_many に共通の、1ファイル分のコピー。ログは出さずに結果を返す。
+
+    copy_as = True で同名のファイルがあった場合は、ファイル名の末尾に "_unixtime" をつける。
+    それも既にある場合（同じ秒に同名のファイルをコピーした場合など）は、さらに連番をつける。
+    """
+    # * コピー元を開いて fstat し、存在の確認とサイズ・パーミッションの取得を1回で済ませる
+    opened = _open_source_file(ref_file_path)
+    if opened is None:
+        return CopyResult(ref_file_path, None, False, 0, None, _COPY_SOURCE_NOT_FOUND)
+
+    src, src_stat = opened
+    with src:
+        ref_file_name = os.path.basename(ref_file_path)
+        target_file_path = os.path.join(target_dir_path, ref_file_name)
+        try:
+            # * コピー先の存在確認は、上書きしないモード（"xb"）で開くことで兼ねる
+            copied, method = _copy_opened_file(src, src_stat, target_file_path, exclusive=True)
+        except (FileNotFoundError, NotADirectoryError):
+            return CopyResult(ref_file_path, None, False, 0, None, _COPY_TARGET_DIR_NOT_FOUND)
+        except FileExistsError:
+            if copy_as is False:
+                return CopyResult(ref_file_path, None, False, 0, None, _COPY_TARGET_EXISTS)
+
+            target_file_path = _copy_as_file_path(target_dir_path, ref_file_name)
+            stem, ext = os.path.splitext(target_file_path)
+            for i in itertools.count(1):
+                try:
+                    copied, method = _copy_opened_file(
+                        src, src_stat, target_file_path, exclusive=True
+                    )
+                    break
+                except FileExistsError:
+                    target_file_path = "{}_{}{}".format(stem, i, ext)
+                except OSError as e:
+                    return CopyResult(ref_file_path, None, False, 0, None, str(e))
+        except OSError as e:
+            return CopyResult(ref_file_path, None, False, 0, None, str(e))
+
+    statcache.invalidate(target_file_path)
+    return CopyResult(ref_file_path, target_file_path, True, copied, method, None)
+
+
+def file_copy(ref_file_path: str, target_dir_path: str, copy_as: bool = False) -> bool:
+    """ファイルのコピー。コピー先のフォルダは先に作っておくこと。
+
+    Linux では、reflink（FICLONE）、copy_file_range、sendfile の順に、
+    カーネル内で完結するコピーを使う。コピーしたバイト数と速度はログに出力する。
+
+    Args:
+        ref_file_path (str): コピー元のファイルパス
+        target_dir_path (str): コピー先のフォルダパス
+        copy_as (bool): 指定のコピー先に既に同名のファイルがあった場合の処理分岐
+            True: ファイル名の末尾に "_unixtime"をつけてコピーを作成する（それも既にある場合は、さらに "_連番" をつける）
+            False: コピーしない
+
+            Defaults to False.
+
+    Returns:
+        bool: 成功したら True
+    """
+    start = time.perf_counter()
+    try:
+        result = _copy_file_to_dir(ref_file_path, target_dir_path, copy_as)
+    except:
+        log.error("処理に失敗しました。")
+        return False
+    if result.ok is False:
+        if result.error == _COPY_SOURCE_NOT_FOUND:
+            log.error(result.error)
+            log.error("コピー元: %s", ref_file_path)
+        elif result.error == _COPY_TARGET_DIR_NOT_FOUND:
+            log.error(result.error)
+            log.error("コピー先: %s", target_dir_path)
+        elif result.error == _COPY_TARGET_EXISTS:
+            log.error(result.error)
+        else:
+            log.error("処理に失敗しました。")
+            log.error(result.error)
+        return False
+
+    if os.path.basename(result.target) != os.path.basename(ref_file_path):
+        log.warning(_COPY_TARGET_EXISTS)
+        log.warning("引数: copy_as = True のため、ファイル末尾にUNIX時間を追加してコピーします。")
+        log.warning(result.target)
+
+    elapsed = time.perf_counter() - start
+    log.info(
+        "ファイルのコピーが完了しました。（%s バイト, %.1f MB/s, %s）",
+        result.bytes,
+        result.bytes / 1024 / 1024 / elapsed if elapsed > 0 else 0.0,
+        result.method,
+    )
+    return True
+
+
+# * file_copy_resumable の標準のチャンクサイズ（このサイズごとに進捗を記録する）
+_RESUMABLE_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _read_copy_journal(journal_path: str, header: str) -> list:
+    """途中までのコピーの記録（チャンクごとのハッシュ値）を読み込む。
+
+    記録がない場合や、コピー元・チャンクサイズが前回と異なる場合は空のリストを返す。
+    """
+    try:
+        with open(journal_path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return []
+    if lines[0] != header:
+        return []
+    # ? 最後の行は、書き込み途中で中断された可能性があるので使わない
+    try:
+        return [bytes.fromhex(line) for line in lines[1:-1]]
+    except ValueError:
+        return []
+
+
+def file_copy_resumable(
+    ref_file_path: str,
+    target_dir_path: str,
+    chunk_size: int = _RESUMABLE_CHUNK_SIZE,
+    verify: bool = True,
+) -> str | bool:
+    """大きなファイルのコピー。中断しても、次回は途中から再開できる。コピー先のフォルダは先に作っておくこと。
+
+    "<コピー先>.part" にチャンク単位でコピーし、チャンクごとのハッシュ値（BLAKE2b）を
+    "<コピー先>.part.journal" に記録する。ハッシュ値はコピーしながら計算する（コピー元を読み直さない）。
+    全てコピーしたら、コピー先を読み直して記録したハッシュ値と比較し、一致すれば "<コピー先>" に名前を変更する。
+
+    Args:
+        ref_file_path (str): コピー元のファイルパス
+        target_dir_path (str): コピー先のフォルダパス
+        chunk_size (int, optional): 進捗を記録する単位（バイト）
+
+            Defaults to 64MiB.
+
+        verify (bool, optional): True の場合は、コピー後にコピー先の内容を検証する
+
+            Defaults to True.
+
+    Returns:
+        str | bool:
+
+            成功したら チェックサム（チャンクごとのハッシュ値を連結したもののハッシュ値）を16進数で返す。
+            失敗した場合は False
+    """
+    if statcache.isfile(ref_file_path) is False:
+        log.error("指定のファイルは存在しません。")
+        log.error("コピー元: %s", ref_file_path)
+        return False
+    if statcache.isdir(target_dir_path) is False:
+        log.error("指定のコピー先フォルダは存在しません。")
+        log.error("コピー先: %s", target_dir_path)
+        return False
+    target_file_path = os.path.join(target_dir_path, os.path.basename(ref_file_path))
+    if os.path.exists(target_file_path) is True:
+        log.error("指定のコピー先フォルダには、既に同名のファイルが存在します。")
+        return False
+
+    part_path = target_file_path + ".part"
+    journal_path = part_path + ".journal"
+    start = time.perf_counter()
+    try:
+        with open(ref_file_path, "rb", buffering=0) as src:
+            src_stat = os.fstat(src.fileno())
+            size = src_stat.st_size
+            header = json.dumps(
+                {"size": size, "mtime_ns": src_stat.st_mtime_ns, "chunk_size": chunk_size},
+                sort_keys=True,
+            )
+            digests = _read_copy_journal(journal_path, header)
+            if digests and os.path.isfile(part_path) is False:
+                digests = []
+            offset = len(digests) * chunk_size
+            if digests:
+                log.info("前回の続きからコピーします。（%s / %s バイト）", offset, size)
+
+            buffer = bytearray(_copy_buffer_size(min(chunk_size, size)))
+            view = memoryview(buffer)
+            with open(part_path, "r+b" if digests else "wb") as dst, open(
+                journal_path, "a" if digests else "w", encoding="utf-8"
+            ) as journal:
+                if not digests:
+                    journal.write(header + "\n")
+                    journal.flush()
+                # ? 記録より先まで書き込まれていた分は、途中で中断された可能性があるので書き直す
+                dst.truncate(offset)
+                dst.seek(offset)
+                src.seek(offset)
+                while offset < size:
+                    digest = hashlib.blake2b()
+                    remaining = min(chunk_size, size - offset)
+                    while remaining:
+                        n = src.readinto(view[: min(remaining, len(buffer))])
+                        if not n:
+                            raise OSError("コピー元のファイルが、コピー中に短くなりました。")
+                        digest.update(view[:n])
+                        dst.write(view[:n])
+                        remaining -= n
+                        offset += n
+                    # * チャンクの内容を書き込んでから、記録に追加する
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    digests.append(digest.digest())
+                    journal.write(digests[-1].hex() + "\n")
+                    journal.flush()
+
+            if verify is True:
+                with open(part_path, "rb", buffering=0) as f:
+                    for i, expected in enumerate(digests):
+                        digest = hashlib.blake2b()
+                        remaining = min(chunk_size, size - i * chunk_size)
+                        while remaining:
+                            n = f.readinto(view[: min(remaining, len(buffer))])
+                            if not n:
+                                break
+                            digest.update(view[:n])
+                            remaining -= n
+                        if digest.digest() != expected:
+                            log.error("コピーしたファイルの内容が、コピー元と一致しません。")
+                            log.error("%s バイト目からのチャンク", i * chunk_size)
+                            os.remove(part_path)
+                            os.remove(journal_path)
+                            return False
+
+            os.chmod(part_path, stat.S_IMODE(src_stat.st_mode))
+            os.replace(part_path, target_file_path)
+            os.remove(journal_path)
+            statcache.invalidate(target_file_path)
+    except:
+        log.error("処理に失敗しました。")
+        log.error("もう一度実行すると、途中からコピーを再開します。")
+        return False
+
+    checksum = hashlib.blake2b(b"".join(digests)).hexdigest()
+    elapsed = time.perf_counter() - start
+    log.info(
+        "ファイルのコピーが完了しました。（%s バイト, %.1f MB/s, チェックサム: %s）",
+        size,
+        size / 1024 / 1024 / elapsed if elapsed > 0 else 0.0,
+        checksum,
+    )
+    return checksum
+
+
+def _copy_jobs(items: Iterable, target_dir_path: str | None) -> list:
+    """copy_many の items を、(コピー元のファイルパス, コピー先のフォルダパス) のリストにする。"""
+    jobs = []
+    for item in items:
+        if isinstance(item, (str, os.PathLike)):
+            if target_dir_path is None:
+                raise ValueError("items がファイルパスの場合は、target_dir_path を指定してください。")
+            jobs.append((os.fspath(item), os.fspath(target_dir_path)))
+        else:
+            pair = tuple(item)
+            if len(pair) != 2:
+                raise ValueError("items のペアは (コピー元のファイルパス, コピー先のフォルダパス) の2つで指定してください。")
+            jobs.append((os.fspath(pair[0]), os.fspath(pair[1])))
+    return jobs
+
+
+def copy_many(
+    items: Iterable,
+    target_dir_path: str | None = None,
+    copy_as: bool = False,
+    workers: int = 8,
+    progress: Callable[[int, int, int], Any] | None = None,
+    progress_interval: float = 0.5,
+) -> tuple:
+    """複数のファイルを、スレッドプールで並列にコピーする。コピー先のフォルダは先に作っておくこと。
+
+    1件ごとのログは出さず、最後に件数・バイト数・速度をまとめて出力する。
+
+    Examples:
+        >>> results = copy_many(get_file_list("C:/data"), "D:/backup")
+        >>> results = copy_many([("C:/a.txt", "D:/x"), ("C:/b.txt", "D:/y")], workers=16)
+        >>> failed = [r for r in results if r.ok is False]
+
+    Args:
+        items (Iterable):
+
+            コピー元のファイルパス（get_file_list の結果や pathlib.Path など）、または (コピー元のファイルパス, コピー先のフォルダパス) のペア
+
+        target_dir_path (str | None, optional):
+
+            items がファイルパスだけの場合のコピー先のフォルダパス
+
+            Defaults to None.
+
+        copy_as (bool, optional): 指定のコピー先に既に同名のファイルがあった場合の処理分岐（file_copy と同じ）
+            True: ファイル名の末尾に "_unixtime"をつけてコピーを作成する（それも既にある場合は、さらに "_連番" をつける）
+            False: コピーしない
+
+            Defaults to False.
+
+        workers (int, optional): 同時にコピーするスレッド数
+
+            Defaults to 8.
+
+        progress (Callable[[int, int, int], Any] | None, optional):
+
+            進捗を受け取る関数。(完了した件数, 全体の件数, コピーしたバイト数) を渡す。
+            呼び出し元のスレッドから progress_interval 秒ごとに呼び出し、最後に必ず1回呼び出す。
+
+            Defaults to None.
+
+        progress_interval (float, optional): progress を呼び出す間隔（秒）
+
+            Defaults to 0.5.
+
+    Returns:
+        tuple: items と同じ順の CopyResult（source, target, ok, bytes, method, error）のタプル
+    """
+    jobs = _copy_jobs(items, target_dir_path)
+    total = len(jobs)
+    results = [None] * total
+    pending = iter(enumerate(jobs))
+    lock = threading.Lock()
+    # * [完了した件数, コピーしたバイト数]
+    counts = [0, 0]
+
+    def worker():
+        while True:
+            with lock:
+                job = next(pending, None)
+            if job is None:
+                return
+            i, pair = job
+            try:
+                ref_file_path, dir_path = pair
+                result = _copy_file_to_dir(ref_file_path, dir_path, copy_as)
+            except Exception as e:
+                result = CopyResult(pair[0], None, False, 0, None, str(e))
+            results[i] = result
+            with lock:
+                counts[0] += 1
+                counts[1] += result.bytes
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=worker, daemon=True) for _ in range(max(min(workers, total), 1))
+    ]
+    for thread in threads:
+        thread.start()
+    # * progress は呼び出し元のスレッドから、progress_interval 秒ごとに呼び出す
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(progress_interval if progress is not None else None)
+            if progress is not None and thread.is_alive():
+                progress(counts[0], total, counts[1])
+    if progress is not None:
+        progress(counts[0], total, counts[1])
+    copied = counts[1]
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if result.ok is False)
+    if failed:
+        log.warning("コピーできなかったファイルがあります。（%s 件）", failed)
+    log.info(
+        "ファイルのコピーが完了しました。（%s 件, %s バイト, %.1f MB/s）",
+        total - failed,
+        copied,
+        copied / 1024 / 1024 / elapsed if elapsed > 0 else 0.0,
+    )
+    return tuple(results)
+
+
+class DirSyncResult(NamedTuple):
+    """dir_copy(sync=True) の結果"""
+
+    copied: int
+    skipped: int
+    deleted: int
+    failed: int
+    bytes: int
+
+
+def _file_digest(file_path: str) -> bytes:
+    """ファイルの内容のハッシュ値（BLAKE2b）"""
+    digest = hashlib.blake2b()
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                return digest.digest()
+            digest.update(view[:n])
+
+
+def _sync_file(ref_file_path: str, target_file_path: str, compare_content: bool) -> int:
+    """ファイルを同期する。コピーしたバイト数を返す。内容が同じでコピーしなかった場合は -1"""
+    if compare_content is True and _file_digest(ref_file_path) == _file_digest(target_file_path):
+        return -1
+
+    # * 既存のファイルをその場で書き換えず、一時ファイルにコピーしてから置き換える
+    # * （途中で失敗しても既存のファイルは残り、書きかけのファイルが見えることもない）
+    temp_file_path = _temp_file_path(target_file_path)
+    with open(ref_file_path, "rb", buffering=0) as src:
+        src_stat = os.fstat(src.fileno())
+        copied, _ = _copy_opened_file(src, src_stat, temp_file_path, exclusive=True)
+    try:
+        # * 次回の比較に使うため、更新日時もコピー元に合わせる
+        os.utime(temp_file_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(temp_file_path, target_file_path)
+    except BaseException:
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+        raise
+    return copied
+
+
+def _sync_dir(
+    ref_dir_path: str, target_dir_path: str, checksum: bool, delete: bool, workers: int
+) -> DirSyncResult:
+    """dir_copy(sync=True) の本体。コピー元とコピー先のフォルダを並べてたどり、変更されたファイルだけをコピーする。"""
+    skipped = 0
+    deleted = 0
+    failed = 0
+    jobs = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        stack = [(ref_dir_path, target_dir_path)]
+        while stack:
+            ref_dir, target_dir = stack.pop()
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+                with os.scandir(target_dir) as it:
+                    targets = {entry.name: entry for entry in it}
+                with os.scandir(ref_dir) as it:
+                    refs = list(it)
+            except OSError:
+                log.warning("%s を読み込めませんでした。", ref_dir)
+                failed += 1
+                continue
+
+            for entry in refs:
+                target_entry = targets.pop(entry.name, None)
+                target_path = os.path.join(target_dir, entry.name)
+                try:
+                    # * shutil.copytree と同じく、シンボリックリンクはリンク先をコピーする
+                    if entry.is_dir():
+                        stack.append((entry.path, target_path))
+                        continue
+                    ref_stat = entry.stat()
+                    target_stat = None if target_entry is None else target_entry.stat()
+                except OSError:
+                    failed += 1
+                    continue
+
+                if target_stat is not None and stat.S_ISREG(target_stat.st_mode):
+                    if ref_stat.st_size == target_stat.st_size:
+                        if checksum is True:
+                            # * サイズが同じ場合は、ワーカーで内容を比較してからコピーする
+                            jobs.append((target_path, executor.submit(
+                                _sync_file, entry.path, target_path, True
+                            )))
+                            continue
+                        # ? ファイルシステムによって更新日時の精度が異なるため、秒単位で比較する
+                        if int(ref_stat.st_mtime) == int(target_stat.st_mtime):
+                            skipped += 1
+                            continue
+                jobs.append((target_path, executor.submit(_sync_file, entry.path, target_path, False)))
+
+            if delete is True:
+                # * コピー元にないファイル・フォルダを削除する
+                for target_entry in targets.values():
+                    try:
+                        if target_entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(target_entry.path)
+                        else:
+                            os.remove(target_entry.path)
+                        deleted += 1
+                    except OSError:
+                        log.warning("%s を削除できませんでした。", target_entry.path)
+                        failed += 1
+
+        copied = 0
+        copied_bytes = 0
+        for target_path, future in jobs:
+            try:
+                n = future.result()
+            except Exception:
+                log.warning("%s をコピーできませんでした。", target_path)
+                failed += 1
+                continue
+            if n < 0:
+                skipped += 1
+            else:
+                copied += 1
+                copied_bytes += n
+
+    return DirSyncResult(copied, skipped, deleted, failed, copied_bytes)
+
+
+def dir_copy(
+    ref_dir_path: str,
+    target_dir_path: str,
+    sync: bool = False,
+    checksum: bool = False,
+    delete: bool = False,
+    workers: int = 8,
+) -> bool | DirSyncResult:
+    """
+    フォルダのコピー。
+
+    コピー先に既に同名のフォルダがある場合は処理しない。（上書き保存はしない）
+
+    sync = True の場合は、コピー先のフォルダが既にあっても処理し、
+    コピー元とサイズ・更新日時（checksum = True の場合は内容）が異なるファイルだけを並列にコピーする（rsync と同様）。
+
+    Args:
+        ref_dir_path (str): コピー元のフォルダパス
+        target_dir_path (str): コピー先のフォルダパス
+        sync (bool, optional): True の場合は、変更されたファイルだけをコピーして同期する
+
+            Defaults to False.
+
+        checksum (bool, optional):
+
+            sync = True の場合に、サイズが同じファイルは更新日時ではなく内容（ハッシュ値）で比較する
+
+            Defaults to False.
+
+        delete (bool, optional): sync = True の場合に、コピー元にないファイル・フォルダをコピー先から削除する
+
+            Defaults to False.
+
+        workers (int, optional): sync = True の場合に、同時にコピーするスレッド数
+
+            Defaults to 8.
+
+    Returns:
+        bool | DirSyncResult:
+
+            成功したら True。sync = True の場合は DirSyncResult（copied, skipped, deleted, failed, bytes）を返す。
+            失敗した場合は False
+    """
+    if statcache.isdir(ref_dir_path) is False:
+        log.error("指定のコピー元フォルダは存在しません。")
+        log.error("コピー元: %s", ref_dir_path)
+        return False
+    else:
+        pass
+
+    if sync is True:
+        result = _sync_dir(ref_dir_path, target_dir_path, checksum, delete, workers)
+        statcache.invalidate_tree(target_dir_path)
+        if result.failed:
+            log.warning("コピー・削除できなかったファイルがあります。（%s 件）", result.failed)
+        log.info(
+            "フォルダの同期が完了しました。（コピー: %s, スキップ: %s, 削除: %s, %s バイト）",
+            result.copied,
+            result.skipped,
+            result.deleted,
+            result.bytes,
+        )
+        return result
+
+    if statcache.isdir(target_dir_path) is True:
+        log.error("指定のコピー先には、既に同じ名前のフォルダが存在します。")
+        log.error("コピー先: %s", target_dir_path)
+        return False
+    else:
+        pass
+
+    try:
+        shutil.copytree(ref_dir_path, target_dir_path)
+        log.info("フォルダのコピーが完了しました。")
+        return True
+    except:
+        log.error("処理に失敗しました。")
+        return False
+    finally:
+        statcache.invalidate_tree(target_dir_path)
+
+
+def file_delete(file_path: str) -> bool:
+    """ファイルの削除
+
+    Args:
+        file_path (str): 削除するファイルのパス
+
+    Returns:
+        bool: 成功したら True
+    """
+    if statcache.isfile(file_path) is False:
+        log.error("指定のファイルは存在しません。")
+        return False
+    else:
+        try:
+            os.remove(file_path)
+            log.info("ファイルの削除が完了しました。")
+            return True
+        except:
+            log.error("処理に失敗しました。")
+            return False
+        finally:
+            statcache.invalidate(file_path)
+
+
+# * dir_delete(background=True) で、削除するフォルダを移動しておく場所（削除するフォルダと同じ親フォルダの中）
+_TRASH_DIR_NAME = ".pyhelpful_trash"
+
+# * ゴミ箱用のフォルダへの移動と、ゴミ箱用のフォルダ自体の削除が重ならないようにするロック
+_trash_lock = threading.Lock()
+
+# * fd を基準にしたファイル操作が使えるか（Linux など）
+_CAN_DELETE_BY_FD = (
+    os.open in os.supports_dir_fd
+    and os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+
+
+def _rmtree_parallel(dir_path: str, workers: int) -> list:
+    """フォルダを複数のスレッドで並列に削除し、失敗したパスのリストを返す。
+
+    フォルダごとに fd を開いて、その中のファイル・サブフォルダの読み込みと削除は全て fd を基準に行う
+    （途中でフォルダがシンボリックリンクに置き換えられても、その先は削除しない）。
+    フォルダは、中のファイルとサブフォルダを全て削除した時点で、親フォルダの fd を基準に削除する。
+    """
+    open_flags = os.O_RDONLY | os.O_DIRECTORY | getattr(os, "O_NOFOLLOW", 0)
+    parent_dir_path, dir_name = os.path.split(os.path.abspath(dir_path))
+    try:
+        root_parent_fd = os.open(parent_dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return [dir_path]
+
+    # * [フォルダのパス, 親のノード, 削除が終わっていない子の数（自分自身の読み込みを含む）, 名前, fd]
+    root = [dir_path, None, 1, dir_name, None]
+    # ? 後から見つけたフォルダから先に読む（開いたままの fd の数を、フォルダの深さ程度に抑える）
+    nodes: queue.LifoQueue = queue.LifoQueue()
+    lock = threading.Lock()
+    errors = []
+
+    def finish(node):
+        """子の1つが終わったことを記録し、全て終わったらフォルダを削除して親に伝える。"""
+        while node is not None:
+            with lock:
+                node[2] -= 1
+                if node[2] > 0:
+                    return
+            try:
+                if node[4] is not None:
+                    os.close(node[4])
+                    node[4] = None
+                os.rmdir(node[3], dir_fd=root_parent_fd if node is root else node[1][4])
+            except Exception:
+                errors.append(node[0])
+            if node is root:
+                for _ in range(workers):
+                    nodes.put(None)
+            node = node[1]
+
+    def worker():
+        while True:
+            node = nodes.get()
+            if node is None:
+                return
+            sub_nodes = []
+            try:
+                parent_fd = root_parent_fd if node is root else node[1][4]
+                node[4] = fd = os.open(node[3], open_flags, dir_fd=parent_fd)
+                with os.scandir(fd) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                sub_nodes.append(
+                                    [os.path.join(node[0], entry.name), node, 1, entry.name, None]
+                                )
+                            else:
+                                os.unlink(entry.name, dir_fd=fd)
+                        except Exception:
+                            errors.append(os.path.join(node[0], entry.name))
+            except Exception:
+                errors.append(node[0])
+            with lock:
+                node[2] += len(sub_nodes)
+            for sub_node in sub_nodes:
+                nodes.put(sub_node)
+            finish(node)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    nodes.put(root)
+    for thread in threads:
+        thread.join()
+    os.close(root_parent_fd)
+    return errors
+
+
+def _purge_trash(trash_dir_path: str):
+    """ゴミ箱用のフォルダの中身を削除する（バックグラウンドのスレッドで実行する）。"""
+    try:
+        # ? Linux では、スレッドの優先度（nice）を下げると、I/O の優先度も下がる
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+    # * 前回の実行で削除しきれなかったものもまとめて削除する
+    try:
+        with os.scandir(trash_dir_path) as it:
+            entries = [(entry.path, entry.is_dir(follow_symlinks=False)) for entry in it]
+    except OSError:
+        return
+    for path, is_dir in entries:
+        if is_dir is True:
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            # ? shutil.rmtree はシンボリックリンクを削除しないので、フォルダ以外は os.unlink で削除する
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    with _trash_lock:
+        try:
+            os.rmdir(trash_dir_path)
+        except OSError:
+            # ? 別のスレッドが、新たに削除するフォルダを移動してきた場合など
+            pass
+
+
+def dir_delete(dir_path: str, workers: int = 1, background: bool = False) -> bool:
+    """フォルダの削除
+
+    Args:
+        dir_path (str): 削除するフォルダのパス
+
+        workers (int, optional):
+
+            2以上の場合は、複数のスレッドで並列に削除する（ファイルが大量にある場合に速くなる）。
+
+            Defaults to 1.
+
+        background (bool, optional):
+
+            True の場合は、フォルダを同じ親フォルダの中のゴミ箱用のフォルダ（".pyhelpful_trash"）に移動して、すぐに戻る。
+            移動したフォルダは、優先度を下げたバックグラウンドのスレッドで削除する。
+
+            Defaults to False.
+
+    Returns:
+        bool: 成功したら True
+    """
+    if statcache.isdir(dir_path) is False:
+        log.error("指定のフォルダは存在しません。")
+        return False
+    else:
+        pass
+
+    if background is True:
+        # * リンク自体をゴミ箱用のフォルダに移動しないように、他の方法と同じく失敗とする
+        if os.path.islink(dir_path) is True:
+            log.error("指定のフォルダはシンボリックリンクです。")
+            log.error("フォルダ: %s", dir_path)
+            return False
+        parent_dir_path, dir_name = os.path.split(os.path.abspath(dir_path))
+        trash_dir_path = os.path.join(parent_dir_path, _TRASH_DIR_NAME)
+        try:
+            with _trash_lock:
+                os.makedirs(trash_dir_path, exist_ok=True)
+                # * 同じファイルシステムの中での名前の変更なので、すぐに終わる
+                os.rename(
+                    dir_path,
+                    os.path.join(trash_dir_path, "{}-{}".format(dir_name, time.time_ns())),
+                )
+        except:
+            log.error("処理に失敗しました。")
+            return False
+        statcache.invalidate_tree(dir_path)
+        # ? デーモンにしないので、削除が終わるまでプログラムは終了しない
+        threading.Thread(target=_purge_trash, args=(trash_dir_path,)).start()
+        log.info("フォルダ %s を削除しました。（バックグラウンドで削除中）", dir_path)
+        return True
+
+    if workers > 1 and _CAN_DELETE_BY_FD is True:
+        errors = _rmtree_parallel(dir_path, workers)
+        statcache.invalidate_tree(dir_path)
+        if errors:
+            log.error("処理に失敗しました。")
+            log.error("削除できなかったパス: %s 件（%s など）", len(errors), errors[0])
+            return False
+        log.info("フォルダ %s の削除が完了しました。", dir_path)
+        return True
+
+    try:
+        shutil.rmtree(dir_path)
+        log.info("フォルダ %s の削除が完了しました。", dir_path)
+        return True
+    except:
+        log.error("処理に失敗しました。")
+        return False
+    finally:
+        statcache.invalidate_tree(dir_path)
+
+
+def get_info_dir_file_ext(file_path: str, info: str) -> str | bool:
+    """パス文字列から、フォルダ名、ファイル名、拡張子を取得する
+
+    Args:
+        file_path (str): 任意のファイルパス
+
+        info (str): 取得する情報
+            "dir_name": フォルダ名
+            "file_name": ファイル名
+            "ext_name": 拡張子名
+            "file_name_non_ext": 拡張子なしのファイル名
+
+    Returns:
+        str | bool: 成功したら 指定の情報の文字列を返す。失敗した場合は False
+    """
+    if statcache.isfile(file_path) is False:
+        log.error("指定のファイルは存在しません。")
+        return False
+    else:
+        try:
+            dir_name = os.path.dirname(file_path)
+            file_name = os.path.basename(file_path)
+            ext_name_tuple = os.path.splitext(file_path)
+            ext_name = ext_name_tuple[-1]
+            file_name_non_ext = file_name[: (-1 * len(ext_name))]
+            if info == "dir_name":
+                log.info("dir name: %s", dir_name)
+                return dir_name
+            elif info == "file_name":
+                log.info("file name: %s", file_name)
+                return file_name
+            elif info == "ext_name":
+                log.info("ext name: %s", ext_name)
+                return ext_name
+            elif info == "file_name_non_ext":
+                log.info("file name non ext: %s", file_name_non_ext)
+                return file_name_non_ext
+            else:
+                log.error("info の引数が不正です。")
+                return False
+        except:
+            log.error("処理に失敗しました。")
+            return False
+
+
+class PathParts(NamedTuple):
+    """get_path_parts の結果。パスごとの情報を、種類ごとのタプル（列）で持つ。
+
+    i 番目の要素は、全ての列で paths[i] のパスの情報
+    """
+
+    paths: tuple
+    dir_names: tuple
+    file_names: tuple
+    ext_names: tuple
+    file_names_non_ext: tuple
+    # * get_path_parts(check_exists=True) の場合のみ。ファイルが存在すれば True
+    exists: tuple | None
+
+    def group_by_ext(self, ignore_case: bool = True) -> dict:
+        """拡張子ごとにパスをまとめる。
+
+        Args:
+            ignore_case (bool, optional): True の場合は、拡張子の大文字・小文字を区別しない（キーは小文字）
+
+                Defaults to True.
+
+        Returns:
+            dict: {拡張子: パスのタプル}（拡張子がないファイルのキーは ""）
+        """
+        groups = {}
+        for path, ext_name in zip(self.paths, self.ext_names):
+            groups.setdefault(ext_name.lower() if ignore_case is True else ext_name, []).append(path)
+        return {ext_name: tuple(paths) for ext_name, paths in groups.items()}
+
+    def group_by_dir(self) -> dict:
+        """フォルダごとにパスをまとめる。
+
+        Returns:
+            dict: {フォルダ名: パスのタプル}
+        """
+        groups = {}
+        for path, dir_name in zip(self.paths, self.dir_names):
+            groups.setdefault(dir_name, []).append(path)
+        return {dir_name: tuple(paths) for dir_name, paths in groups.items()}
+
+
+def _files_in_dirs(dir_names: Iterable[str]) -> dict:
+    """フォルダごとに1回だけ読み込んで、{フォルダ名: その中のファイル名の set} を返す。"""
+    files = {}
+    for dir_name in dir_names:
+        names = set()
+        try:
+            with os.scandir(dir_name or os.curdir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            names.add(os.path.normcase(entry.name))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        files[dir_name] = names
+    return files
+
+
+def get_path_parts(paths: Iterable[str], check_exists: bool = False) -> PathParts:
+    """複数のパス文字列から、フォルダ名、ファイル名、拡張子、拡張子なしのファイル名をまとめて取得する。
+
+    get_info_dir_file_ext を情報ごとに呼び出す代わりに使う。結果は os.path.split / os.path.splitext と同じ。
+    パスごとのログは出力しない。
+
+    Examples:
+        >>> parts = get_path_parts(get_file_list("C:/data"))
+        >>> parts.ext_names[0], parts.group_by_ext()[".csv"]
+
+    Args:
+        paths (Iterable[str]): パス文字列（get_file_list の結果など）
+
+        check_exists (bool, optional):
+
+            True の場合は、ファイルが存在するかも確認する。
+            パスごとに確認する代わりに、フォルダごとに1回だけ中身を読み込んで確認する。
+
+            Defaults to False.
+
+    Returns:
+        PathParts: 種類ごとのタプル（paths, dir_names, file_names, ext_names, file_names_non_ext, exists）
+    """
+    paths = tuple(paths)
+    dir_names = []
+    file_names = []
+    ext_names = []
+    file_names_non_ext = []
+    split = os.path.split
+    seps = os.sep + (os.altsep or "") + (":" if os.name == "nt" else "")
+    # * 最後の区切り文字までの部分 → フォルダ名（同じフォルダのパスでは os.path.split を呼び出さない）
+    heads = {}
+    add_dir = dir_names.append
+    add_file = file_names.append
+    add_ext = ext_names.append
+    add_non_ext = file_names_non_ext.append
+    for path in paths:
+        i = max(path.rfind(sep) for sep in seps) if len(seps) > 1 else path.rfind(seps)
+        raw_head = path[: i + 1]
+        dir_name = heads.get(raw_head)
+        if dir_name is None:
+            dir_name, file_name = split(path)
+            # ? ドライブ名だけの場合など、区切り文字の位置で分けた結果と異なる場合は覚えない
+            if file_name == path[i + 1:]:
+                heads[raw_head] = dir_name
+        else:
+            file_name = path[i + 1:]
+
+        # * os.path.splitext と同じく、先頭のピリオドは拡張子の区切りとしない（".bashrc" など）
+        dot = file_name.rfind(".")
+        if dot > 0 and (file_name[0] != "." or file_name[:dot].lstrip(".")):
+            add_non_ext(file_name[:dot])
+            add_ext(file_name[dot:])
+        else:
+            add_non_ext(file_name)
+            add_ext("")
+        add_dir(dir_name)
+        add_file(file_name)
+
+    exists = None
+    if check_exists is True:
+        files = _files_in_dirs(set(dir_names))
+        normcase = os.path.normcase
+        exists = tuple(
+            normcase(file_name) in files[dir_name]
+            for dir_name, file_name in zip(dir_names, file_names)
+        )
+
+    return PathParts(
+        paths,
+        tuple(dir_names),
+        tuple(file_names),
+        tuple(ext_names),
+        tuple(file_names_non_ext),
+        exists,
+    )
+
+
+def _walk_dirs(dir_path: str) -> Iterator[tuple]:
+    """os.walk と同じ順に (フォルダのパス, ファイル名のリスト) を返す。
+
+    StatCache を使っている場合は、見つけたファイル・フォルダをキャッシュに覚えさせる。
+    """
+    cache = statcache.get_stat_cache()
+    if cache is None:
+        for current_dir, sub_dirs, files_list in os.walk(dir_path):
+            yield current_dir, files_list
+        return
+
+    stack = [dir_path]
+    while stack:
+        current_dir = stack.pop()
+        files_list = []
+        sub_dirs = []
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    cache.seed(entry)
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir is False:
+                        files_list.append(entry.name)
+                    # * os.walk と同じく、シンボリックリンクのフォルダはたどらない
+                    elif entry.is_symlink() is False:
+                        sub_dirs.append(entry.path)
+        except OSError:
+            continue
+        yield current_dir, files_list
+        stack.extend(reversed(sub_dirs))
+
+
+def get_file_list(
+    dir_path: str, workers: int = 1, index_path: str | None = None, compact: bool = False
+) -> tuple | FileList | bool:
+    """任意のフォルダにあるファイルの一覧を取得
 
     Args:
         dir_path (str): 任意のフォルダパス
 
+        workers (int, optional):
+
+            2 以上の場合は、その数のスレッドで並列にフォルダをたどる（iter_files_parallel）。
+            この場合、一覧の順番は実行ごとに異なる。
+
+            Defaults to 1.
+
+        index_path (str | None, optional):
+
+            指定した場合は、一覧をこのファイルに保存して次回以降も使い回し、
+            更新日時が変わったフォルダだけを読み直す（dirindex.DirIndex）。
+            この場合、一覧はパスの順に並ぶ。
+
+            Defaults to None.
+
+        compact (bool, optional):
+
+            True の場合は、タプルの代わりに、フォルダ部分を共有して少ないメモリで保持する FileList を返す。
+            ファイル数が非常に多い場合に使う。
+
+            Defaults to False.
+
     Returns:
-        tuple | bool: 成功したら ファイル一覧のタプルを返す。失敗した場合は False
+        tuple | FileList | bool: 成功したら ファイル一覧のタプル（compact=True の場合は FileList）を返す。失敗した場合は False
     """
     file_list_all = []
-    if os.path.isdir(dir_path) is False:
+    if statcache.isdir(dir_path) is False:
         log.error("指定のフォルダは存在しません。")
         return False
+    elif index_path is not None:
+        from .dirindex import DirIndex
+
+        try:
+            with DirIndex(dir_path, index_path) as index:
+                if index.refresh() is False:
+                    return False
+                if compact is True:
+                    file_list_all = FileList(index.iter_files())
+                else:
+                    file_list_all = index.files()
+            log.info("ファイル数: %s", len(file_list_all))
+            return file_list_all
+        except:
+            log.error("処理に失敗しました。")
+            return False
+    elif workers > 1:
+        try:
+            if compact is True:
+                file_list_all = FileList(iter_files_parallel(dir_path, workers))
+            else:
+                file_list_all = tuple(iter_files_parallel(dir_path, workers))
+            log.info("ファイル数: %s", len(file_list_all))
+            return file_list_all
+        except:
+            log.error("処理に失敗しました。")
+            return False
+    elif compact is True:
+        try:
+            file_list_all = FileList.from_dirs(_walk_dirs(dir_path))
+            log.info("ファイル数: %s", len(file_list_all))
+            return file_list_all
+        except:
+            log.error("処理に失敗しました。")
+            return False
     else:
         try:
-            for current_dir, sub_dirs, files_list in os.walk(dir_path):
+            for current_dir, files_list in _walk_dirs(dir_path):
                 for file_name in files_list:
                     file_list_all.append(os.path.join(current_dir, file_name))
-            log.info("ファイル数: {}".format(len(file_list_all)))
+            log.info("ファイル数: %s", len(file_list_all))
             return tuple(file_list_all)
         except:
             log.error("処理に失敗しました。")
             return False
+
+
+# * find_duplicates で、内容を比べる前に読むファイルの先頭・末尾のバイト数
+_DUPLICATE_EDGE_SIZE = 4 * 1024
+
+# * find_duplicates で、プロセスプールに1回に渡すファイル数
+_DUPLICATE_BATCH_SIZE = 64
+
+_DUPLICATE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    edge BLOB,
+    full BLOB
+);
+"""
+
+
+def _edge_digest(file_path: str, size: int) -> bytes | None:
+    """ファイルの先頭と末尾の _DUPLICATE_EDGE_SIZE バイトのハッシュ値。読めない場合は None"""
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            data = f.read(_DUPLICATE_EDGE_SIZE)
+            if size > _DUPLICATE_EDGE_SIZE:
+                f.seek(max(size - _DUPLICATE_EDGE_SIZE, _DUPLICATE_EDGE_SIZE))
+                data += f.read(_DUPLICATE_EDGE_SIZE)
+    except OSError:
+        return None
+    return hashlib.blake2b(data).digest()
+
+
+def _full_digest(file_path: str) -> bytes | None:
+    """ファイルの内容全体のハッシュ値（memory-map して読む）。読めない場合は None"""
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm).digest()
+    except (OSError, ValueError):
+        return None
+
+
+def _hash_batch(batch: list, full: bool) -> list:
+    """find_duplicates のプロセスプールで実行する。(パス, サイズ) のリストのハッシュ値を返す。"""
+    if full is True:
+        return [_full_digest(file_path) for file_path, size in batch]
+    return [_edge_digest(file_path, size) for file_path, size in batch]
+
+
+def _hash_files(files: list, full: bool, pool) -> list:
+    """(パス, サイズ) のリストのハッシュ値を、同じ順のリストで返す。pool が None の場合はこのプロセスで計算する。"""
+    if pool is None:
+        return _hash_batch(files, full)
+    batches = [
+        files[i: i + _DUPLICATE_BATCH_SIZE] for i in range(0, len(files), _DUPLICATE_BATCH_SIZE)
+    ]
+    return list(
+        itertools.chain.from_iterable(pool.map(_hash_batch, batches, itertools.repeat(full)))
+    )
+
+
+def _group_by_digest(files: list, full: bool, pool, cache, stats: dict) -> list:
+    """(パス, サイズ, 更新日時) のリストを、サイズとハッシュ値が同じもののリストに分ける（2件以上のもののみ）。"""
+    column = "full" if full is True else "edge"
+    digests = {}
+    missing = []
+    for file in files:
+        digest = None
+        if cache is not None:
+            row = cache.execute(
+                "SELECT {} FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?".format(column),
+                file,
+            ).fetchone()
+            digest = None if row is None else row[0]
+        if digest is None:
+            missing.append(file)
+        else:
+            digests[file] = digest
+
+    stats["hashed"] += len(missing)
+    for file, digest in zip(missing, _hash_files([file[:2] for file in missing], full, pool)):
+        if digest is None:
+            continue
+        digests[file] = digest
+        if cache is None:
+            continue
+        if full is True:
+            # * 内容全体のハッシュ値は、先頭と末尾のハッシュ値を記録した後に計算する
+            cache.execute("UPDATE hashes SET full = ? WHERE path = ?", (digest, file[0]))
+        else:
+            cache.execute(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, edge) VALUES (?, ?, ?, ?)",
+                file + (digest,),
+            )
+
+    groups = {}
+    for file, digest in digests.items():
+        groups.setdefault((file[1], digest), []).append(file)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(
+    dir_path: str,
+    min_size: int = 1,
+    workers: int | None = None,
+    cache_path: str | None = None,
+) -> tuple | bool:
+    """任意のフォルダにある、内容が同じファイルを探す。
+
+    全てのファイルを読むのではなく、次の順に候補を絞り込む。
+
+    1. サイズが同じファイル
+    2. 先頭と末尾の数 KB のハッシュ値が同じファイル
+    3. 内容全体のハッシュ値（BLAKE2b）が同じファイル
+
+    ハッシュ値の計算は、プロセスプールで並列に行い、ファイルは memory-map して読む。
+    シンボリックリンクは探さず、同じファイルへのハードリンクは1つのファイルとして扱う。
+
+    Examples:
+        >>> for group in find_duplicates("//server/share/archive", cache_path="archive.hashes"):
+        ...     keep, *duplicates = group
+
+    Args:
+        dir_path (str): 任意のフォルダパス
+
+        min_size (int, optional):
+
+            このサイズ（バイト）未満のファイルは探さない。0 の場合は空のファイルも探す。
+
+            Defaults to 1.
+
+        workers (int | None, optional):
+
+            ハッシュ値を計算するプロセスの数。None の場合は CPU の数。1 の場合はプロセスプールを使わない。
+
+            Defaults to None.
+
+        cache_path (str | None, optional):
+
+            指定した場合は、計算したハッシュ値を (パス, サイズ, 更新日時) ごとにこのファイル（SQLite）に保存し、
+            次回以降は変わっていないファイルを読まずに済ませる。
+
+            Defaults to None.
+
+    Returns:
+        tuple | bool: 成功したら 内容が同じファイルのパスのタプルのタプルを返す。失敗した場合は False
+    """
+    file_list = get_file_list(dir_path)
+    if file_list is False:
+        return False
+
+    start = time.perf_counter()
+    by_size = {}
+    seen_inodes = set()
+    # * ハードリンクは、パスの順で最初のものを残す（実行ごとに結果が変わらないように）
+    for file_path in sorted(file_list):
+        try:
+            st = os.lstat(file_path)
+        except OSError:
+            continue
+        # ? シンボリックリンクはリンク先と、ハードリンクは同じファイルの別名と重複して見えるので除く
+        if stat.S_ISREG(st.st_mode) is False or (st.st_dev, st.st_ino) in seen_inodes:
+            continue
+        seen_inodes.add((st.st_dev, st.st_ino))
+        if st.st_size >= min_size:
+            by_size.setdefault(st.st_size, []).append((file_path, st.st_size, st.st_mtime_ns))
+
+    candidates = [group for group in by_size.values() if len(group) > 1]
+    stats = {"hashed": 0}
+    cache = None
+    pool = None
+    try:
+        if cache_path is not None:
+            import sqlite3
+
+            cache = sqlite3.connect(cache_path)
+            cache.executescript(_DUPLICATE_CACHE_SCHEMA)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and sum(len(group) for group in candidates) > _DUPLICATE_BATCH_SIZE:
+            pool = concurrent.futures.ProcessPoolExecutor(workers)
+
+        # * 空のファイルは、全て同じ内容
+        duplicates = [group for group in candidates if group[0][1] == 0]
+        files = [file for group in candidates if group[0][1] > 0 for file in group]
+        edge_groups = _group_by_digest(files, False, pool, cache, stats)
+        # * 先頭と末尾で全体を読んでいるファイルは、これ以上比べなくてよい
+        duplicates += [group for group in edge_groups if group[0][1] <= 2 * _DUPLICATE_EDGE_SIZE]
+        files = [
+            file for group in edge_groups if group[0][1] > 2 * _DUPLICATE_EDGE_SIZE for file in group
+        ]
+        duplicates += _group_by_digest(files, True, pool, cache, stats)
+        if cache is not None:
+            cache.commit()
+    except:
+        log.error("処理に失敗しました。")
+        return False
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache is not None:
+            cache.close()
+
+    result = tuple(sorted(tuple(sorted(file[0] for file in group)) for group in duplicates))
+    log.info(
+        "重複しているファイル: %s グループ, %s 件（ハッシュ値を計算したファイル数: %s, %.1f 秒）",
+        len(result),
+        sum(len(group) - 1 for group in result),
+        stats["hashed"],
+        time.perf_counter() - start,
+    )
+    return result
+
+
+def _is_hidden(entry: os.DirEntry) -> bool:
+    if entry.name.startswith("."):
+        return True
+    if os.name == "nt":
+        # * Windows では隠し属性も見る（stat の結果は DirEntry にキャッシュされている）
+        attributes = entry.stat(follow_symlinks=False).st_file_attributes
+        return bool(attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+    return False
+
+
+def iter_files(
+    dir_path: str,
+    exts: str | tuple | list | None = None,
+    pattern: str | None = None,
+    max_depth: int | None = None,
+    min_size: int | None = None,
+    max_size: int | None = None,
+    min_mtime: float | None = None,
+    max_mtime: float | None = None,
+    include_hidden: bool = True,
+    follow_symlinks: bool = False,
+    skip_symlinks: bool = False,
+    entries: bool = False,
+) -> Iterator[str | os.DirEntry]:
+    """任意のフォルダにあるファイルを、見つけた順に1つずつ返すジェネレータ
+
+    get_file_list と違い、一覧を全て作り終えるのを待たずに、少ないメモリで処理を始められる。
+    os.scandir の DirEntry を使うため、絞り込みのための stat は必要な場合にだけ行う。
+
+    Args:
+        dir_path (str): 任意のフォルダパス
+
+        exts (str | tuple | list | None, optional):
+
+            拡張子で絞り込む（例: ".txt" または (".jpg", ".png")）。大文字・小文字は区別しない。
+
+            Defaults to None.
+
+        pattern (str | None, optional):
+
+            ファイル名のワイルドカード（例: "report_*.csv"）で絞り込む。
+
+            Defaults to None.
+
+        max_depth (int | None, optional):
+
+            たどるサブフォルダの深さ。0 の場合は dir_path 直下のファイルだけ。None の場合は制限なし。
+
+            Defaults to None.
+
+        min_size, max_size (int | None, optional):
+
+            ファイルサイズ（バイト）の範囲で絞り込む。
+
+            Defaults to None.
+
+        min_mtime, max_mtime (float | None, optional):
+
+            最終更新日時（UNIX時間）の範囲で絞り込む。
+
+            Defaults to None.
+
+        include_hidden (bool, optional):
+
+            False の場合は、隠しファイル・隠しフォルダを除く。
+
+            Defaults to True.
+
+        follow_symlinks (bool, optional):
+
+            True の場合は、シンボリックリンクのフォルダの中もたどる（同じフォルダは2回たどらない）。
+
+            Defaults to False.
+
+        skip_symlinks (bool, optional):
+
+            True の場合は、シンボリックリンクのファイルを除く。
+
+            Defaults to False.
+
+        entries (bool, optional):
+
+            True の場合は、パスの文字列の代わりに os.DirEntry を返す。
+
+            Defaults to False.
+
+    Yields:
+        str | os.DirEntry: ファイルのパス（entries=True の場合は os.DirEntry）
+    """
+    if os.path.isdir(dir_path) is False:
+        log.error("指定のフォルダは存在しません。")
+        return
+
+    if isinstance(exts, str):
+        exts = (exts,)
+    if exts is not None:
+        exts = tuple(
+            ext.lower() if ext.startswith(".") else "." + ext.lower() for ext in exts
+        )
+    need_stat = (
+        min_size is not None
+        or max_size is not None
+        or min_mtime is not None
+        or max_mtime is not None
+    )
+
+    visited = set()
+    if follow_symlinks is True:
+        st = os.stat(dir_path)
+        visited.add((st.st_dev, st.st_ino))
+
+    count = 0
+    stack = [(dir_path, 0)]
+    while stack:
+        current_dir, depth = stack.pop()
+        sub_dirs = []
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    try:
+                        if include_hidden is False and _is_hidden(entry):
+                            continue
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            if max_depth is not None and depth >= max_depth:
+                                continue
+                            if follow_symlinks is True:
+                                # * リンク先とリンクでないフォルダが同じ場合もあるので、全てのフォルダを記録する
+                                st = entry.stat()
+                                if st.st_ino == 0:
+                                    # ? Windows の DirEntry.stat() は st_ino が 0 なので、os.stat で取り直す
+                                    st = os.stat(entry.path)
+                                if (st.st_dev, st.st_ino) in visited:
+                                    continue
+                                visited.add((st.st_dev, st.st_ino))
+                            sub_dirs.append(entry.path)
+                            continue
+                        if entry.is_file() is False:
+                            continue
+                        if skip_symlinks is True and entry.is_symlink():
+                            continue
+                        if exts is not None and os.path.splitext(entry.name)[1].lower() not in exts:
+                            continue
+                        if pattern is not None and fnmatch.fnmatch(entry.name, pattern) is False:
+                            continue
+                        if need_stat is True:
+                            st = entry.stat()
+                            if min_size is not None and st.st_size < min_size:
+                                continue
+                            if max_size is not None and st.st_size > max_size:
+                                continue
+                            if min_mtime is not None and st.st_mtime < min_mtime:
+                                continue
+                            if max_mtime is not None and st.st_mtime > max_mtime:
+                                continue
+                    except OSError:
+                        # ? 列挙した後に削除されたファイルなど
+                        continue
+                    count += 1
+                    yield entry if entries is True else entry.path
+        except OSError:
+            log.warning("%s を読み込めませんでした。", current_dir)
+            continue
+        # * os.walk と同じく、見つけた順にサブフォルダをたどる
+        stack.extend((sub_dir, depth + 1) for sub_dir in reversed(sub_dirs))
+    log.debug("ファイル数: %s", count)
+
+
+def iter_files_parallel(dir_path: str, workers: int = 8) -> Iterator[str]:
+    """任意のフォルダにあるファイルを、複数のスレッドで並列にフォルダをたどりながら1つずつ返すジェネレータ
+
+    ネットワーク上のフォルダなど、フォルダごとの読み込みの待ち時間が長い場合に速くなる。
+    返ってくる順番は実行ごとに異なる。
+
+    Args:
+        dir_path (str): 任意のフォルダパス
+
+        workers (int, optional):
+
+            フォルダを読み込むスレッドの数。
+
+            Defaults to 8.
+
+    Yields:
+        str: ファイルのパス
+    """
+    if os.path.isdir(dir_path) is False:
+        log.error("指定のフォルダは存在しません。")
+        return
+
+    workers = max(1, workers)
+    done = object()
+    dirs: queue.SimpleQueue = queue.SimpleQueue()
+    # * 取り出す側が遅い場合に、メモリを使いすぎないように上限を設ける
+    results: queue.Queue = queue.Queue(maxsize=workers * 4)
+    stop = threading.Event()
+    lock = threading.Lock()
+    pending = [1]
+
+    def put_result(item):
+        while stop.is_set() is False:
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def worker():
+        while True:
+            current_dir = dirs.get()
+            if current_dir is None:
+                return
+            files = []
+            sub_dirs = []
+            if stop.is_set() is False:
+                try:
+                    with os.scandir(current_dir) as it:
+                        for entry in it:
+                            # * os.walk と同じく、シンボリックリンクのフォルダはたどらない
+                            try:
+                                is_dir = entry.is_dir()
+                            except OSError:
+                                is_dir = False
+                            if is_dir is False:
+                                files.append(entry.path)
+                            elif entry.is_symlink() is False:
+                                sub_dirs.append(entry.path)
+                except OSError:
+                    log.warning("%s を読み込めませんでした。", current_dir)
+            with lock:
+                pending[0] += len(sub_dirs)
+            for sub_dir in sub_dirs:
+                dirs.put(sub_dir)
+            if files:
+                put_result(files)
+            with lock:
+                pending[0] -= 1
+                finished = pending[0] == 0
+            if finished is True:
+                for _ in range(workers):
+                    dirs.put(None)
+                put_result(done)
+
+    dirs.put(dir_path)
+    threads = [
+        threading.Thread(target=worker, name="pyhelpful-scandir", daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    count = 0
+    try:
+        while True:
+            files = results.get()
+            if files is done:
+                break
+            count += len(files)
+            yield from files
+        log.debug("ファイル数: %s", count)
+    finally:
+        # ? 途中で取り出すのをやめた場合も、スレッドを止める
+        stop.set()
+        for _ in range(workers):
+            dirs.put(None)
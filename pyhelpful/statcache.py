@@ -0,0 +1,198 @@
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+# * キャッシュするパスの種類（None は存在しない）
+_FILE = 1
+_DIR = 2
+_OTHER = 3
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class StatCache:
+    """パスの種類（ファイル・フォルダ・存在しない）を、一定時間だけ覚えておくキャッシュ
+
+    pyhelpful の各関数の os.path.isfile / os.path.isdir の代わりに使う。
+    ネットワークドライブなど、stat の待ち時間が長い環境で同じパスを何度も確認する場合に速くなる。
+
+    - 最大 max_size 件まで覚え、超えた場合は最も長く使われていないものから忘れる（LRU）
+    - 覚えてから ttl 秒たったものは、もう一度 stat する
+    - get_file_list で見つけたファイル・フォルダは、stat せずに覚える
+    - pyhelpful の関数でファイル・フォルダを作成・コピー・削除した場合は、そのパスを忘れる
+
+    pyhelpful 以外から変更された場合は、ttl 秒の間は古い結果を返すことがある。
+
+    Examples:
+        >>> cache = enable_stat_cache(max_size=100000, ttl=5.0)
+        >>> for file_path in get_file_list("//server/share/data"):
+        ...     get_info_dir_file_ext(file_path, "ext_name")
+        >>> cache.hits, cache.misses
+    """
+
+    def __init__(self, max_size: int = 100000, ttl: float = 5.0):
+        """
+        Args:
+            max_size (int, optional): 覚えておく最大のパス数
+
+                Defaults to 100000.
+
+            ttl (float, optional): 覚えておく時間（秒）
+
+                Defaults to 5.0.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # * invalidate などで忘れるたびに増やす（stat している間に忘れたパスを、古い結果で覚え直さないため）
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, kind: int | None, now: float, generation: int | None = None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (now + self.ttl, kind)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _kind(self, path: str) -> int | None:
+        key = _key(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            kind = None
+        else:
+            kind = _DIR if stat.S_ISDIR(mode) else _FILE if stat.S_ISREG(mode) else _OTHER
+        self._store(key, kind, now, generation)
+        return kind
+
+    def isfile(self, path: str) -> bool:
+        """os.path.isfile と同じ"""
+        return self._kind(path) == _FILE
+
+    def isdir(self, path: str) -> bool:
+        """os.path.isdir と同じ"""
+        return self._kind(path) == _DIR
+
+    def exists(self, path: str) -> bool:
+        """os.path.exists と同じ"""
+        return self._kind(path) is not None
+
+    def seed(self, entry: os.DirEntry):
+        """os.scandir で見つけたファイル・フォルダを、stat せずに覚える。"""
+        try:
+            if entry.is_dir():
+                kind = _DIR
+            elif entry.is_file():
+                kind = _FILE
+            else:
+                # ? リンク先が存在しないシンボリックリンクは、os.path.exists と同じく存在しないとする
+                kind = None if entry.is_symlink() else _OTHER
+        except OSError:
+            return
+        self._store(_key(entry.path), kind, time.monotonic())
+
+    def invalidate(self, path: str):
+        """パスを忘れる。"""
+        with self._lock:
+            self._entries.pop(_key(path), None)
+            self._generation += 1
+
+    def invalidate_tree(self, dir_path: str):
+        """フォルダと、その中の全てのパスを忘れる。"""
+        key = _key(dir_path)
+        prefix = key.rstrip(os.sep) + os.sep
+        with self._lock:
+            for path in [path for path in self._entries if path == key or path.startswith(prefix)]:
+                del self._entries[path]
+            self._generation += 1
+
+    def clear(self):
+        """全て忘れ、ヒット数・ミス数を0に戻す。"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.hits = 0
+            self.misses = 0
+
+
+# * pyhelpful の各関数が使うキャッシュ（enable_stat_cache を呼び出すまでは使わない）
+_cache: StatCache | None = None
+
+
+def enable_stat_cache(max_size: int = 100000, ttl: float = 5.0) -> StatCache:
+    """pyhelpful の各関数で、StatCache を使うようにする。
+
+    Args:
+        max_size (int, optional): 覚えておく最大のパス数
+
+            Defaults to 100000.
+
+        ttl (float, optional): 覚えておく時間（秒）
+
+            Defaults to 5.0.
+
+    Returns:
+        StatCache: 使うキャッシュ（ヒット数・ミス数の確認に使う）
+    """
+    global _cache
+    _cache = StatCache(max_size, ttl)
+    return _cache
+
+
+def disable_stat_cache():
+    """pyhelpful の各関数で、StatCache を使わないようにする。"""
+    global _cache
+    _cache = None
+
+
+def get_stat_cache() -> StatCache | None:
+    """使っている StatCache を返す。使っていない場合は None"""
+    return _cache
+
+
+def isfile(path: str) -> bool:
+    cache = _cache
+    return os.path.isfile(path) if cache is None else cache.isfile(path)
+
+
+def isdir(path: str) -> bool:
+    cache = _cache
+    return os.path.isdir(path) if cache is None else cache.isdir(path)
+
+
+def exists(path: str) -> bool:
+    cache = _cache
+    return os.path.exists(path) if cache is None else cache.exists(path)
+
+
+def invalidate(path: str):
+    cache = _cache
+    if cache is not None:
+        cache.invalidate(path)
+
+
+def invalidate_tree(dir_path: str):
+    cache = _cache
+    if cache is not None:
+        cache.invalidate_tree(dir_path)
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import pathlib
+import tempfile
+import threading
+
+import pytest
+
+from pyhelpful import aio
+
+
+def test_aio_helpers():
+    """同期版と同じ結果・失敗時の戻り値を返す。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        src_dir = os.path.join(td, "src")
+        os.mkdir(src_dir)
+        for i in range(300):
+            with open(os.path.join(src_dir, "{}.txt".format(i)), mode="w") as f:
+                f.write(str(i))
+        target_dir = os.path.join(td, "target")
+        os.mkdir(target_dir)
+
+        async def main():
+            file_list = await aio.get_file_list(src_dir)
+            assert len(file_list) == 300
+            found = [file_path async for file_path in aio.iter_files(src_dir, exts=".txt")]
+            assert sorted(found) == sorted(file_list)
+            assert await aio.get_file_list(os.path.join(td, "missing")) is False
+
+            results = await aio.copy_many(file_list, target_dir)
+            assert [result.source for result in results] == list(file_list)
+            assert all(result.ok for result in results)
+            assert await aio.file_copy(file_list[0], target_dir) is False
+            assert await aio.file_copy(file_list[0], target_dir, copy_as=True) is True
+
+            assert await aio.file_create_overwrite(target_dir, "a.log", "w", "x") is True
+            assert await aio.file_delete(os.path.join(target_dir, "a.log")) is True
+            assert await aio.file_delete(os.path.join(target_dir, "a.log")) is False
+            assert await aio.dir_copy(src_dir, os.path.join(td, "copy")) is True
+            assert await aio.dir_delete(os.path.join(td, "copy")) is True
+
+            with pytest.raises(ValueError):
+                await aio.copy_many(file_list)
+            with pytest.raises(ValueError):
+                await aio.copy_many([(file_list[0],)])
+            results = await aio.copy_many([pathlib.Path(file_list[0])], target_dir, copy_as=True)
+            assert results[0].ok is True
+
+        asyncio.run(main())
+
+
+def test_aio_cancel(monkeypatch):
+    """キャンセルした場合は、まだ始まっていないコピーは行わない。"""
+    iter_files = aio._sync.iter_files
+    walked = []
+    closed = threading.Event()
+
+    def spy_iter_files(*args, **kwargs):
+        try:
+            for file in iter_files(*args, **kwargs):
+                walked.append(file)
+                yield file
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(aio._sync, "iter_files", spy_iter_files)
+
+    with tempfile.TemporaryDirectory() as td:
+        src_dir = os.path.join(td, "src")
+        os.mkdir(src_dir)
+        file_list = []
+        for i in range(500):
+            file_path = os.path.join(src_dir, "{}.txt".format(i))
+            with open(file_path, mode="wb") as f:
+                f.write(b"x" * 1024)
+            file_list.append(file_path)
+        target_dir = os.path.join(td, "target")
+        os.mkdir(target_dir)
+
+        async def main():
+            task = asyncio.create_task(aio.copy_many(file_list, target_dir))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # * 実行中だったコピーが終わるまで待つ（スレッドの処理は最後まで行われる）
+            semaphore = aio._semaphore("copy")
+            for _ in range(aio.get_concurrency("copy")):
+                await semaphore.acquire()
+            for _ in range(aio.get_concurrency("copy")):
+                semaphore.release()
+
+            # * 途中で抜けても、残りのフォルダはたどらない
+            files = aio.iter_files(src_dir)
+            async for _ in files:
+                break
+            await files.aclose()
+
+        aio.set_concurrency("copy", 2)
+        try:
+            asyncio.run(main())
+        finally:
+            aio.set_concurrency("copy", 8)
+        assert len(os.listdir(target_dir)) < len(file_list)
+        assert closed.wait(5) is True
+        assert len(walked) < len(file_list)
+
+    with pytest.raises(ValueError):
+        aio.set_concurrency("unknown", 1)
+
+
+def test_aio_operations_do_not_share_threads():
+    """ある操作がスレッドを使い切っていても、別の操作は待たされない。"""
+    release = threading.Event()
+
+    async def main():
+        blocked = [
+            asyncio.create_task(aio._run("copy", release.wait))
+            for _ in range(aio.get_concurrency("copy"))
+        ]
+        try:
+            await asyncio.sleep(0.05)
+            assert await asyncio.wait_for(aio._run("list", lambda: True), 5) is True
+        finally:
+            release.set()
+        await asyncio.gather(*blocked)
+
+    aio.set_concurrency("copy", 40)
+    try:
+        asyncio.run(main())
+    finally:
+        aio.set_concurrency("copy", 8)
@@ -0,0 +1,56 @@
+import os
+import pathlib
+import tempfile
+
+from pyhelpful.dirindex import DirIndex
+from pyhelpful.pyhelpful import get_file_list
+
+
+def _write(file_path: str, data: str = ""):
+    pathlib.Path(os.path.dirname(file_path)).mkdir(parents=True, exist_ok=True)
+    with open(file_path, mode="w") as f:
+        f.write(data)
+
+
+def test_dir_index_refresh_changes():
+    """前回の refresh() から追加・削除・変更されたファイルが返ってくる。"""
+    with tempfile.TemporaryDirectory() as td:
+        root = os.path.join(td, "root")
+        index_path = os.path.join(td, "root.idx")
+        a = os.path.join(root, "a.txt")
+        b = os.path.join(root, "sub", "b.txt")
+        c = os.path.join(root, "sub", "deep", "c.txt")
+        for file_path in (a, b, c):
+            _write(file_path)
+
+        with DirIndex(root, index_path) as index:
+            changes = index.refresh()
+            assert sorted(changes.added) == sorted([a, b, c])
+            assert index.files() == tuple(sorted(get_file_list(root)))
+
+            # * 何も変わっていなければ、変更はない
+            assert index.refresh() == ((), (), ())
+
+            d = os.path.join(root, "sub", "d.txt")
+            _write(d)
+            os.remove(a)
+            _write(b, "changed")
+            changes = index.refresh(check_files=True)
+            assert changes.added == (d,)
+            assert changes.removed == (a,)
+            assert changes.modified == (b,)
+
+        # * 索引はファイルに保存され、次回も使い回される
+        pathlib.Path(os.path.join(root, "sub", "deep")).joinpath("c.txt").unlink()
+        os.rmdir(os.path.join(root, "sub", "deep"))
+        with DirIndex(root, index_path) as index:
+            changes = index.refresh()
+            assert changes.removed == (c,)
+            assert index.files() == tuple(sorted([b, d]))
+
+        # * get_file_list からも使える
+        assert get_file_list(root, index_path=index_path) == tuple(sorted([b, d]))
+
+        # * 索引ファイルを開けない場合は False を返す
+        assert get_file_list(root, index_path=os.path.join(root, "missing", "index.db")) is False
+        assert get_file_list(root, index_path=root) is False
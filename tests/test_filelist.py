@@ -0,0 +1,36 @@
+import os
+
+from pyhelpful.filelist import FileList
+from pyhelpful.pyhelpful import get_file_list
+
+
+def test_file_list_sequence():
+    """FileList はタプルと同じように使える。"""
+    paths = [
+        os.path.join("root", "b", "x.TXT"),
+        os.path.join("root", "b", "y.csv"),
+        os.path.join("root", "a", "z.txt"),
+        os.path.join("root", "b", "w.txt"),
+    ]
+    file_list = FileList(paths)
+
+    assert len(file_list) == 4
+    assert file_list == tuple(paths)
+    assert list(file_list) == paths
+    assert file_list[0] == paths[0]
+    assert file_list[-1] == paths[-1]
+    assert file_list[1:3] == paths[1:3]
+    assert paths[2] in file_list
+    assert os.path.join("root", "a", "x.TXT") not in file_list
+    assert file_list.sorted() == sorted(paths)
+    assert file_list.with_ext(".txt") == [paths[0], paths[2], paths[3]]
+    assert file_list.with_ext("csv") == [paths[1]]
+    assert len(FileList()) == 0
+
+
+def test_get_file_list_compact():
+    """compact=True の場合は、同じ一覧を FileList で返す。"""
+    dir_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    file_list = get_file_list(dir_path, compact=True)
+    assert isinstance(file_list, FileList)
+    assert file_list == get_file_list(dir_path)
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# * `import pyhelpful` にかかる時間の上限（マイクロ秒）。環境差を考慮して余裕を持たせている
+IMPORT_TIME_LIMIT_US = 50_000
+
+
+def _import_time(statement: str) -> dict:
+    """python -X importtime の結果を {モジュール名: 累積時間(us)} で返す。"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_lazy():
+    """`import pyhelpful` の時点では、サブモジュールも tkinter も読み込まれない。"""
+    times = _import_time("import pyhelpful")
+    assert "tkinter" not in times
+    assert "pyhelpful.pyhelpful" not in times
+    assert times["pyhelpful"] < IMPORT_TIME_LIMIT_US
+
+
+def test_file_helpers_do_not_import_tkinter():
+    """ダイアログ以外の関数を使うだけなら、tkinter は読み込まれない。"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from pyhelpful import file_copy, get_file_list; "
+            "print('pyhelpful.pyhelpful' in sys.modules, 'tkinter' in sys.modules)",
+        ],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["True", "False"]
+
+
+def test_readme_functions_are_exported():
+    """README に載っている関数・クラスは、`from pyhelpful import ...` で使える。"""
+    import re
+
+    import pyhelpful
+
+    with open(os.path.join(ROOT_DIR, "README.md"), encoding="utf-8") as f:
+        names = re.findall(r"^#### `(\w+)`", f.read(), re.MULTILINE)
+    # * dir_create_desktop は以前から pyhelpful.pyhelpful からのみ使う
+    missing = [name for name in names if name not in pyhelpful.__all__ and name != "dir_create_desktop"]
+    assert missing == []
+    for name in pyhelpful.__all__:
+        assert getattr(pyhelpful, name) is not None
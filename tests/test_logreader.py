@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from pyhelpful.mylogger import MyFileLogger
+from pyhelpful.logreader import LogIndex
+
+
+def file_copy(test_log: MyFileLogger, i: int):
+    test_log.error("copy failed %s", i)
+
+
+def dir_copy(test_log: MyFileLogger, i: int):
+    test_log.error("copy failed %s", i)
+    test_log.info("done %s", i)
+
+
+def test_log_index_query():
+    """レベル、呼び出し元のファイル・関数名でレコードを絞り込める。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG")
+        for i in range(5):
+            file_copy(test_log, i)
+            dir_copy(test_log, i)
+        test_log.close()
+
+        with LogIndex(log_file_path) as index:
+            assert index.update() == 15
+            records = list(
+                index.query(level="ERROR", file="test_logreader.py", function="file_copy")
+            )
+            assert len(records) == 5
+            assert records[-1].endswith("[ERROR: Message >> copy failed 4]")
+            assert len(list(index.query(level="INFO"))) == 5
+            assert len(list(index.query(since="2000-01-01 00:00:00", until="2000-01-01 01:00:00"))) == 0
+
+            # * 索引済みのレコードは読み直さない
+            assert index.update() == 0
+
+
+def test_log_index_incremental_update():
+    """ファイルに追記された分だけが索引に追加される。JSON 形式のログも扱える。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG", json_lines=True)
+        file_copy(test_log, 0)
+        test_log.close()
+
+        with LogIndex(log_file_path) as index:
+            assert index.update() == 1
+
+            test_log = MyFileLogger(log_file_path, "DEBUG", json_lines=True)
+            file_copy(test_log, 1)
+            dir_copy(test_log, 1)
+            test_log.close()
+
+            assert index.update() == 3
+            assert len(list(index.query(level="ERROR", function="file_copy"))) == 2
@@ -0,0 +1,310 @@
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from pyhelpful.mylogger import MyStreamLogger
+from pyhelpful.mylogger import MyFileLogger
+from pyhelpful.mylogger import _compressor
+from pyhelpful.mylogger import _LazyStreamHandler
+from pyhelpful.mylogger import _QueuedFileHandler
+
+
+def test_stream_logger_call_site_cache():
+    """同じ呼び出し箇所からのログ出力では、ロガーとハンドラが使い回される。"""
+    test_log = MyStreamLogger("DEBUG")
+    for i in range(10):
+        test_log.debug(i)
+
+    # * 呼び出し箇所は1つなので、ロガーも1つ、ハンドラも1つ
+    assert len(test_log._registry) == 1
+    assert len(test_log.logger.handlers) == 1
+
+    test_log.info("another call site")
+    assert len(test_log._registry) == 2
+    test_log.close()
+
+
+def test_file_logger_call_site_with_threads():
+    """複数のスレッドから同時に出力しても、ログには各呼び出し箇所の行番号が記録される。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG")
+        lines_by_site = {}
+
+        def site_a():
+            for i in range(200):
+                lines_by_site["a"] = sys._getframe().f_lineno + 1
+                test_log.info("site-a")
+
+        def site_b():
+            for i in range(200):
+                lines_by_site["b"] = sys._getframe().f_lineno + 1
+                test_log.info("site-b")
+
+        threads = [threading.Thread(target=f) for f in (site_a, site_b) * 4]
+        # * スレッドが頻繁に切り替わるようにして、取り違えが起きやすい状況にする
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 1600
+        for line in lines:
+            site = "a" if "site-a" in line else "b"
+            assert ":{},".format(lines_by_site[site]) in line
+
+
+def test_stream_logger_registry_is_bounded():
+    """キャッシュするロガーの数は REGISTRY_MAX_SIZE を超えない。"""
+    test_log = MyStreamLogger("CRITICAL")
+    test_log._registry.max_size = 3
+    code = test_stream_logger_registry_is_bounded.__code__
+    for i in range(5):
+        test_log._registry.get((code, i), test_log._create_logger)
+    assert len(test_log._registry) == 3
+    test_log.close()
+
+
+def test_file_logger_no_duplicate_records():
+    """同じ呼び出し箇所から何度出力しても、1回の呼び出しで書き込まれるのは1行だけ。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG")
+        for i in range(20):
+            test_log.info("message {}".format(i))
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 20
+        assert "message 19" in lines[-1]
+        assert os.path.abspath(__file__) in lines[0]
+
+
+def test_disabled_level_returns_early():
+    """出力対象外のレベルでは、ロガーの作成もメッセージの整形も行わない。"""
+
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("出力されないメッセージが整形された")
+
+    test_log = MyStreamLogger("INFO")
+    test_log.debug("value: %s", Unformattable())
+    test_log.debug(Unformattable())
+    assert len(test_log._registry) == 0
+    test_log.close()
+
+
+def test_file_logger_deferred_arguments():
+    """% 形式の引数は、出力時に展開される。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG")
+        test_log.debug("copied %s -> %s", "a.txt", "b.txt")
+        test_log.info(["a", "b"])
+        test_log.info("100%")
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines[0].endswith("[DEBUG: Message >> copied a.txt -> b.txt]")
+        assert lines[1].endswith("[INFO: Iterator >> ['a', 'b']]")
+        assert lines[2].endswith("[INFO: Message >> 100%]")
+
+
+def test_file_logger_async_mode_drains_on_close():
+    """async_mode では、close() の時点でキューに残っているログが全て書き込まれる。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(
+            log_file_path, "DEBUG", async_mode=True, flush_interval=10, batch_size=7
+        )
+        for i in range(100):
+            test_log.info("message %s", i)
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 100
+        assert lines[-1].endswith("[INFO: Message >> message 99]")
+
+
+def test_file_logger_async_mode_drop_when_full():
+    """when_full="drop" では、キューが一杯の場合にログを捨てて、その数を記録する。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(
+            log_file_path, "DEBUG", async_mode=True, queue_size=1, when_full="drop"
+        )
+        handler = test_log._get_handler()
+        for i in range(1000):
+            test_log.info("message %s", i)
+        dropped = handler.dropped
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) + dropped == 1000
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_queued_handler_writes_directly_when_writer_stopped():
+    """書き込み用スレッドが止まった場合は、キューが一杯でも待ち続けずに直接書き込む。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        opened = []
+
+        def opener():
+            opened.append(True)
+            if len(opened) == 1:
+                # * 1回目は書き込み用スレッドを止める
+                raise SystemExit
+            return open(log_file_path, mode="a", encoding="utf-8")
+
+        handler = _QueuedFileHandler(log_file_path, queue_size=1, opener=opener)
+        handler.emit(logging.makeLogRecord({"msg": "lost"}))
+        handler._thread.join(5)
+        assert handler._thread.is_alive() is False
+
+        def emit():
+            for i in range(5):
+                handler.emit(logging.makeLogRecord({"msg": "message {}".format(i)}))
+
+        thread = threading.Thread(target=emit)
+        thread.start()
+        thread.join(5)
+        assert thread.is_alive() is False
+        handler.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            assert f.read().splitlines() == ["message {}".format(i) for i in range(5)]
+
+
+def test_file_logger_invalid_when_full():
+    """when_full の指定が不正な場合は ValueError"""
+    with pytest.raises(ValueError):
+        MyFileLogger("dummy.log", async_mode=True, when_full="wait")
+
+
+def _write_multiprocess_log(log_file_path: str, worker: int, count: int):
+    test_log = MyFileLogger(log_file_path, "DEBUG", multiprocess=True)
+    for i in range(count):
+        test_log.info("worker=%s seq=%s payload=%s", worker, i, "x" * 500)
+    test_log.close()
+
+
+def test_file_logger_multiprocess_line_integrity():
+    """multiprocess=True では、複数のプロセスから同じファイルに書き込んでも行が混ざらない。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        processes = [
+            multiprocessing.Process(
+                target=_write_multiprocess_log, args=(log_file_path, worker, 200)
+            )
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 800
+        pattern = re.compile(r".*\[INFO: Message >> worker=\d seq=\d+ payload=x{500}\]$")
+        assert all(pattern.match(line) for line in lines)
+
+
+def test_file_logger_rotation_and_compress():
+    """max_bytes を超えるとローテーションし、backup_count を超えた古いファイルは削除される。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        # * ローテーションしたファイル以外で、名前が "test.log." で始まるファイルは削除しない
+        others = ["test.log.idx", "test.log.idx-journal"]
+        for name in others:
+            with open(os.path.join(td, name), "w"):
+                pass
+        test_log = MyFileLogger(
+            log_file_path, "DEBUG", max_bytes=1000, backup_count=2, compress=True
+        )
+        for i in range(100):
+            test_log.info("message %s", i)
+        test_log.close()
+        _compressor.join()
+
+        rotated = sorted(name for name in os.listdir(td) if name not in ["test.log"] + others)
+        assert all(os.path.exists(os.path.join(td, name)) for name in others)
+        assert len(rotated) == 2
+        assert all(name.endswith(".gz") for name in rotated)
+        assert os.path.getsize(log_file_path) <= 1000
+        with gzip.open(os.path.join(td, rotated[-1]), "rt", encoding="utf-8") as f:
+            assert "Message >> message" in f.readline()
+
+
+def test_file_logger_json_lines():
+    """json_lines=True では、ファイル・行番号・関数名を項目に分けて出力する。"""
+    with tempfile.TemporaryDirectory() as td:
+        log_file_path = os.path.join(td, "test.log")
+        test_log = MyFileLogger(log_file_path, "DEBUG", json_lines=True)
+        test_log.warning("copied %s", "a.txt")
+        lineno = sys._getframe().f_lineno - 1
+        test_log.close()
+
+        with open(log_file_path, encoding="utf-8") as f:
+            record = json.loads(f.readline())
+        assert record["level"] == "WARNING"
+        assert record["file"] == os.path.abspath(__file__)
+        assert record["line"] == lineno
+        assert record["function"] == "test_file_logger_json_lines"
+        assert record["message"] == "Message >> copied a.txt"
+
+
+def test_lazy_stream_handler_opens_once():
+    """複数のスレッドが同時に最初の書き込みをしても、ストリームは1回だけ開く。"""
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "test.log")
+        opened = []
+        barrier = threading.Barrier(8)
+
+        def opener():
+            stream = open(file_path, mode="a", encoding="utf-8")
+            opened.append(stream)
+            return stream
+
+        handler = _LazyStreamHandler(file_path, opener)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+
+        def emit():
+            barrier.wait()
+            handler.emit(record)
+
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=emit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(old_interval)
+            handler.close()
+        assert len(opened) == 1
+        with open(file_path, encoding="utf-8") as f:
+            assert f.read().count("message") == 8
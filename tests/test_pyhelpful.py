@@ -1,21 +1,40 @@
+import concurrent.futures
 import os
 import pathlib
 import glob
 import tempfile
+import threading
+import time
+
+import pytest
 
 from pyhelpful.pyhelpful import dialog_file_picker
 from pyhelpful.pyhelpful import dialog_folder_picker
+from pyhelpful.pyhelpful import dialog_files_picker
+from pyhelpful.pyhelpful import dialog_session
 from pyhelpful.pyhelpful import is_invalid_char
 from pyhelpful.pyhelpful import replace_invalid_char
+from pyhelpful.pyhelpful import sanitize_file_names
 from pyhelpful.pyhelpful import dir_create
 from pyhelpful.pyhelpful import dir_delete
 from pyhelpful.pyhelpful import file_create_overwrite
+from pyhelpful.pyhelpful import FileWriter
+from pyhelpful.pyhelpful import file_read_mmap
+from pyhelpful.pyhelpful import file_read_chunks
+from pyhelpful.pyhelpful import file_read_lines
 from pyhelpful.pyhelpful import file_delete
 from pyhelpful.pyhelpful import file_copy
+from pyhelpful.pyhelpful import file_copy_resumable
+from pyhelpful.pyhelpful import copy_many
 from pyhelpful.pyhelpful import dir_copy
 from pyhelpful.pyhelpful import get_info_dir_file_ext
+from pyhelpful.pyhelpful import get_path_parts
 from pyhelpful.pyhelpful import get_file_list
+from pyhelpful.pyhelpful import find_duplicates
+from pyhelpful.pyhelpful import iter_files
+from pyhelpful.pyhelpful import iter_files_parallel
 
+from pyhelpful import pyhelpful as pyhelpful_module
 from pyhelpful.mylogger import MyStreamLogger
 
 test_log = MyStreamLogger("DEBUG")
@@ -49,6 +68,24 @@ def test_dialog_folder_picker_folder_not_select():
     assert type(dialog_folder_picker()) == expected
 
 
+def test_dialog_files_picker_files_select():
+    """ファイルを複数選択すると、そのファイルのパスのタプルが返ってくる。"""
+    test_log.debug("適当なファイルを2つ選択してください。")
+    paths = dialog_files_picker()
+    assert type(paths) == tuple
+    assert len(paths) == 2
+
+
+def test_dialog_session():
+    """dialog_session の中では、同じ Tk ルートを使い回してダイアログを続けて開ける。"""
+    expected = type("file path strings")
+    with dialog_session():
+        test_log.debug("適当なファイルを選択してください。")
+        assert type(dialog_file_picker()) == expected
+        test_log.debug("適当なフォルダを選択してください。")
+        assert type(dialog_folder_picker()) == expected
+
+
 def test_is_invalid_char():
     """無効文字が含まれている場合は True, 含まれていない場合は False を返す。"""
 
@@ -108,6 +145,31 @@ def test_replace_invalid_char():
             "abcd" + i_char + "efgh", "_re_") == "abcd_re_efgh"
 
 
+def test_sanitize_file_names():
+    """複数のファイル名を、まとめてファイル名として使える文字列に変換する。"""
+
+    names = ["a:b.txt", "CON.txt", "a-b.txt", "A-B.TXT", "..", "x. ", "nul", "c\x01d"]
+    assert sanitize_file_names(names) == [
+        "a-b.txt", "_CON.txt", "a-b_1.txt", "A-B_2.TXT", "-", "x", "_nul", "c-d"
+    ]
+    assert sanitize_file_names(["a?b", "a?b"], replace_char="_", unique=False) == ["a_b", "a_b"]
+
+    # * 長さの制限は拡張子を残し、連番をつけても超えない
+    assert sanitize_file_names(["y" * 300 + ".txt"] * 2, max_length=10) == ["yyyyyy.txt", "yyyy_1.txt"]
+
+    # * 長さは UTF-8 のバイト数で数え、文字の途中では切らない。短くした後の末尾の空白・ピリオドも除く
+    assert sanitize_file_names(["あいうえお.txt"], max_length=12) == ["あい.txt"]
+    assert sanitize_file_names(["あ" * 100 + ".txt"] * 2, max_length=255) == ["あ" * 83 + ".txt", "あ" * 83 + "_1.txt"]
+    assert sanitize_file_names(["ab. cd.verylongext"], max_length=4) == ["ab"]
+
+    # * フォルダに既にある名前とも重ならないようにする
+    with tempfile.TemporaryDirectory() as td:
+        with open(os.path.join(td, "report.csv"), mode="w") as f:
+            f.write("")
+        assert sanitize_file_names(["report.csv"], target_dir_path=td) == ["report_1.csv"]
+        assert sanitize_file_names(["report.csv"], target_dir_path=os.path.join(td, "dummy")) is None
+
+
 def test_dir_create_delete():
     """フォルダの作成と削除。"""
 
@@ -149,6 +211,88 @@ def test_dir_create_delete():
         assert dir_delete(test_create_dir) is False
 
 
+def test_dir_delete_parallel_background():
+    """並列での削除と、バックグラウンドでの削除"""
+
+    with tempfile.TemporaryDirectory() as td:
+        for name in ("parallel", "background"):
+            dir_path = os.path.join(td, name)
+            for i in range(5):
+                sub_dir_path = os.path.join(dir_path, "d{}".format(i), "dd")
+                os.makedirs(sub_dir_path)
+                for j in range(20):
+                    with open(os.path.join(sub_dir_path, "f{}.txt".format(j)), mode="w") as f:
+                        f.write("")
+        # * シンボリックリンクの先は削除しない
+        keep_file_path = os.path.join(td, "keep.txt")
+        with open(keep_file_path, mode="w") as f:
+            f.write("")
+        if hasattr(os, "symlink") and os.name != "nt":
+            os.symlink(td, os.path.join(td, "parallel", "link"))
+            os.symlink(keep_file_path, os.path.join(td, "parallel", "file_link"))
+
+        assert dir_delete(os.path.join(td, "parallel"), workers=4) is True
+        assert os.path.exists(os.path.join(td, "parallel")) is False
+        assert os.path.isfile(keep_file_path) is True
+
+        # * すぐに元のパスからはなくなり、ゴミ箱用のフォルダもいずれ削除される
+        assert dir_delete(os.path.join(td, "background"), background=True) is True
+        assert os.path.exists(os.path.join(td, "background")) is False
+        for _ in range(100):
+            if os.path.exists(os.path.join(td, ".pyhelpful_trash")) is False:
+                break
+            time.sleep(0.05)
+        assert os.listdir(td) == ["keep.txt"]
+
+
+def test_dir_delete_symlink():
+    """フォルダへのシンボリックリンクは、どの方法でも削除せずに False を返す。"""
+    if not hasattr(os, "symlink") or os.name == "nt":
+        return
+
+    with tempfile.TemporaryDirectory() as td:
+        real_dir_path = os.path.join(td, "real")
+        os.mkdir(real_dir_path)
+        with open(os.path.join(real_dir_path, "a.txt"), mode="w") as f:
+            f.write("")
+        link_path = os.path.join(td, "link")
+        os.symlink(real_dir_path, link_path)
+
+        assert dir_delete(link_path) is False
+        assert dir_delete(link_path, workers=4) is False
+        assert dir_delete(link_path, background=True) is False
+        assert os.path.islink(link_path) is True
+        assert os.path.isfile(os.path.join(real_dir_path, "a.txt")) is True
+        assert sorted(os.listdir(td)) == ["link", "real"]
+
+        # * ゴミ箱用のフォルダに残ったシンボリックリンクも削除する
+        trash_dir_path = os.path.join(td, ".pyhelpful_trash")
+        os.mkdir(trash_dir_path)
+        os.symlink(real_dir_path, os.path.join(trash_dir_path, "old-link"))
+        pyhelpful_module._purge_trash(trash_dir_path)
+        assert os.path.exists(trash_dir_path) is False
+        assert os.path.isfile(os.path.join(real_dir_path, "a.txt")) is True
+
+
+def test_dir_delete_parallel_worker_error(monkeypatch):
+    """並列での削除で、OSError 以外の例外が起きても止まらずに False を返す。"""
+
+    def broken_unlink(*args, **kwargs):
+        raise RuntimeError("unlink")
+
+    with tempfile.TemporaryDirectory() as td:
+        dir_path = os.path.join(td, "parallel")
+        os.makedirs(os.path.join(dir_path, "sub"))
+        for name in ("a.txt", os.path.join("sub", "b.txt")):
+            with open(os.path.join(dir_path, name), mode="w") as f:
+                f.write("")
+
+        with monkeypatch.context() as m:
+            m.setattr(os, "unlink", broken_unlink)
+            assert dir_delete(dir_path, workers=4) is False
+        assert os.path.isfile(os.path.join(dir_path, "sub", "b.txt")) is True
+
+
 def test_file_create_overwrite_delete():
     """ファイルの作成（上書き、追記）と削除。"""
 
@@ -207,6 +351,121 @@ def test_file_create_overwrite_delete():
         assert os.path.isfile(os.path.join(dir_path, file_name)) is False
 
 
+def test_file_create_overwrite_atomic_durability(monkeypatch):
+    """一時ファイルからの置き換えと、同時に追記するスレッドの fsync をまとめる。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "data.txt")
+        assert file_create_overwrite(td, "data.txt", "w", "old") is True
+        os.chmod(file_path, 0o640)
+        assert file_create_overwrite(td, "data.txt", "w", "new", atomic=True, durability="dir") is True
+        with open(file_path) as f:
+            assert f.read() == "new\n"
+        assert os.listdir(td) == ["data.txt"]
+        if os.name != "nt":
+            assert os.stat(file_path).st_mode & 0o777 == 0o640
+
+        fsync = os.fsync
+        calls = []
+
+        def slow_fsync(fd):
+            calls.append(fd)
+            time.sleep(0.05)
+            fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", slow_fsync)
+
+        def append(i):
+            assert file_create_overwrite(td, "data.txt", "a", str(i), durability="file") is True
+
+        threads = [threading.Thread(target=append, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) < 8
+        with open(file_path) as f:
+            assert sorted(f.read().splitlines()) == sorted(["new"] + [str(i) for i in range(8)])
+
+        # * 文字列以外のデータは、例外ではなく False を返す
+        assert file_create_overwrite(td, "bytes.txt", "w", b"data") is False
+        assert file_create_overwrite(td, "none.txt", "w", None, atomic=True) is False
+
+
+def test_file_writer():
+    """ファイルを開いたまま、複数のスレッドからまとめて書き込む。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "out.txt")
+        with open(file_path, mode="w") as f:
+            f.write("old\n")
+
+        # * mode = "w" の場合は、開いたときに上書きし、以降は追記する
+        with FileWriter(td, "out.txt", "w", buffer_size=100, flush_interval=None) as writer:
+
+            def produce(n):
+                for i in range(500):
+                    assert writer.write("{}-{}".format(n, i)) is True
+
+            threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert writer.write("closed") is False
+
+        with open(file_path) as f:
+            lines = f.read().splitlines()
+        assert sorted(lines) == sorted("{}-{}".format(n, i) for n in range(4) for i in range(500))
+
+        # * flush_interval 秒ごとに書き込み、eof_new_line = False の場合は改行しない
+        with FileWriter(td, "out.txt", "a", eof_new_line=False, flush_interval=0.05) as writer:
+            writer.write("a")
+            writer.write("b")
+            for _ in range(100):
+                with open(file_path) as f:
+                    if f.read().endswith("ab"):
+                        break
+                time.sleep(0.05)
+            with open(file_path) as f:
+                assert f.read().endswith("\nab")
+
+
+def test_file_read():
+    """memory-map、チャンク単位、行単位での読み込み"""
+
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "data.txt")
+        lines = ["あいう{}".format(i) for i in range(1000)]
+        data = ("\ufeff" + "\r\n".join(lines) + "\nlast").encode("utf-8")
+        with open(file_path, mode="wb") as f:
+            f.write(data)
+
+        with file_read_mmap(file_path) as view:
+            assert view.nbytes == len(data)
+            assert bytes(view[-4:]) == b"last"
+        assert b"".join(file_read_chunks(file_path, chunk_size=100)) == data
+
+        # * 小さなチャンクで、複数バイトの文字や "\r\n" がチャンクの境目で分かれても正しく読める
+        assert list(file_read_lines(file_path, chunk_size=7)) == lines + ["last"]
+        assert "".join(file_read_lines(file_path, keepends=True)) == data.decode("utf-8-sig")
+
+        # * 最後の行が "\r" で終わる場合と、改行のない長い行
+        with open(file_path, mode="wb") as f:
+            f.write(b"a\r\n" + b"x" * 1000 + b"\r")
+        assert list(file_read_lines(file_path, chunk_size=7)) == ["a", "x" * 1000]
+        assert list(file_read_lines(file_path, keepends=True)) == ["a\r\n", "x" * 1000 + "\r"]
+
+        # * 空のファイルと、存在しないファイル
+        empty_file_path = os.path.join(td, "empty.txt")
+        with open(empty_file_path, mode="wb"):
+            pass
+        assert file_read_mmap(empty_file_path).nbytes == 0
+        assert list(file_read_lines(empty_file_path)) == []
+        assert file_read_mmap(os.path.join(td, "dummy.txt")) is None
+        assert list(file_read_chunks(os.path.join(td, "dummy.txt"))) == []
+
+
 def test_file_dir_copy():
     """ファイル、フォルダのコピー"""
 
@@ -248,6 +507,223 @@ def test_file_dir_copy():
         assert len(glob.glob(temp_dir_path + "/*.txt")) == 2
 
 
+def test_dir_copy_sync():
+    """sync = True の場合は、変更されたファイルだけをコピーして同期する。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        ref_dir_path = os.path.join(td, "ref")
+        target_dir_path = os.path.join(td, "target")
+        pathlib.Path(ref_dir_path, "sub").mkdir(parents=True)
+        for name in ("a.txt", "b.txt", os.path.join("sub", "c.txt")):
+            with open(os.path.join(ref_dir_path, name), mode="w") as f:
+                f.write(name)
+
+        # * コピー先がなければ全てコピーし、2回目は全てスキップする
+        result = dir_copy(ref_dir_path, target_dir_path, sync=True)
+        assert (result.copied, result.skipped, result.failed) == (3, 0, 0)
+        assert result.bytes == len("a.txt") + len("b.txt") + len(os.path.join("sub", "c.txt"))
+        assert dir_copy(ref_dir_path, target_dir_path, sync=True).skipped == 3
+
+        # * sync = False の場合は、従来どおりコピー先があれば処理しない
+        assert dir_copy(ref_dir_path, target_dir_path) is False
+
+        # * サイズが変わったファイルと、コピー先にしかないファイル
+        with open(os.path.join(ref_dir_path, "a.txt"), mode="a") as f:
+            f.write("changed")
+        with open(os.path.join(target_dir_path, "sub", "extra.txt"), mode="w") as f:
+            f.write("")
+        result = dir_copy(ref_dir_path, target_dir_path, sync=True, delete=True)
+        assert (result.copied, result.skipped, result.deleted) == (1, 2, 1)
+        assert os.path.exists(os.path.join(target_dir_path, "sub", "extra.txt")) is False
+        with open(os.path.join(target_dir_path, "a.txt")) as f:
+            assert f.read() == "a.txtchanged"
+
+        # * サイズと更新日時が同じでも、checksum = True であれば内容で比較する
+        target_file_path = os.path.join(target_dir_path, "b.txt")
+        st = os.stat(target_file_path)
+        with open(target_file_path, mode="w") as f:
+            f.write("B.TXT")
+        os.utime(target_file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert dir_copy(ref_dir_path, target_dir_path, sync=True).copied == 0
+        result = dir_copy(ref_dir_path, target_dir_path, sync=True, checksum=True)
+        assert (result.copied, result.skipped) == (1, 2)
+        with open(target_file_path) as f:
+            assert f.read() == "b.txt"
+
+        # * コピー先はその場で書き換えずに置き換えるので、シンボリックリンクの先は書き換えない
+        if os.name != "nt":
+            outside_file_path = os.path.join(td, "outside.txt")
+            with open(outside_file_path, mode="w") as f:
+                f.write("outside")
+            os.remove(target_file_path)
+            os.symlink(outside_file_path, target_file_path)
+            assert dir_copy(ref_dir_path, target_dir_path, sync=True).copied == 1
+            assert os.path.islink(target_file_path) is False
+            with open(outside_file_path) as f:
+                assert f.read() == "outside"
+        assert [name for name in os.listdir(target_dir_path) if name.endswith(".tmp")] == []
+
+
+def test_file_copy_content_and_mode():
+    """コピーしたファイルの内容とパーミッションがコピー元と一致する。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        ref_dir_path = os.path.join(td, "ref")
+        target_dir_path = os.path.join(td, "target")
+        os.mkdir(ref_dir_path)
+        os.mkdir(target_dir_path)
+        ref_file_path = os.path.join(ref_dir_path, "data.bin")
+        data = os.urandom(3 * 1024 * 1024 + 123)
+        with open(ref_file_path, mode="wb") as f:
+            f.write(data)
+        os.chmod(ref_file_path, 0o640)
+
+        assert file_copy(ref_file_path, target_dir_path) is True
+        target_file_path = os.path.join(target_dir_path, "data.bin")
+        with open(target_file_path, mode="rb") as f:
+            assert f.read() == data
+        if os.name != "nt":
+            assert os.stat(target_file_path).st_mode & 0o777 == 0o640
+
+        # * コピー元がフォルダの場合や、コピー先のフォルダが存在しない場合は False
+        assert file_copy(ref_dir_path, target_dir_path) is False
+        assert file_copy(ref_file_path, os.path.join(td, "dummy")) is False
+
+        # * FIFO は書き込み側を待たずに False を返す
+        if hasattr(os, "mkfifo"):
+            fifo_path = os.path.join(ref_dir_path, "fifo")
+            os.mkfifo(fifo_path)
+            assert file_copy(fifo_path, target_dir_path) is False
+
+
+def test_copy_file_data_short_write(monkeypatch):
+    """バッファを使ったコピーで、一部しか書き込まれなかった場合も残りを書き込む。"""
+
+    class ShortWriter:
+        def __init__(self):
+            self.data = bytearray()
+
+        def fileno(self):
+            return -1
+
+        def write(self, b):
+            self.data += b[:1000]
+            return min(len(b), 1000)
+
+    # * カーネル内のコピーを使わず、バッファを使ったコピーにする
+    monkeypatch.setattr(pyhelpful_module, "fcntl", None)
+    monkeypatch.setattr(pyhelpful_module.sys, "platform", "win32")
+    with tempfile.TemporaryDirectory() as td:
+        ref_file_path = os.path.join(td, "data.bin")
+        data = os.urandom(300 * 1024 + 7)
+        with open(ref_file_path, mode="wb") as f:
+            f.write(data)
+        dst = ShortWriter()
+        with open(ref_file_path, "rb", buffering=0) as src:
+            assert pyhelpful_module._copy_file_data(src, dst, len(data)) == "buffer"
+        assert bytes(dst.data) == data
+
+
+def test_file_copy_resumable(monkeypatch):
+    """中断したコピーを途中から再開し、コピー元と同じ内容になる。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        target_dir_path = os.path.join(td, "target")
+        os.mkdir(target_dir_path)
+        ref_file_path = os.path.join(td, "large.bin")
+        data = os.urandom(1024 * 1024 + 100)
+        with open(ref_file_path, mode="wb") as f:
+            f.write(data)
+        target_file_path = os.path.join(target_dir_path, "large.bin")
+        chunk_size = 256 * 1024
+
+        # * 3つ目のチャンクを書き込んだところで中断させる
+        fsync = os.fsync
+        calls = []
+
+        def failing_fsync(fd):
+            calls.append(fd)
+            if len(calls) == 3:
+                raise OSError("interrupted")
+            fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        assert file_copy_resumable(ref_file_path, target_dir_path, chunk_size) is False
+        monkeypatch.setattr(os, "fsync", fsync)
+        assert os.path.isfile(target_file_path) is False
+        with open(target_file_path + ".part.journal") as f:
+            assert len(f.read().splitlines()) == 1 + 2
+
+        checksum = file_copy_resumable(ref_file_path, target_dir_path, chunk_size)
+        assert isinstance(checksum, str)
+        with open(target_file_path, mode="rb") as f:
+            assert f.read() == data
+        assert os.listdir(target_dir_path) == ["large.bin"]
+
+        # * 中断せずにコピーした場合と同じチェックサムになる
+        os.remove(target_file_path)
+        assert file_copy_resumable(ref_file_path, target_dir_path, chunk_size) == checksum
+        assert file_copy_resumable(ref_file_path, target_dir_path, chunk_size) is False
+
+
+def test_copy_many():
+    """複数のファイルを並列にコピーし、1件ごとの結果を入力と同じ順に返す。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        ref_dir_path = os.path.join(td, "ref")
+        target_dir_path = os.path.join(td, "target")
+        os.mkdir(ref_dir_path)
+        os.mkdir(target_dir_path)
+        for i in range(50):
+            with open(os.path.join(ref_dir_path, "f{}.txt".format(i)), mode="w") as f:
+                f.write("x" * i)
+
+        reports = []
+        file_list = get_file_list(ref_dir_path)
+        results = copy_many(
+            file_list, target_dir_path, workers=4,
+            progress=lambda done, total, copied: reports.append((done, total, copied)),
+        )
+        assert [r.source for r in results] == list(file_list)
+        assert all(r.ok for r in results)
+        assert sum(r.bytes for r in results) == sum(range(50))
+        assert sorted(os.listdir(target_dir_path)) == sorted(os.listdir(ref_dir_path))
+        assert reports[-1] == (50, 50, sum(range(50)))
+
+        # * 既に同名のファイルがある場合は、copy_as に従う
+        ref_file_path = os.path.join(ref_dir_path, "f1.txt")
+        missing_path = os.path.join(ref_dir_path, "dummy.txt")
+        results = copy_many([(ref_file_path, target_dir_path), (missing_path, target_dir_path)])
+        assert [r.ok for r in results] == [False, False]
+        assert all(r.error for r in results)
+        results = copy_many([ref_file_path, ref_file_path], target_dir_path, copy_as=True)
+        assert all(r.ok for r in results)
+        assert len({r.target for r in results}) == 2
+        assert len(os.listdir(target_dir_path)) == 52
+
+        # * file_copy も同じく、同じ秒に重なった場合は上書きせずに連番をつける
+        assert file_copy(ref_file_path, target_dir_path, copy_as=True) is True
+        assert file_copy(ref_file_path, target_dir_path, copy_as=True) is True
+        assert len(os.listdir(target_dir_path)) == 54
+
+        with pytest.raises(ValueError):
+            copy_many([ref_file_path])
+
+        # * pathlib.Path も使え、要素が2つでないペアは ValueError
+        results = copy_many(
+            [pathlib.Path(ref_file_path), (pathlib.Path(ref_file_path), pathlib.Path(target_dir_path))],
+            pathlib.Path(target_dir_path),
+            copy_as=True,
+        )
+        assert [r.source for r in results] == [ref_file_path, ref_file_path]
+        assert all(r.ok for r in results)
+        assert len(os.listdir(target_dir_path)) == 56
+        with pytest.raises(ValueError):
+            copy_many([(ref_file_path,)])
+        with pytest.raises(ValueError):
+            copy_many([(ref_file_path, target_dir_path, target_dir_path)])
+
+
 def test_get_info_dir_file_ext():
     """パス文字列から、フォルダ名、ファイル名、拡張子を取得"""
 
@@ -274,6 +750,34 @@ def test_get_info_dir_file_ext():
     assert get_info_dir_file_ext(file_path, info="dummy") is False
 
 
+def test_get_path_parts():
+    """複数のパス文字列から、フォルダ名、ファイル名、拡張子をまとめて取得する。"""
+
+    paths = [
+        os.path.join("data", "a.txt"), os.path.join("data", "b.CSV"), os.path.join("other", "c.csv"),
+        os.path.join("data", ".bashrc"), os.path.join("data", "archive.tar.gz"), "no_dir", os.sep,
+    ]
+    parts = get_path_parts(paths)
+    assert parts.paths == tuple(paths)
+    for i, path in enumerate(paths):
+        dir_name, file_name = os.path.split(path)
+        file_name_non_ext, ext_name = os.path.splitext(file_name)
+        assert parts.dir_names[i] == dir_name
+        assert parts.file_names[i] == file_name
+        assert parts.ext_names[i] == ext_name
+        assert parts.file_names_non_ext[i] == file_name_non_ext
+    assert parts.exists is None
+
+    assert parts.group_by_ext()[".csv"] == (paths[1], paths[2])
+    assert parts.group_by_ext(ignore_case=False)[".csv"] == (paths[2],)
+    assert parts.group_by_dir()["data"] == (paths[0], paths[1], paths[3], paths[4])
+
+    # * ファイルの存在は、フォルダごとにまとめて確認する
+    file_path = os.path.abspath(__file__)
+    parts = get_path_parts([file_path, file_path + ".dummy", os.path.dirname(file_path)], check_exists=True)
+    assert parts.exists == (True, False, False)
+
+
 def test_get_file_list():
     """任意のフォルダにあるファイルの一覧を取得"""
 
@@ -281,3 +785,175 @@ def test_get_file_list():
 
     # * 成功の場合はファイル一覧のタプルが帰ってくる
     assert type(get_file_list(file_path)) == tuple
+
+    # * 並列でたどった場合も、順番以外は同じ一覧が返ってくる
+    assert sorted(get_file_list(file_path, workers=4)) == sorted(get_file_list(file_path))
+
+
+def test_find_duplicates():
+    """内容が同じファイルを、サイズ・先頭と末尾・内容全体の順に絞り込んで探す。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        big = os.urandom(100 * 1024)
+        # * 先頭と末尾は同じで、途中だけが違うファイル
+        big_changed = big[:50000] + b"x" + big[50001:]
+        files = {
+            "a.bin": big, os.path.join("sub", "b.bin"): big, "c.bin": big_changed,
+            "d.txt": b"same", "e.txt": b"same", "f.txt": b"diff", "g.txt": b"", "h.txt": b"",
+        }
+        os.mkdir(os.path.join(td, "sub"))
+        for name, data in files.items():
+            with open(os.path.join(td, name), "wb") as f:
+                f.write(data)
+        expected = (
+            (os.path.join(td, "a.bin"), os.path.join(td, "sub", "b.bin")),
+            (os.path.join(td, "d.txt"), os.path.join(td, "e.txt")),
+        )
+
+        assert find_duplicates(td, workers=1) == expected
+        assert find_duplicates(td, workers=2) == expected
+
+        # * シンボリックリンクとハードリンクは、重複として扱わない
+        if os.name != "nt":
+            os.symlink(os.path.join(td, "a.bin"), os.path.join(td, "link.bin"))
+            os.link(os.path.join(td, "d.txt"), os.path.join(td, "hard.txt"))
+            assert find_duplicates(td, workers=1) == expected
+            os.remove(os.path.join(td, "link.bin"))
+            os.remove(os.path.join(td, "hard.txt"))
+        assert find_duplicates(td, min_size=0, workers=1) == tuple(
+            sorted(expected + ((os.path.join(td, "g.txt"), os.path.join(td, "h.txt")),))
+        )
+
+        # * 2回目以降は、変わっていないファイルのハッシュ値をキャッシュから使う
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "hashes.db")
+            assert find_duplicates(td, workers=1, cache_path=cache_path) == expected
+            assert find_duplicates(td, workers=1, cache_path=cache_path) == expected
+            with open(os.path.join(td, "c.bin"), "wb") as f:
+                f.write(big)
+            assert find_duplicates(td, workers=1, cache_path=cache_path)[0] == (
+                os.path.join(td, "a.bin"), os.path.join(td, "c.bin"), os.path.join(td, "sub", "b.bin")
+            )
+
+    # * 失敗の場合は False
+    assert find_duplicates(os.path.join(os.getcwd(), "dummy")) is False
+
+
+def test_find_duplicates_process_pool(monkeypatch):
+    """候補が多い場合は、プロセスプールでハッシュ値を計算する。"""
+
+    pools = []
+    process_pool_executor = concurrent.futures.ProcessPoolExecutor
+
+    def spy(*args, **kwargs):
+        pool = process_pool_executor(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", spy)
+    with tempfile.TemporaryDirectory() as td:
+        expected = []
+        # * 先頭と末尾だけでは判別できないサイズの、2つずつ同じ内容のファイル（候補は 64 件より多い）
+        for i in range(40):
+            data = os.urandom(16 * 1024)
+            group = []
+            for name in ("{}_a.bin".format(i), "{}_b.bin".format(i)):
+                with open(os.path.join(td, name), "wb") as f:
+                    f.write(data)
+                group.append(os.path.join(td, name))
+            expected.append(tuple(sorted(group)))
+
+        assert find_duplicates(td, workers=2) == tuple(sorted(expected))
+    assert len(pools) == 1
+
+
+def test_iter_files():
+    """任意のフォルダにあるファイルを、条件で絞り込みながら1つずつ取得"""
+
+    with tempfile.TemporaryDirectory() as td:
+        # * テストで使用するフォルダとファイルを作成
+        for rel_path, size in [
+            ("a.txt", 10),
+            ("b.CSV", 100),
+            (".hidden.txt", 10),
+            ("sub/c.txt", 1000),
+            ("sub/deep/d.txt", 10),
+            (".hidden_dir/e.txt", 10),
+        ]:
+            file_path = os.path.join(td, rel_path)
+            pathlib.Path(os.path.dirname(file_path)).mkdir(parents=True, exist_ok=True)
+            with open(file_path, mode="wb") as f:
+                f.write(b"x" * size)
+
+        def names(**kwargs):
+            return sorted(os.path.basename(p) for p in iter_files(td, **kwargs))
+
+        # * 条件を指定しない場合は、get_file_list と同じファイルが同じ順で返ってくる
+        assert tuple(iter_files(td)) == get_file_list(td)
+
+        assert names(exts=".txt") == [".hidden.txt", "a.txt", "c.txt", "d.txt", "e.txt"]
+        assert names(exts=("csv",)) == ["b.CSV"]
+        assert names(pattern="[ab].*") == ["a.txt", "b.CSV"]
+        assert names(max_depth=0) == [".hidden.txt", "a.txt", "b.CSV"]
+        assert names(max_depth=1) == [".hidden.txt", "a.txt", "b.CSV", "c.txt", "e.txt"]
+        assert names(min_size=100) == ["b.CSV", "c.txt"]
+        assert names(max_size=10, include_hidden=False) == ["a.txt", "d.txt"]
+        assert names(max_mtime=0) == []
+
+        # * entries=True の場合は os.DirEntry が返ってくる
+        assert all(isinstance(e, os.DirEntry) for e in iter_files(td, entries=True))
+
+        # * 存在しないフォルダの場合は何も返ってこない
+        assert list(iter_files(os.path.join(td, "dummy"))) == []
+
+
+def test_iter_files_symlinks():
+    """シンボリックリンクのフォルダは follow_symlinks=True の場合だけたどり、同じフォルダは2回たどらない。"""
+    if not hasattr(os, "symlink") or os.name == "nt":
+        return
+
+    with tempfile.TemporaryDirectory() as td:
+        os.mkdir(os.path.join(td, "a"))
+        with open(os.path.join(td, "a", "f.txt"), mode="w") as f:
+            f.write("")
+        os.symlink(os.path.join(td, "a", "f.txt"), os.path.join(td, "a", "link.txt"))
+        # * 同じフォルダへのリンクと、親フォルダへのリンク（ループ）
+        os.symlink(os.path.join(td, "a"), os.path.join(td, "b"))
+        os.symlink(td, os.path.join(td, "a", "loop"))
+
+        def paths(**kwargs):
+            return sorted(os.path.relpath(p, td) for p in iter_files(td, **kwargs))
+
+        a_files = [os.path.join("a", "f.txt"), os.path.join("a", "link.txt")]
+        assert paths() == a_files
+        assert paths(skip_symlinks=True) == [os.path.join("a", "f.txt")]
+        # * a と b のどちらを先にたどるかは、フォルダを読み込む順による
+        b_files = [os.path.join("b", "f.txt"), os.path.join("b", "link.txt")]
+        assert paths(follow_symlinks=True) in (a_files, b_files)
+        assert paths(follow_symlinks=True, skip_symlinks=True) in (a_files[:1], b_files[:1])
+
+
+def test_iter_files_parallel():
+    """複数のスレッドで並列にフォルダをたどってファイルを取得"""
+
+    with tempfile.TemporaryDirectory() as td:
+        expected = []
+        for i in range(20):
+            sub_dir = os.path.join(td, "dir_{}".format(i), "sub_{}".format(i))
+            pathlib.Path(sub_dir).mkdir(parents=True)
+            for j in range(5):
+                file_path = os.path.join(sub_dir, "file_{}.txt".format(j))
+                with open(file_path, mode="w") as f:
+                    f.write("")
+                expected.append(file_path)
+
+        assert sorted(iter_files_parallel(td, workers=4)) == sorted(expected)
+        assert sorted(iter_files_parallel(td, workers=1)) == sorted(expected)
+
+        # * 途中で取り出すのをやめても問題ない
+        it = iter_files_parallel(td, workers=4)
+        assert next(it) in expected
+        it.close()
+
+        # * 存在しないフォルダの場合は何も返ってこない
+        assert list(iter_files_parallel(os.path.join(td, "dummy"))) == []
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import time
+
+from pyhelpful import statcache
+from pyhelpful.pyhelpful import dir_create
+from pyhelpful.pyhelpful import dir_delete
+from pyhelpful.pyhelpful import file_create_overwrite
+from pyhelpful.pyhelpful import file_delete
+from pyhelpful.pyhelpful import get_file_list
+from pyhelpful.pyhelpful import get_info_dir_file_ext
+from pyhelpful.statcache import StatCache
+
+
+def test_stat_cache():
+    """同じパスは ttl の間は stat せず、max_size を超えた分は古いものから忘れる。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "a.txt")
+        cache = StatCache(max_size=2, ttl=60.0)
+
+        assert cache.exists(file_path) is False
+        with open(file_path, "w"):
+            pass
+        # * 覚えている間は古い結果を返す
+        assert cache.exists(file_path) is False
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.invalidate(file_path)
+        assert cache.isfile(file_path) is True
+        assert cache.isdir(file_path) is False
+        assert cache.isdir(td) is True
+        assert cache.isfile(os.path.join(td, "missing")) is False
+        assert len(cache) == 2
+
+        cache.invalidate_tree(td)
+        assert len(cache) == 0
+
+        cache = StatCache(ttl=0.01)
+        assert cache.isfile(file_path) is True
+        os.remove(file_path)
+        time.sleep(0.02)
+        assert cache.isfile(file_path) is False
+        assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_stat_cache_with_helpers():
+    """get_file_list で見つけたパスを覚え、作成・削除したパスは忘れる。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        dir_path = os.path.join(td, "data")
+        os.mkdir(dir_path)
+        for name in ("a.txt", "b.csv"):
+            with open(os.path.join(dir_path, name), "w") as f:
+                f.write("x")
+
+        cache = statcache.enable_stat_cache(ttl=60.0)
+        try:
+            file_list = get_file_list(dir_path)
+            assert sorted(file_list) == [os.path.join(dir_path, "a.txt"), os.path.join(dir_path, "b.csv")]
+            misses = cache.misses
+            for file_path in file_list:
+                assert get_info_dir_file_ext(file_path, "ext_name") in (".txt", ".csv")
+            assert cache.misses == misses
+
+            assert file_create_overwrite(dir_path, "c.txt", "w", "c") is True
+            assert get_info_dir_file_ext(os.path.join(dir_path, "c.txt"), "file_name") == "c.txt"
+            assert file_delete(os.path.join(dir_path, "a.txt")) is True
+            assert file_delete(os.path.join(dir_path, "a.txt")) is False
+
+            assert dir_delete(dir_path) is True
+            assert get_file_list(dir_path) is False
+        finally:
+            statcache.disable_stat_cache()
+        assert statcache.get_stat_cache() is None
+
+
+def test_stat_cache_invalidate_during_stat(monkeypatch):
+    """stat している間に忘れたパスは、古い結果で覚え直さない。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        file_path = os.path.join(td, "a.txt")
+        cache = StatCache(ttl=60.0)
+        stat = os.stat
+
+        def stat_then_create(path, *args, **kwargs):
+            try:
+                return stat(path, *args, **kwargs)
+            finally:
+                # * stat した直後に、別のスレッドが作成して忘れた
+                with open(file_path, "w"):
+                    pass
+                cache.invalidate(file_path)
+
+        monkeypatch.setattr(statcache.os, "stat", stat_then_create)
+        assert cache.exists(file_path) is False
+        monkeypatch.setattr(statcache.os, "stat", stat)
+        assert len(cache) == 0
+        assert cache.exists(file_path) is True
+
+
+def test_stat_cache_dir_create_parents():
+    """dir_create で一緒に作成された親フォルダも忘れる。"""
+
+    with tempfile.TemporaryDirectory() as td:
+        parent_dir_path = os.path.join(td, "x", "y")
+        cache = statcache.enable_stat_cache(ttl=60.0)
+        try:
+            assert statcache.isdir(os.path.join(td, "x")) is False
+            assert statcache.isdir(parent_dir_path) is False
+            assert dir_create(parent_dir_path, "z") == os.path.join(parent_dir_path, "z")
+            assert statcache.isdir(os.path.join(td, "x")) is True
+            assert statcache.isdir(parent_dir_path) is True
+            assert statcache.isdir(os.path.join(parent_dir_path, "z")) is True
+            assert len(cache) == 3
+        finally:
+            statcache.disable_stat_cache()